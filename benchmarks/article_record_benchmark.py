@@ -0,0 +1,132 @@
+# benchmarks/article_record_benchmark.py
+#
+# Compares the previous scraper output path (one dict per article, dumped
+# as indented JSON) with ArticleRecord batches written as compact JSON and
+# as length-prefixed MessagePack (when the msgpack package is installed),
+# for a large synthetic batch. Reports the memory held by the batch,
+# serialization CPU time and peak allocation, and payload size.
+#
+# Usage: python benchmarks/article_record_benchmark.py [articles]
+
+import datetime
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+import article_record  # noqa: E402
+from article_record import ArticleRecord, write_articles  # noqa: E402
+
+ARTICLES = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+REPEATS = 3
+
+WORDS = ('government court monsoon election market cricket policy minister delhi mumbai report budget climate '
+         'railway verdict session parliament bank river flood startup police state health').split()
+
+
+def article_fields(n):
+    slug = '-'.join(WORDS[(n * 7 + k) % len(WORDS)] for k in range(8)) + f'-{n}'
+    title = slug.replace('-', ' ').capitalize()
+    return (f'https://timesofindia.indiatimes.com/india/{slug}/articleshow/{100000 + n}.cms', title,
+            f'https://static.toiimg.com/thumb/msid-{100000 + n}/{slug}.jpg',
+            datetime.datetime(2024, 7, 1, tzinfo=datetime.timezone.utc).isoformat())
+
+
+def build_dicts(fields):
+    return [{
+        "title": title,
+        "link": link,
+        "publishedAt": published_at,
+        "description": title,
+        "source": "timesofindia",
+        "imageUrl": image_url,
+        "content": None,
+        "categories": [],
+    } for link, title, image_url, published_at in fields]
+
+
+def build_records(fields):
+    return [ArticleRecord('toi', title, link, published_at, description=title, image_url=image_url)
+            for link, title, image_url, published_at in fields]
+
+
+class CountingSink:
+    """Binary stream that only counts what is written, like a pipe to Node."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def previous_output(articles, sink):
+    sink.write(json.dumps(articles, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+def json_output(records, sink):
+    write_articles(records, 'json', sink)
+
+
+def msgpack_output(records, sink):
+    write_articles(records, 'msgpack', sink)
+
+
+def batch_memory(build, fields):
+    """Bytes allocated for the batch itself (the strings are shared and excluded)."""
+    gc.collect()
+    tracemalloc.start()
+    batch = build(fields)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return batch, size
+
+
+def measure(write, batch):
+    """(best CPU seconds, payload bytes, peak bytes allocated while writing)."""
+    best = None
+    for _ in range(REPEATS):
+        sink = CountingSink()
+        gc.collect()
+        start = time.process_time()
+        write(batch, sink)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    gc.collect()
+    tracemalloc.start()
+    write(batch, CountingSink())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, sink.size, peak
+
+
+def main():
+    fields = [article_fields(n) for n in range(ARTICLES)]
+    dicts, dict_bytes = batch_memory(build_dicts, fields)
+    records, record_bytes = batch_memory(build_records, fields)
+
+    print(f"{ARTICLES} articles")
+    print(f"  batch in memory: dicts {dict_bytes / 2**20:7.1f} MiB, "
+          f"ArticleRecords {record_bytes / 2**20:7.1f} MiB")
+    print(f"  {'output':<34} {'CPU':>8} {'payload':>11} {'peak alloc':>11}")
+    rows = [('dicts, indented JSON (previous)', previous_output, dicts),
+            ('ArticleRecords, compact JSON', json_output, records)]
+    if article_record.msgpack is not None:
+        rows.append(('ArticleRecords, MessagePack frames', msgpack_output, records))
+    for label, write, batch in rows:
+        seconds, size, peak = measure(write, batch)
+        print(f"  {label:<34} {seconds * 1000:6.0f}ms {size / 2**20:7.1f} MiB {peak / 2**20:7.1f} MiB")
+    if article_record.msgpack is None:
+        print("  (MessagePack skipped: pip install msgpack)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/content_cleaning_benchmark.py
+#
+# Compares the previous per-paragraph phrase filter (a fresh phrase list and
+# a .lower() per phrase for every paragraph, then an exact-match
+# dict.fromkeys dedupe) with content_cleaning.clean_content on synthetic
+# extracted articles containing promo lines and repeated paragraphs.
+#
+# Usage: python benchmarks/content_cleaning_benchmark.py [articles]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from content_cleaning import clean_content  # noqa: E402
+
+ARTICLES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+WORDS = ('government court monsoon election market cricket policy minister delhi mumbai report budget climate '
+         'railway verdict session parliament bank river flood startup police state health school farmer said '
+         'officials according statement district week percent crore people project').split()
+PROMOS = ['Also Read: monsoon session explained', 'Click here to join our WhatsApp channel',
+          'Follow us on Twitter and Instagram', 'Download the app for the latest news', 'DNA Web Team']
+
+
+def make_article(rng):
+    paragraphs = []
+    for _ in range(rng.randint(10, 30)):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(20, 60))]
+        paragraphs.append(' '.join(words).capitalize() + '.')
+    out = []
+    for paragraph in paragraphs:
+        out.append(paragraph)
+        roll = rng.random()
+        if roll < 0.1:
+            out.append(rng.choice(PROMOS))
+        elif roll < 0.15:
+            out.append(paragraph) # Exact repeat (pull quote, lazy-loaded block)
+        elif roll < 0.2:
+            out.append(paragraph.upper().replace(',', '').rstrip('.') + ' ') # Same text, different case/punctuation
+    return '\n\n'.join(out)
+
+
+def previous_filter(content):
+    """The loop previously run in the IE/DNA branches, plus TOI's exact dedupe."""
+    parts = []
+    for text in content.split('\n\n'):
+        excluded_phrases = [
+            "Also Read", "More From", "DNA Web Team", "Disclaimer",
+            "for more such content", "follow us on", "read the full story",
+            "download the app", "share on whatsapp"
+        ]
+        if text and not any(phrase.lower() in text.lower() for phrase in excluded_phrases):
+            parts.append(text)
+    return '\n\n'.join(list(dict.fromkeys(parts)))
+
+
+def main():
+    rng = random.Random(5)
+    articles = [make_article(rng) for _ in range(ARTICLES)]
+    raw_bytes = sum(len(a.encode('utf-8')) for a in articles)
+
+    start = time.process_time()
+    previous = [previous_filter(a) for a in articles]
+    previous_seconds = time.process_time() - start
+
+    start = time.process_time()
+    cleaned = [clean_content(a, 'dna')[0] for a in articles]
+    cleaned_seconds = time.process_time() - start
+
+    previous_bytes = sum(len(a.encode('utf-8')) for a in previous)
+    cleaned_bytes = sum(len(a.encode('utf-8')) for a in cleaned if a)
+    print(f"{ARTICLES} articles, {raw_bytes / 1024:.0f} KiB extracted text")
+    print(f"  previous filter: {previous_seconds / ARTICLES * 1e6:7.1f} us/article CPU, "
+          f"{previous_bytes / 1024:.0f} KiB out ({(raw_bytes - previous_bytes) / 1024:.0f} KiB removed)")
+    print(f"  clean_content:   {cleaned_seconds / ARTICLES * 1e6:7.1f} us/article CPU, "
+          f"{cleaned_bytes / 1024:.0f} KiB out ({(raw_bytes - cleaned_bytes) / 1024:.0f} KiB removed)")
+
+
+if __name__ == '__main__':
+    main()
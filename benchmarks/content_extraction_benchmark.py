@@ -0,0 +1,253 @@
+# benchmarks/content_extraction_benchmark.py
+#
+# Compares the per-source selector cascades previously used by
+# article_extraction.extract_article_content with the single-pass density
+# extractor (scrapers/main_content.py) on synthetic article pages for the
+# four browser-rendered sources. Each source has a page in its current
+# layout and one in a redesigned layout whose class names match no selector.
+#
+# Quality is paragraph precision/recall against the known article text;
+# speed is extraction time on an already-parsed tree (parsing is the same
+# for both and reported separately).
+#
+# Usage: python benchmarks/content_extraction_benchmark.py [repeats]
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from article_extraction import CONTENT_HINTS  # noqa: E402
+from main_content import extract_main_content  # noqa: E402
+
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+SOURCES = ('hindu', 'toi', 'ie', 'dna')
+
+WORDS = ('government court monsoon election market cricket policy minister delhi mumbai report budget climate '
+         'railway verdict session parliament bank river flood startup police state health school farmer said '
+         'officials according statement district week percent crore people project').split()
+
+# Body container per source: (current layout, redesigned layout)
+BODY_MARKUP = {
+    'hindu': ('<div class="articlebodycontent col-xs-12">', '<div class="rt3-prose">'),
+    'toi': ('<div class="_s30J clearfix">', '<div class="js_artBody fewcent">'),
+    'ie': ('<div class="full-details">', '<div class="ev-wrap pcl-body">'),
+    'dna': ('<div class="article-description">', '<div class="dn-story-v2">'),
+}
+
+
+def sentence(rng, low=8, high=20):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+    if len(words) > 10:
+        words[rng.randint(3, len(words) - 4)] += ','
+    return ' '.join(words).capitalize() + '.'
+
+
+def make_article_page(source, redesigned, seed):
+    """Returns (html, expected paragraphs)."""
+    rng = random.Random(seed)
+    paragraphs = [' '.join(sentence(rng) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(8, 16))]
+    link_text = 'monsoon session explained'
+
+    body = []
+    for n, text in enumerate(paragraphs):
+        if n == 2:
+            text_html = text.replace('session', f'<a href="/topic/session">session</a>', 1)
+        else:
+            text_html = text
+        if source == 'toi' and not redesigned:
+            body.append(text_html + '<br/><br/>') # TOI body text sits directly in the div
+        else:
+            body.append(f'<p>{text_html}</p>')
+        if n == 3:
+            body.append('<div class="ad-slot"><span>Advertisement</span></div>')
+        if n == 5:
+            body.append(f'<p>Also Read: <a href="/news/{n}">{link_text}</a></p>')
+
+    sidebar = ''.join(f'<li><a href="/trending/{k}">{sentence(rng, 6, 10)}</a><p>{sentence(rng, 6, 12)}</p></li>'
+                      for k in range(10))
+    related = ''.join(f'<div class="card"><a href="/related/{k}">{sentence(rng, 6, 10)}</a>'
+                      f'<p>{sentence(rng, 10, 18)}</p></div>' for k in range(6))
+    comments = ''.join(f'<div class="cmt"><span class="user">reader{k}</span><p>{sentence(rng, 12, 30)}</p></div>'
+                       for k in range(8))
+    nav = ''.join(f'<a href="/section/{w}">{w}</a>' for w in WORDS)
+
+    open_body = BODY_MARKUP[source][1 if redesigned else 0]
+    article_open, article_close = ('<div class="page-content">', '</div>') if redesigned else \
+        ('<article itemprop="mainEntity">', '</article>')
+    html = (
+        '<!DOCTYPE html><html><head><title>Story</title><script>var x = 1;</script>'
+        '<style>p { margin: 0 }</style></head><body>'
+        f'<header><nav>{nav}</nav></header>'
+        f'<div class="breadcrumb"><a href="/">Home</a> &gt; <a href="/india">India</a></div>'
+        '<div class="container">'
+        f'{article_open}<h1>{sentence(rng, 6, 10)}</h1>'
+        f'<div class="byline">By Staff Reporter, Updated 2 hours ago</div>'
+        f'<figure><img src="/photo.jpg"><figcaption>{sentence(rng, 5, 8)}</figcaption></figure>'
+        f'{open_body}{"".join(body)}</div>'
+        f'<div class="related-stories">{related}</div>'
+        f'<div id="comments">{comments}</div>'
+        f'{article_close}'
+        f'<div class="trending-sidebar"><ul>{sidebar}</ul></div>'
+        '</div>'
+        f'<footer><p>{sentence(rng, 20, 30)}</p><p>Copyright 2024. All rights reserved.</p></footer>'
+        '</body></html>')
+    return html, paragraphs
+
+
+# --- The previous selector cascades ---------------------------------------
+
+def extract_paragraphs(soup, selector):
+    container = soup.select_one(selector)
+    if container:
+        paragraphs = container.find_all('p')
+        return '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+    return None
+
+
+def filtered_paragraphs(container, excluded_phrases):
+    parts = []
+    for p in container.find_all('p'):
+        text = p.get_text(separator=' ', strip=True)
+        if text and not any(phrase.lower() in text.lower() for phrase in excluded_phrases):
+            parts.append(text)
+    return '\n\n'.join(parts) if parts else None
+
+
+def first_selector(soup, selectors):
+    for selector in selectors:
+        content = extract_paragraphs(soup, selector)
+        if content and len(content) > 100:
+            return content
+    return None
+
+
+def hindu_cascade(soup):
+    content = first_selector(soup, [
+        'div.articlebodycontent', 'div.story-element', 'div[id^="content-body-"] .story-element',
+        'div.content-wrapper .story-element', 'div[itemprop="articleBody"]', 'article[itemprop="articleBody"]',
+        'div.article-content', 'div#content-body', 'div.article-text', 'section.article-details .body'])
+    if not content or len(content) < 50:
+        body_content = soup.find('article') or soup.find('div', class_='article-content') or \
+            soup.find('div', id='main-content') or soup.find('div', class_=re.compile(r'body|content', re.IGNORECASE))
+        content = None
+        if body_content:
+            text = '\n\n'.join([p.get_text(strip=True) for p in body_content.find_all('p') if p.get_text(strip=True)])
+            content = text if len(text) > 50 else None
+    return content
+
+
+def toi_cascade(soup):
+    content = None
+    main_content_div = soup.select_one('div._s30J.clearfix')
+    if main_content_div:
+        parts = []
+        direct_text = main_content_div.get_text(separator='\n\n', strip=True)
+        if direct_text and len(direct_text) > 50:
+            parts.append(direct_text)
+        for p in main_content_div.find_all('p'):
+            text = p.get_text(strip=True)
+            if text and "read full story" not in text.lower() and "continue reading" not in text.lower():
+                parts.append(text)
+        if parts:
+            content = '\n\n'.join(list(dict.fromkeys(parts)))
+    if not content or len(content) < 100:
+        content = first_selector(soup, [
+            'div._3Mkg- article', 'div.Normal', 'div.body_content_container', 'div.arttext', 'div.article_content',
+            'div[data-articlebody]', 'div.article-full-content', 'div[itemprop="articleBody"]', 'section[role="main"]'])
+    return content
+
+
+IE_EXCLUDED = ["Also Read", "Latest News", "More From", "Join our Telegram channel",
+               "Click here to join our WhatsApp channel", "indian express", "express premium", "for all the latest",
+               "download the indian express app", "sign up for our", "follow express"]
+DNA_EXCLUDED = ["Also Read", "More From", "DNA Web Team", "Disclaimer", "for more such content", "follow us on",
+                "read the full story", "download the app", "share on whatsapp"]
+
+
+def ie_cascade(soup):
+    content = None
+    main_content_div = soup.select_one('div.full-details') or soup.select_one('div.ie-main-content') or \
+        soup.select_one('div.story-text')
+    if main_content_div:
+        content = filtered_paragraphs(main_content_div, IE_EXCLUDED)
+    if not content or len(content) < 100:
+        content = first_selector(soup, ['div.article-content', 'div[itemprop="articleBody"]', 'article',
+                                        'div.story-content'])
+    return content
+
+
+def dna_cascade(soup):
+    content = None
+    main_content_div = soup.select_one('div.article-description') or \
+        soup.select_one('div.article-content-wrapper') or soup.select_one('div#article-details')
+    if main_content_div:
+        content = filtered_paragraphs(main_content_div, DNA_EXCLUDED)
+    if not content or len(content) < 100:
+        content = first_selector(soup, ['div.story_content_area', 'div.article-detail-inner',
+                                        'div.article-body-container', 'div[itemprop="articleBody"]', 'article'])
+    return content
+
+
+CASCADES = {'hindu': hindu_cascade, 'toi': toi_cascade, 'ie': ie_cascade, 'dna': dna_cascade}
+
+
+# --- Measurement ------------------------------------------------------------
+
+def normalize(text):
+    # get_text(strip=True) drops the spaces around inline tags, so compare
+    # paragraphs without whitespace.
+    return ''.join(text.split())
+
+
+def score(content, expected):
+    """Returns (precision, recall) of extracted paragraphs."""
+    if not content:
+        return 0.0, 0.0
+    got = [normalize(p) for p in content.split('\n\n') if p.strip()]
+    truth = {normalize(p) for p in expected}
+    hits = sum(1 for p in got if p in truth)
+    return hits / len(got), len(truth & set(got)) / len(truth)
+
+
+def best_of(fn):
+    best = float('inf')
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    print(f"{'page':<18} {'parse':>8}  {'cascade':>8} {'P':>5} {'R':>5}  {'density':>8} {'P':>5} {'R':>5}")
+    totals = {'cascade': 0.0, 'density': 0.0}
+    for redesigned in (False, True):
+        for n, source in enumerate(SOURCES):
+            html, expected = make_article_page(source, redesigned, seed=100 + n)
+            start = time.perf_counter()
+            soup = BeautifulSoup(html, 'html.parser')
+            parse_seconds = time.perf_counter() - start
+
+            cascade_seconds, cascade_content = best_of(lambda: CASCADES[source](soup))
+            density_seconds, density_content = best_of(
+                lambda: extract_main_content(soup, hints=CONTENT_HINTS[source]))
+            totals['cascade'] += cascade_seconds
+            totals['density'] += density_seconds
+
+            label = f"{source} ({'redesign' if redesigned else 'current'})"
+            cascade_p, cascade_r = score(cascade_content, expected)
+            density_p, density_r = score(density_content, expected)
+            print(f"{label:<18} {parse_seconds * 1000:6.2f}ms  {cascade_seconds * 1000:6.2f}ms "
+                  f"{cascade_p:5.2f} {cascade_r:5.2f}  {density_seconds * 1000:6.2f}ms {density_p:5.2f} {density_r:5.2f}")
+    print(f"Total extraction: cascade {totals['cascade'] * 1000:.2f} ms, density {totals['density'] * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/crawl_frontier_benchmark.py
+#
+# Crawls 1..16 DNA sections (two pages each) from the local stand-in server
+# with a fixed per-response latency, once fetching one page at a time (as a
+# sequence of single-page scrapers would) and once with the crawl frontier's
+# bounded concurrency. Reports wall time and articles/s per section count.
+#
+# Usage: python benchmarks/crawl_frontier_benchmark.py [latency_ms] [concurrency]
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from crawl_frontier import CrawlBudget, crawl_source  # noqa: E402
+from dna_scraper import parse_dna_articles  # noqa: E402
+from source_urls import base_url_env_var, sections_env_var  # noqa: E402
+from standin_server import StandInConfig, start_in_background  # noqa: E402
+
+LATENCY_MS = float(sys.argv[1]) if len(sys.argv) > 1 else 100
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+SECTION_COUNTS = (1, 2, 4, 8, 16)
+DEPTH = 2
+
+
+def crawl(base_url, sections, concurrency):
+    os.environ[sections_env_var('dna')] = ','.join(f'/section-{i}' for i in range(sections))
+    budget = CrawlBudget(DEPTH, 100000, concurrency)
+    start = time.perf_counter()
+    articles = crawl_source('dna', lambda response: parse_dna_articles(response.text, base_url), {}, budget)
+    return len(articles), time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.INFO)
+    os.environ.pop('GPRESS_HTML_ARCHIVE_DIR', None)
+    server, server_url = start_in_background(StandInConfig(latency_ms=LATENCY_MS))
+    base_url = f'{server_url}/dna'
+    os.environ[base_url_env_var('dna')] = base_url
+
+    print(f"{LATENCY_MS:.0f} ms per response, {DEPTH} pages per section")
+    print(f"{'sections':>8}  {'articles':>8}  {'sequential':>18}  {f'concurrency {CONCURRENCY}':>18}")
+    for sections in SECTION_COUNTS:
+        count, sequential = crawl(base_url, sections, 1)
+        concurrent_count, concurrent = crawl(base_url, sections, CONCURRENCY)
+        assert count == concurrent_count
+        print(f"{sections:>8}  {count:>8}  {sequential:6.2f}s {count / sequential:6.0f}/s  "
+              f"{concurrent:6.2f}s {count / concurrent:6.0f}/s")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/extraction_queue_benchmark.py
+#
+# Shows extraction throughput scaling with the number of queue workers
+# (scrapers/extraction_worker.py). A browser extraction is simulated by a
+# fixed sleep, so the numbers reflect queue overhead and parallelism only.
+# One worker per run is killed mid-job to show its lease being recovered.
+#
+# Usage: python benchmarks/extraction_queue_benchmark.py [jobs] [seconds-per-job]
+
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from extraction_queue import ExtractionQueue  # noqa: E402
+from extraction_worker import run_worker  # noqa: E402
+
+JOBS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+SECONDS_PER_JOB = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+LEASE_SECONDS = 1.0
+
+
+def simulated_extract(url, source):
+    time.sleep(SECONDS_PER_JOB)
+    return f"content of {url}"
+
+
+def worker(queue_path, name):
+    with ExtractionQueue(queue_path) as queue:
+        run_worker(queue, simulated_extract, name, LEASE_SECONDS, exit_when_idle=True)
+
+
+def crashing_worker(queue_path):
+    # Claims a job and dies without finishing it
+    with ExtractionQueue(queue_path) as queue:
+        queue.claim('crashed', LEASE_SECONDS)
+    os._exit(1)
+
+
+def run(workers):
+    queue_path = os.path.join(tempfile.mkdtemp(prefix='gpress-queue-bench-'), 'queue.sqlite3')
+    with ExtractionQueue(queue_path) as queue:
+        queue.enqueue([{'url': f'https://example.com/{n}', 'source': 'toi'} for n in range(JOBS)])
+
+    crasher = multiprocessing.Process(target=crashing_worker, args=(queue_path,))
+    crasher.start()
+    crasher.join()
+
+    start = time.perf_counter()
+    processes = [multiprocessing.Process(target=worker, args=(queue_path, f'w{n}')) for n in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    # The crashed job only becomes claimable once its lease expires
+    if time.perf_counter() - start < LEASE_SECONDS:
+        time.sleep(LEASE_SECONDS)
+        worker(queue_path, 'late')
+    elapsed = time.perf_counter() - start
+
+    with ExtractionQueue(queue_path) as queue:
+        stats = queue.stats()
+    return elapsed, stats
+
+
+def main():
+    # Workers log every job; keep the benchmark output readable
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"{JOBS} jobs x {SECONDS_PER_JOB * 1000:.0f} ms simulated extraction")
+    print(f"{'workers':>7}  {'seconds':>7}  {'jobs/s':>7}  {'done':>5}  {'expired leases':>14}")
+    for workers in (1, 2, 4, 8):
+        elapsed, stats = run(workers)
+        print(f"{workers:>7}  {elapsed:>7.2f}  {JOBS / elapsed:>7.1f}  {stats['states']['done']:>5}  "
+              f"{stats['expiredLeases']:>14}")
+
+
+if __name__ == '__main__':
+    main()
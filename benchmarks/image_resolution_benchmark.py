@@ -0,0 +1,116 @@
+# benchmarks/image_resolution_benchmark.py
+#
+# Compares the previous image pick (The Hindu's <img src>, a full-size
+# original, never checked) with image_resolution against the local stand-in
+# server, whose images are sized by their ?w= parameter and of which a fixed
+# share are dead. Reports validation time with one HEAD at a time, with
+# concurrent HEADs, and with a warm cache, plus the dead links stored and the
+# bytes a client downloads for the chosen images.
+#
+# Usage: python benchmarks/image_resolution_benchmark.py [pages] [latency_ms] [concurrency]
+
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRAPERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers')
+sys.path.insert(0, SCRAPERS_DIR)
+
+from hindu_scraper import parse_hindu_articles  # noqa: E402
+from image_resolution import ImageCache, check_image, resolve_images  # noqa: E402
+from page_fetch import make_session  # noqa: E402
+from standin_server import render_listing  # noqa: E402
+
+PAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+LATENCY_MS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+CONCURRENCY = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+DEAD_IMAGE_RATE = 0.1
+
+
+def start_server():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    command = [sys.executable, os.path.join(SCRAPERS_DIR, 'standin_server.py'), '--port', str(port),
+               '--latency-ms', str(LATENCY_MS), '--dead-image-rate', str(DEAD_IMAGE_RATE)]
+    server = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return server, f'http://127.0.0.1:{port}'
+
+
+def scrape(base_url):
+    """Articles from PAGES listing pages, as parsed (image_url is the unvalidated pick)."""
+    articles = []
+    for page in range(1, PAGES + 1):
+        articles.extend(parse_hindu_articles(render_listing('hindu', base_url, 0, 25, 0, page), base_url))
+    return articles
+
+
+def img_tag_src(article):
+    """The URL the previous Hindu parser stored: the <img src> attribute, i.e. the last candidate."""
+    return article.image_candidates[-1].url
+
+
+def download_bytes(session, urls):
+    """(total bytes, dead links) for the images a client would request."""
+    total = dead = 0
+    for url in urls:
+        result = check_image(session, url)
+        if result and result[0]:
+            total += result[3] or 0
+        else:
+            dead += 1
+    return total, dead
+
+
+def timed_resolution(base_url, cache, concurrency):
+    articles = scrape(base_url)
+    start = time.perf_counter()
+    stats = resolve_images(articles, {}, cache=cache, concurrency=concurrency)
+    return articles, time.perf_counter() - start, stats
+
+
+def main():
+    logging.disable(logging.WARNING)
+    server, server_url = start_server()
+    base_url = f'{server_url}/hindu'
+    session = make_session({}, CONCURRENCY)
+    cache_dir = tempfile.mkdtemp()
+    try:
+        previous = [img_tag_src(article) for article in scrape(base_url)]
+        previous_bytes, previous_dead = download_bytes(session, previous)
+        print(f"{len(previous)} articles, {LATENCY_MS} ms per request, {DEAD_IMAGE_RATE:.0%} dead images")
+        print(f"  {'pick':<34} {'time':>8} {'HEADs':>6} {'dead stored':>12} {'client bytes':>13}")
+        print(f"  {'<img src> (previous)':<34} {'-':>8} {'-':>6} {previous_dead:>12} "
+              f"{previous_bytes / 2**20:9.2f} MiB")
+
+        runs = [('resolved, 1 HEAD at a time', os.path.join(cache_dir, 'sequential.sqlite3'), 1),
+                (f'resolved, {CONCURRENCY} concurrent HEADs', os.path.join(cache_dir, 'concurrent.sqlite3'),
+                 CONCURRENCY),
+                ('resolved, warm cache', os.path.join(cache_dir, 'concurrent.sqlite3'), CONCURRENCY)]
+        for label, cache_path, concurrency in runs:
+            with ImageCache(cache_path) as cache:
+                articles, seconds, stats = timed_resolution(base_url, cache, concurrency)
+            chosen = [article.image_url for article in articles if article.image_url]
+            chosen_bytes, chosen_dead = download_bytes(session, chosen)
+            print(f"  {label:<34} {seconds * 1000:6.0f}ms {stats['checked']:>6} {chosen_dead:>12} "
+                  f"{chosen_bytes / 2**20:9.2f} MiB")
+    finally:
+        session.close()
+        server.terminate()
+        server.wait()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+// benchmarks/ingestion_bulk_benchmark.js
+//
+// Compares the old per-article findOne/save ingestion with bulkUpsertArticles
+// against an in-memory mock model that charges a fixed latency per database
+// round trip. No MongoDB server is needed.
+//
+// Usage: node benchmarks/ingestion_bulk_benchmark.js [articles] [latencyMs]
+
+const {
+  bulkUpsertArticles,
+} = require("../services/ingestionService");
+const { assignCategoriesToArticle } = require("../services/articleProcessor");
+
+const ARTICLE_COUNT = parseInt(process.argv[2]) || 200;
+const LATENCY_MS = parseFloat(process.argv[3]) || 2;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Creates a mock Mongoose-like model backed by a Map keyed by link.
+ * Every call that would hit the database counts as one round trip.
+ */
+function createMockModel(latencyMs) {
+  const store = new Map();
+  const stats = { roundTrips: 0 };
+  let nextId = 1;
+
+  async function roundTrip() {
+    stats.roundTrips++;
+    await sleep(latencyMs);
+  }
+
+  class MockModel {
+    constructor(doc) {
+      Object.assign(this, doc);
+    }
+
+    async save() {
+      await roundTrip();
+      if (!this._id) {
+        this._id = nextId++;
+      }
+      store.set(this.link, { ...this });
+      return this;
+    }
+
+    static async findOne(query) {
+      await roundTrip();
+      const doc = store.get(query.link);
+      return doc ? new MockModel(doc) : null;
+    }
+
+    static find(query) {
+      return {
+        lean: async () => {
+          await roundTrip();
+          return query.link.$in
+            .filter((link) => store.has(link))
+            .map((link) => ({ ...store.get(link) }));
+        },
+      };
+    }
+
+    static async bulkWrite(operations) {
+      await roundTrip();
+      let insertedCount = 0;
+      let modifiedCount = 0;
+      const docsById = new Map(
+        Array.from(store.values()).map((d) => [d._id, d])
+      );
+      for (const op of operations) {
+        if (op.insertOne) {
+          store.set(op.insertOne.document.link, {
+            ...op.insertOne.document,
+            _id: nextId++,
+          });
+          insertedCount++;
+        } else if (op.updateOne) {
+          const doc = docsById.get(op.updateOne.filter._id);
+          Object.assign(doc, op.updateOne.update.$set);
+          modifiedCount++;
+        }
+      }
+      return { insertedCount, modifiedCount };
+    }
+  }
+
+  return { Model: MockModel, stats, store };
+}
+
+/**
+ * The pre-bulk ingestion loop: one findOne and one save per article.
+ * Kept here (simplified to the fields that drive round trips) as the baseline.
+ */
+async function legacyStore(sourceKey, Model, articles) {
+  for (const articleData of articles) {
+    const { title, link, description, imageUrl, content } = articleData;
+    const cleanLink = link.split("?")[0].split("#")[0];
+    const existingArticle = await Model.findOne({ link: cleanLink });
+    const categories = assignCategoriesToArticle(title, description || content);
+
+    if (existingArticle) {
+      if (existingArticle.title !== title || !existingArticle.imageUrl) {
+        existingArticle.title = title;
+        existingArticle.imageUrl = existingArticle.imageUrl || imageUrl;
+        existingArticle.categories = categories;
+        await existingArticle.save();
+      }
+    } else {
+      await new Model({
+        title,
+        link: cleanLink,
+        pubDate: new Date(articleData.publishedAt),
+        source: sourceKey,
+        description: description || null,
+        imageUrl: imageUrl || null,
+        categories,
+      }).save();
+    }
+  }
+}
+
+function makeArticles(count, titleSuffix) {
+  const articles = [];
+  for (let i = 0; i < count; i++) {
+    articles.push({
+      title: `India economy update number ${i}${titleSuffix}`,
+      link: `https://example.com/news/story-${i}/article${i}.ece?ref=home`,
+      description: `story ${i} about the market and parliament`,
+      imageUrl: `https://example.com/img/${i}.jpg`,
+      publishedAt: new Date().toISOString(),
+    });
+  }
+  return articles;
+}
+
+async function measure(label, storeFn) {
+  const { Model, stats } = createMockModel(LATENCY_MS);
+  // First cycle inserts everything; second cycle re-scrapes with half of the
+  // titles changed, which is the common steady-state shape.
+  const firstCycle = makeArticles(ARTICLE_COUNT, "");
+  const secondCycle = firstCycle.map((a, i) =>
+    i % 2 === 0 ? { ...a, title: `${a.title} (updated)` } : a
+  );
+
+  const start = process.hrtime.bigint();
+  await storeFn("bench", Model, firstCycle);
+  await storeFn("bench", Model, secondCycle);
+  const durationMs = Number(process.hrtime.bigint() - start) / 1_000_000;
+
+  console.log(
+    `${label.padEnd(12)} round trips: ${String(stats.roundTrips).padStart(
+      5
+    )}  wall time: ${durationMs.toFixed(1)} ms`
+  );
+}
+
+(async () => {
+  console.log(
+    `Ingesting ${ARTICLE_COUNT} articles x 2 cycles, ${LATENCY_MS} ms per round trip`
+  );
+  await measure("per-article", legacyStore);
+  await measure("bulk", bulkUpsertArticles);
+})();
@@ -0,0 +1,130 @@
+# benchmarks/listing_index_benchmark.py
+#
+# Compares the per-link ancestor walks previously used by the TOI and
+# Indian Express scrapers with the single-pass link index, on synthetic
+# full-size front pages. Also checks that both find the same links/images.
+#
+# Usage: python benchmarks/listing_index_benchmark.py [repeats]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import indian_express  # noqa: E402
+import times_of_india_scraper  # noqa: E402
+
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+
+def make_toi_front_page(cards=400, seed=7):
+    """Roughly the shape of the TOI /news page: deep wrappers, ~1500 anchors."""
+    rng = random.Random(seed)
+    container_classes = ['J_XyX', '_3eP_t', 'c_H85', 'w_Phg', 'plain']
+    parts = ['<html><body><header>']
+    parts += [f'<a href="/section-{i}">Section {i}</a>' for i in range(80)]
+    parts.append('</header><main>')
+    for n in range(cards):
+        wrap = rng.randint(2, 8)
+        cls = rng.choice(container_classes)
+        parts.append('<div class="row"><section>' * (wrap // 2))
+        parts.append(f'<div class="{cls}"><div class="inner"><span>')
+        if rng.random() < 0.7:
+            attr = 'data-src' if rng.random() < 0.5 else 'src'
+            parts.append(f'<figure><img {attr}="/photo/{n}.jpg"></figure>')
+        parts.append(f'<a class="{rng.choice(["VeCXM", "nA5sP", "x"])}" '
+                     f'href="/india/story-number-{n}-about-news/articleshow/{100000 + n}.cms">Story {n}</a>')
+        parts.append(f'<a href="/topic/{n}">topic</a><a href="/city/{n}.cms">city</a>')
+        parts.append('</span></div></div>')
+        parts.append('</section></div>' * (wrap // 2))
+    parts.append('</main><footer>')
+    parts += [f'<a href="/footer-{i}.cms">Footer {i}</a>' for i in range(120)]
+    parts.append('</footer></body></html>')
+    return ''.join(parts)
+
+
+def make_ie_front_page(blocks=300, seed=11):
+    rng = random.Random(seed)
+    parts = ['<html><body><div class="articles"><div class="articles"><ul>']
+    parts += [f'<li><div><a href="https://indianexpress.com/article/list-{i}/">List {i}</a></div></li>'
+              for i in range(150)]
+    parts.append('</ul></div></div>')
+    for n in range(blocks):
+        cls = rng.choice(['section-article', 'other-article', 'misc'])
+        parts.append('<div class="wrap">')
+        if rng.random() < 0.5:
+            parts.append(f'<div class="s-img"><img src="https://images.example/{n}.jpg"></div>')
+        parts.append(f'<div class="{cls}">')
+        if rng.random() < 0.3:
+            parts.append(f'<img src="https://images.example/inline-{n}.jpg">')
+        parts.append(f'<h2><a href="https://indianexpress.com/article/story-{n}/">Story {n}</a></h2>')
+        parts.append(f'<a href="https://indianexpress.com/tag/{n}/">Tag</a></div></div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def toi_ancestor_walk(soup):
+    """The previous TOI lookup: select, then find_parent + select_one per link."""
+    results = []
+    for link_elem in soup.select("a.VeCXM, a.nA5sP, a[href*='.cms']"):
+        img_elem = None
+        container = link_elem.find_parent(class_=['J_XyX', '_3eP_t', 'c_H85', 'w_Phg'])
+        if container:
+            img_elem = container.select_one("img[src], img[data-src]")
+        results.append((link_elem, img_elem))
+    return results
+
+
+def ie_ancestor_walk(soup):
+    """The previous IE lookup: find_parent('div') and find_previous_sibling per link."""
+    results = []
+    for link_elem in soup.select("div.section-article h2 a, div.articles div.articles li a, div.other-article a"):
+        image = None
+        parent_div = link_elem.find_parent('div')
+        if parent_div:
+            img_elem = parent_div.select_one("img[src]")
+            if img_elem and img_elem.get('src'):
+                image = img_elem
+            else:
+                sibling_img_div = parent_div.find_previous_sibling("div", class_="s-img")
+                if sibling_img_div:
+                    img_elem = sibling_img_div.select_one("img[src]")
+                    if img_elem and img_elem.get('src'):
+                        image = img_elem
+        results.append((link_elem, image))
+    return results
+
+
+def best_of(fn, soup):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn(soup)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def compare(label, html, old_fn, new_fn):
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, 'html.parser')
+    parse_seconds = time.perf_counter() - start
+
+    old_seconds, old_result = best_of(old_fn, soup)
+    new_seconds, new_result = best_of(new_fn, soup)
+    assert [(id(a), None if i is None else id(i)) for a, i in old_result] == \
+           [(id(a), None if i is None else id(i)) for a, i in new_result], \
+        f"{label}: index disagrees with the ancestor walk"
+
+    print(f"{label}: {len(html) / 1024:.0f} KiB page, {len(new_result)} candidate links "
+          f"(parse {parse_seconds * 1000:.1f} ms)")
+    print(f"  ancestor walks:    {old_seconds * 1000:8.2f} ms")
+    print(f"  single-pass index: {new_seconds * 1000:8.2f} ms  ({old_seconds / new_seconds:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    compare('TOI front page', make_toi_front_page(), toi_ancestor_walk, times_of_india_scraper.index_article_links)
+    compare('IE front page', make_ie_front_page(), ie_ancestor_walk, indian_express.index_article_links)
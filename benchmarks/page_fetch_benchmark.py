@@ -0,0 +1,130 @@
+# benchmarks/page_fetch_benchmark.py
+#
+# Compares the previous listing fetch (requests.get, then response.text)
+# with page_fetch.fetch_page against the local stand-in server, for a
+# normal-size and an oversized page, with and without gzip. Reports time,
+# bytes on the wire, peak Python allocation per fetch plus decode
+# (tracemalloc) next to the buffer estimate fetch_page logs, and the cost of
+# decoding a body that declares no charset.
+#
+# Usage: python benchmarks/page_fetch_benchmark.py [page_kb] [oversized_kb]
+
+import gc
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+
+SCRAPERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers')
+sys.path.insert(0, SCRAPERS_DIR)
+
+import requests  # noqa: E402
+
+from page_fetch import FetchedPage, fetch_page, make_session  # noqa: E402
+from standin_server import render_listing  # noqa: E402
+
+PAGE_KB = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+OVERSIZED_KB = int(sys.argv[2]) if len(sys.argv) > 2 else 32 * 1024
+MAX_BYTES = 8 * 1024 * 1024
+REPEATS = 5
+
+
+def previous_fetch(url):
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    return len(response.text), int(response.headers.get('Content-Length', 0)), None
+
+
+def streamed_fetch(session, url):
+    page = fetch_page(session, url, 'dna', 30, MAX_BYTES)
+    return len(page.text), page.wire_bytes, page.estimated_buffer_bytes
+
+
+def measure(fetch):
+    """(best seconds, characters, wire bytes, peak traced bytes, estimated buffer bytes or None)."""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        chars, wire, estimate = fetch()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    gc.collect()
+    tracemalloc.start()
+    fetch()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, chars, wire, peak, estimate
+
+
+def start_server(page_kb, use_gzip):
+    """Runs the stand-in server in its own process, so tracemalloc only sees the client."""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    command = [sys.executable, os.path.join(SCRAPERS_DIR, 'standin_server.py'), '--port', str(port),
+               '--page-kb', str(page_kb)] + (['--gzip'] if use_gzip else [])
+    server = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return server, f'http://127.0.0.1:{port}'
+
+
+def fetch_rows(page_kb, use_gzip):
+    server, server_url = start_server(page_kb, use_gzip)
+    url = f'{server_url}/dna/latest-news'
+    session = make_session({}, 1)
+    try:
+        return [('requests.get + .text', measure(lambda: previous_fetch(url))),
+                ('fetch_page + .text', measure(lambda: streamed_fetch(session, url)))]
+    finally:
+        session.close()
+        server.terminate()
+        server.wait()
+
+
+def undeclared_charset_decode(body):
+    """Decode time for a body without a charset: requests' detector versus the page_fetch sniff."""
+    response = requests.Response()
+    response._content = body
+    response.encoding = None
+    start = time.perf_counter()
+    response.text
+    detected = time.perf_counter() - start
+
+    page = FetchedPage('', 200, {}, body, None, False, len(body), 0, None)
+    start = time.perf_counter()
+    page.text
+    sniffed = time.perf_counter() - start
+    return detected, response.apparent_encoding, sniffed, page.encoding
+
+
+def main():
+    logging.disable(logging.WARNING)
+    print(f"{'page':<10} {'gzip':<5} {'fetch':<22} {'time':>8} {'decoded':>10} {'wire':>10} {'peak alloc':>11} "
+          f"{'logged est.':>11}")
+    for page_kb in (PAGE_KB, OVERSIZED_KB):
+        for use_gzip in (False, True):
+            for label, (seconds, chars, wire, peak, estimate) in fetch_rows(page_kb, use_gzip):
+                estimate = f"{estimate / 2**20:7.1f} MiB" if estimate is not None else f"{'-':>11}"
+                print(f"{page_kb:>6} KiB {'yes' if use_gzip else 'no':<5} {label:<22} {seconds * 1000:6.1f}ms "
+                      f"{chars / 2**20:6.1f} MiB {wire / 2**20:6.2f} MiB {peak / 2**20:7.1f} MiB {estimate}")
+
+    # A Hindi-language listing: non-ASCII text the detector has to examine
+    hindi = '<p>' + 'भारत सरकार ने आज संसद में नया विधेयक पेश किया। ' * 20 + '</p>'
+    body = render_listing('dna', 'http://example.com/dna', 0, 200).replace('</main>', hindi * 20 + '</main>')
+    body = body.replace('<meta charset="utf-8">', '').encode('utf-8')
+    detected, detected_as, sniffed, sniffed_as = undeclared_charset_decode(body)
+    print(f"\nDecoding a {len(body) // 1024} KiB page with no declared charset:")
+    print(f"  requests .text (charset detection): {detected * 1000:7.1f}ms ({detected_as})")
+    print(f"  FetchedPage.text (UTF-8 first):     {sniffed * 1000:7.1f}ms ({sniffed_as})")
+
+
+if __name__ == '__main__':
+    main()
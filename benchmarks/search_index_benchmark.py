@@ -0,0 +1,117 @@
+# benchmarks/search_index_benchmark.py
+#
+# Shows search latency of the inverted index (scrapers/search_index.py)
+# against a case-insensitive regex scan over title/description - the same
+# work GET /search asks MongoDB to do - as the article count grows. Queries
+# run against an open index, as in the long-lived `search_index.py serve`
+# process behind GET /search (benchmarks/search_route_benchmark.js times the
+# route itself). 'add 1' is the cost of indexing one article's extracted
+# content, as content_scraper.py does after every article.
+#
+# Usage: python benchmarks/search_index_benchmark.py [sizes...]
+#        e.g. python benchmarks/search_index_benchmark.py 1000 10000 50000
+
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+
+from search_index import SearchIndex  # noqa: E402
+
+SIZES = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+BATCH = 500 # Articles per ingest call, like a multi-source scrape cycle
+# Selective queries (typical user searches) and broad ones whose result set
+# itself grows with the corpus.
+SELECTIVE_QUERIES = ['kanishka bombing', 'term1500', 'term40 court', 'term777 term12']
+BROAD_QUERIES = ['monsoon session', 'supreme court verdict', 'cricket final']
+
+# A Zipf-like vocabulary: a handful of very common news words followed by a
+# long tail, which is what makes posting lists short for most query terms.
+COMMON_WORDS = ('india government court monsoon election market cricket policy minister delhi mumbai '
+                'report budget climate space railway supreme verdict session parliament rbi rate '
+                'bank river flood startup team match police state health school farmer final').split()
+TAIL_WORDS = [f'term{n}' for n in range(20000)] + ['kanishka', 'bombing']
+
+
+def pick_word(rng):
+    if rng.random() < 0.25:
+        return rng.choice(COMMON_WORDS)
+    # Zipf-ish rank over the tail
+    return TAIL_WORDS[min(len(TAIL_WORDS) - 1, int(rng.paretovariate(1.1)) - 1)]
+
+
+def make_article(rng, n):
+    words = [pick_word(rng) for _ in range(rng.randint(8, 14))]
+    title = ' '.join(words).capitalize()
+    return {
+        'title': title,
+        'link': f'https://example.com/news/{"-".join(words[:6])}/article{n}.ece',
+        'description': ' '.join(words),
+        'publishedAt': '2024-07-01T00:00:00+00:00',
+    }
+
+
+def time_queries(fn, queries):
+    samples = []
+    for _ in range(3):
+        for query in queries:
+            start = time.perf_counter()
+            fn(query)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def add_one(index, articles, rng):
+    """Median ms to re-index one existing article with its content, over 20 adds."""
+    samples = []
+    for _ in range(20):
+        article = rng.choice(articles)
+        start = time.perf_counter()
+        index.add_articles('bench', [{'link': article['link'], 'content': article['description'] * 20}])
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def regex_scan(articles, query):
+    regex = re.compile(query, re.IGNORECASE)
+    return [a for a in articles if regex.search(a['title']) or regex.search(a['description'])]
+
+
+def main():
+    rng = random.Random(42)
+    articles = []
+    index_dir = tempfile.mkdtemp(prefix='gpress-search-bench-')
+    index = SearchIndex(index_dir)
+    try:
+        print(f"{'articles':>9}  {'ingest/article':>14}  {'add 1':>9}  {'index selective':>15}  "
+              f"{'index broad':>11}  {'regex scan':>10}")
+        for size in SIZES:
+            previous_size = len(articles)
+            start = time.perf_counter()
+            while len(articles) < size:
+                batch = [make_article(rng, len(articles) + i) for i in range(min(BATCH, size - len(articles)))]
+                index.add_articles('bench', batch)
+                articles.extend(batch)
+            ingest_ms = (time.perf_counter() - start) * 1000
+
+            add_ms = add_one(index, articles, rng)
+
+            with SearchIndex(index_dir) as reader:
+                selective_ms = time_queries(lambda q: reader.search(q, limit=50), SELECTIVE_QUERIES)
+                broad_ms = time_queries(lambda q: reader.search(q, limit=50), BROAD_QUERIES)
+            scan_ms = time_queries(lambda q: regex_scan(articles, q), SELECTIVE_QUERIES + BROAD_QUERIES)
+            added = len(articles) - previous_size
+            print(f"{size:>9}  {ingest_ms / max(1, added):>11.3f} ms  {add_ms:>6.2f} ms  {selective_ms:>12.2f} ms  "
+                  f"{broad_ms:>8.2f} ms  {scan_ms:>7.2f} ms")
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+// benchmarks/search_route_benchmark.js
+//
+// Times GET /search end to end below Express: searchNews() is the whole
+// route handler body. The articles live in in-memory mock models (a fixed
+// latency per database round trip, as in ingestion_bulk_benchmark.js) and
+// in a real search index built in a temporary directory. Compares:
+//   - the previous route: one `search_index.py search` process per query
+//   - searchNews() through the long-lived `search_index.py serve` process
+//   - searchNews() for a mid-word fragment, which falls back to the regex scan
+//
+// Usage: node benchmarks/search_route_benchmark.js [articles] [queries] [latencyMs]
+
+const { spawn } = require("child_process");
+const fs = require("fs");
+const os = require("os");
+const path = require("path");
+
+const ARTICLE_COUNT = parseInt(process.argv[2]) || 20000;
+const QUERY_COUNT = parseInt(process.argv[3]) || 50;
+const LATENCY_MS = parseFloat(process.argv[4]) || 2;
+
+const INDEX_DIR = fs.mkdtempSync(path.join(os.tmpdir(), "gpress-search-route-"));
+process.env.GPRESS_SEARCH_INDEX_DIR = INDEX_DIR; // Inherited by every search_index.py
+
+const {
+  searchNews,
+  stopSearchIndexProcess,
+} = require("../services/searchIndexService");
+
+const SEARCH_INDEX_SCRIPT = path.join(__dirname, "..", "scrapers", "search_index.py");
+const WORDS = (
+  "india government court monsoon election market cricket policy minister delhi mumbai " +
+  "report budget climate space railway supreme verdict session parliament bank river flood"
+).split(" ");
+const QUERIES = ["monsoon session", "cricket", "supreme court verdict", "-flood", "budget rail"];
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+function makeArticles(count) {
+  const articles = [];
+  for (let i = 0; i < count; i++) {
+    const words = [0, 1, 2, 3, 4, 5].map((k) => WORDS[(i * 7 + k * 13 + (i % (k + 2))) % WORDS.length]);
+    articles.push({
+      title: `${words.join(" ")} story ${i}`,
+      link: `https://example.com/news/${words.join("-")}-${i}`,
+      description: words.slice(2).join(" "),
+      pubDate: new Date(Date.now() - i * 60000),
+    });
+  }
+  return articles;
+}
+
+/**
+ * A Mongoose-like model supporting the two queries searchNews makes.
+ */
+function createMockModel(articles) {
+  const byLink = new Map(articles.map((a) => [a.link, a]));
+  return {
+    find(query) {
+      let results;
+      if (query.link) {
+        results = query.link.$in.filter((l) => byLink.has(l)).map((l) => byLink.get(l));
+      } else {
+        const [{ title: regex }] = query.$or;
+        results = articles.filter((a) => regex.test(a.title) || regex.test(a.description));
+      }
+      const chain = {
+        sort: () => chain,
+        lean: async () => {
+          await sleep(LATENCY_MS);
+          return results;
+        },
+      };
+      return chain;
+    },
+  };
+}
+
+function runScript(args, input) {
+  return new Promise((resolve, reject) => {
+    const child = spawn("python", [SEARCH_INDEX_SCRIPT, ...args]);
+    let output = "";
+    child.stdout.on("data", (data) => (output += data));
+    child.on("error", reject);
+    child.on("close", (code) =>
+      code === 0 ? resolve(output) : reject(new Error(`exit ${code}`))
+    );
+    child.stdin.end(input || "");
+  });
+}
+
+async function previousRoute(query, sourceConfig) {
+  const indexed = JSON.parse(await runScript(["search", "--limit", "50", "--", query]));
+  const links = indexed.results.map((hit) => hit.link);
+  await sourceConfig.bench.model.find({ link: { $in: links } }).lean();
+  return indexed.total;
+}
+
+async function time(label, fn) {
+  const samples = [];
+  let total = 0;
+  for (let i = 0; i < QUERY_COUNT; i++) {
+    const start = process.hrtime.bigint();
+    total = await fn(QUERIES[i % QUERIES.length]);
+    samples.push(Number(process.hrtime.bigint() - start) / 1e6);
+  }
+  samples.sort((a, b) => a - b);
+  const median = samples[Math.floor(samples.length / 2)];
+  const p95 = samples[Math.floor(samples.length * 0.95)];
+  console.log(
+    `${label.padEnd(42)} median ${median.toFixed(1).padStart(7)} ms   p95 ${p95
+      .toFixed(1)
+      .padStart(7)} ms   (last: ${total} hits)`
+  );
+}
+
+(async () => {
+  const articles = makeArticles(ARTICLE_COUNT);
+  for (let i = 0; i < articles.length; i += 2000) {
+    const batch = articles.slice(i, i + 2000).map((a) => ({
+      ...a,
+      publishedAt: a.pubDate.toISOString(),
+    }));
+    await runScript(["add", "--source", "bench"], JSON.stringify(batch));
+  }
+  const sourceConfig = { bench: { model: createMockModel(articles) } };
+  console.log(
+    `${ARTICLE_COUNT} articles, ${QUERY_COUNT} queries, ${LATENCY_MS} ms per database round trip`
+  );
+
+  try {
+    await time("spawn per query (previous route)", (q) => previousRoute(q, sourceConfig));
+    await searchNews("warm up", 1, 50, sourceConfig); // Starts the query process
+    await time("searchNews, long-lived query process", async (q) =>
+      (await searchNews(q, 1, 50, sourceConfig)).totalResults
+    );
+    await time("searchNews, fragment (regex fallback)", async () =>
+      (await searchNews("ricke", 1, 50, sourceConfig)).totalResults
+    );
+  } finally {
+    stopSearchIndexProcess();
+    fs.rmSync(INDEX_DIR, { recursive: true, force: true });
+  }
+})();
@@ -22,7 +22,9 @@ const sourceConfig = {
     modelName: "TheHindu",
     sourceName: "The Hindu",
     collectionName: "hindus",
-    updateInterval: 30 * 60 * 1000, // 30 minutes
+    updateInterval: 30 * 60 * 1000, // 30 minutes (initial; adapted by the scheduler)
+    minUpdateInterval: 15 * 60 * 1000, // 15 minutes
+    maxUpdateInterval: 6 * 60 * 60 * 1000, // 6 hours
     lastScraped: null,
   },
   "hindustan-times": {
@@ -31,7 +33,9 @@ const sourceConfig = {
     modelName: "HindustanTimes",
     sourceName: "Hindustan Times",
     collectionName: "hindustantimes",
-    updateInterval: 30 * 60 * 1000, // 30 minutes
+    updateInterval: 30 * 60 * 1000, // 30 minutes (initial; adapted by the scheduler)
+    minUpdateInterval: 15 * 60 * 1000, // 15 minutes
+    maxUpdateInterval: 6 * 60 * 60 * 1000, // 6 hours
     lastScraped: null,
   },
   toi: {
@@ -40,7 +44,9 @@ const sourceConfig = {
     modelName: "TimesOfIndia",
     sourceName: "Times of India",
     collectionName: "tois",
-    updateInterval: 30 * 60 * 1000, // 30 minutes
+    updateInterval: 30 * 60 * 1000, // 30 minutes (initial; adapted by the scheduler)
+    minUpdateInterval: 10 * 60 * 1000, // 10 minutes
+    maxUpdateInterval: 6 * 60 * 60 * 1000, // 6 hours
     lastScraped: null,
   },
   ie: {
@@ -49,7 +55,9 @@ const sourceConfig = {
     modelName: "IndianExpress",
     sourceName: "Indian Express",
     collectionName: "ies",
-    updateInterval: 30 * 60 * 1000, // 30 minutes
+    updateInterval: 30 * 60 * 1000, // 30 minutes (initial; adapted by the scheduler)
+    minUpdateInterval: 15 * 60 * 1000, // 15 minutes
+    maxUpdateInterval: 6 * 60 * 60 * 1000, // 6 hours
     lastScraped: null,
   },
   dna: {
@@ -58,7 +66,9 @@ const sourceConfig = {
     modelName: "DNA",
     sourceName: "DNA",
     collectionName: "dnas",
-    updateInterval: 30 * 60 * 1000, // 30 minutes
+    updateInterval: 30 * 60 * 1000, // 30 minutes (initial; adapted by the scheduler)
+    minUpdateInterval: 15 * 60 * 1000, // 15 minutes
+    maxUpdateInterval: 6 * 60 * 60 * 1000, // 6 hours
     lastScraped: null,
   },
 };
@@ -22,12 +22,20 @@ const questionsRouter = require("./routes/questions");
 
 // Import services for scheduled tasks
 const {
-  runAllScrapers,
+  runDueScrapers,
   cleanupOldNews,
 } = require("./services/ingestionService");
+const {
+  loadSchedulerState,
+  getSchedulerStatus,
+} = require("./services/scrapeScheduler");
 const {
   processArticlesForContentAndAI,
 } = require("./services/articleProcessor");
+const {
+  syncContentExtraction,
+  getExtractionQueueStats,
+} = require("./services/extractionQueueService");
 
 // Import models (important for Mongoose to know about them if used in other modules implicitly)
 require("./models/User");
@@ -122,6 +130,11 @@ mongoose
   .then(() => {
     console.log("✅ MongoDB connected successfully.");
 
+    // Restore per-source polling intervals and next-run times
+    loadSchedulerState();
+    // Prevents the per-minute scheduler tick from overlapping a running pipeline
+    let scheduledPipelineRunning = true;
+
     // Initial data pipeline run on startup
     (async () => {
       try {
@@ -129,8 +142,9 @@ mongoose
         const initialPipelineStartTime = process.hrtime.bigint();
 
         const scraperStartTime = process.hrtime.bigint();
-        console.log("Running initial scrapers...");
-        await runAllScrapers();
+        console.log("Running initial scrapers for sources that are due...");
+        await runDueScrapers();
+        await syncContentExtraction();
         const scraperEndTime = process.hrtime.bigint();
         const scraperDurationMs =
           Number(scraperEndTime - scraperStartTime) / 1_000_000;
@@ -178,21 +192,36 @@ mongoose
           "❌ Error during initial data pipeline on startup:",
           error
         );
+      } finally {
+        scheduledPipelineRunning = false;
       }
     })();
 
-    // Schedule scrapers and AI processing to run every 2 hours
+    // Check every minute which sources are due according to their adaptive
+    // polling interval, and run only those scrapers plus AI processing.
     cron.schedule(
-      "0 */2 * * *",
+      "* * * * *",
       async () => {
+        if (scheduledPipelineRunning) {
+          return; // Previous run still in progress; due sources will wait.
+        }
+        scheduledPipelineRunning = true;
         const scheduledPipelineStartTime = process.hrtime.bigint();
-        console.log(
-          `⏰ Starting scheduled data pipeline at ${new Date().toISOString()}...`
-        );
+        let scrapedSources = [];
         try {
           const scraperStartTime = process.hrtime.bigint();
-          console.log("Running scheduled scrapers...");
-          await runAllScrapers();
+          scrapedSources = await runDueScrapers();
+          // Extraction workers finish jobs independently of scraping, so
+          // exchange jobs and results with the queue every minute.
+          await syncContentExtraction();
+          if (scrapedSources.length === 0) {
+            return;
+          }
+          console.log(
+            `⏰ Scheduled scrape of ${scrapedSources.join(
+              ", "
+            )} at ${new Date().toISOString()}...`
+          );
           const scraperEndTime = process.hrtime.bigint();
           const scraperDurationMs =
             Number(scraperEndTime - scraperStartTime) / 1_000_000;
@@ -219,15 +248,18 @@ mongoose
         } catch (error) {
           console.error("❌ Error during scheduled data pipeline:", error);
         } finally {
-          const scheduledPipelineEndTime = process.hrtime.bigint();
-          const scheduledPipelineDurationMs =
-            Number(scheduledPipelineEndTime - scheduledPipelineStartTime) /
-            1_000_000;
-          console.log(
-            `--- Scheduled data pipeline finished in ${scheduledPipelineDurationMs.toFixed(
-              2
-            )} ms ---`
-          );
+          scheduledPipelineRunning = false;
+          if (scrapedSources.length > 0) {
+            const scheduledPipelineEndTime = process.hrtime.bigint();
+            const scheduledPipelineDurationMs =
+              Number(scheduledPipelineEndTime - scheduledPipelineStartTime) /
+              1_000_000;
+            console.log(
+              `--- Scheduled data pipeline finished in ${scheduledPipelineDurationMs.toFixed(
+                2
+              )} ms ---`
+            );
+          }
         }
       },
       {
@@ -277,6 +309,19 @@ app.get("/internal-heartbeat", (req, res) => {
   res.status(200).send("OK");
 });
 
+// Per-source polling interval, observed change rate and next run time
+app.get("/scheduler-status", (req, res) => {
+  res.status(200).json({ sources: getSchedulerStatus() });
+});
+
+app.get("/extraction-queue-status", async (req, res) => {
+  try {
+    res.status(200).json(await getExtractionQueueStats());
+  } catch (error) {
+    res.status(503).json({ message: "Extraction queue unavailable." });
+  }
+});
+
 app.get("/", (req, res) => {
   res.status(200).send("G-Press Backend is running!");
 });
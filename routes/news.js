@@ -12,6 +12,7 @@ const {
   assignCategoriesToArticle, // Import categorization logic (not directly used here but good to keep)
   SCHEMA_ENUM_CATEGORIES, // Import enum for categories (not directly used here but good to keep)
 } = require("../services/articleProcessor"); // Adjust path if needed
+const { searchNews } = require("../services/searchIndexService");
 
 // Helper to format source names for display
 const formatSourceForDisplay = (configKey) => {
@@ -515,34 +516,10 @@ router.get("/search", async (req, res) => {
     });
   }
 
+  // Ranked results from the inverted index built by the scrapers, falling
+  // back to a regex scan when the index is unavailable or finds nothing.
   try {
-    let searchResults = []; // Using $regex for partial match, 'i' for case-insensitivity
-    const regex = new RegExp(query, "i");
-
-    for (const sourceKey in sourceConfig) {
-      const Model = sourceConfig[sourceKey].model;
-      if (Model) {
-        const sourceSearchResults = await Model.find({
-          $or: [{ title: regex }, { description: regex }],
-        })
-          .sort({ pubDate: -1 }) // Sort each source's results by date
-          .lean();
-        searchResults.push(...sourceSearchResults);
-      }
-    } // Sort globally across all sources by publication date
-
-    searchResults.sort((a, b) => new Date(b.pubDate) - new Date(a.pubDate));
-
-    const startIndex = (page - 1) * limit;
-    const endIndex = page * limit;
-    const paginatedResults = searchResults.slice(startIndex, endIndex);
-
-    res.status(200).json({
-      news: paginatedResults,
-      currentPage: page,
-      totalPages: Math.ceil(searchResults.length / limit),
-      totalResults: searchResults.length,
-    });
+    res.status(200).json(await searchNews(query, page, limit, sourceConfig));
   } catch (error) {
     console.error("Error during news search:", error);
     res.status(500).json({ message: "Failed to perform search." });
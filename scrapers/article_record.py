@@ -0,0 +1,139 @@
+# scrapers/article_record.py
+#
+# The one article schema every listing scraper emits, and the writers for
+# the scrapers' stdout.
+#
+# ArticleRecord is a slotted class: a batch of records takes under a third
+# of the memory of the equivalent dicts. Its wire form (to_dict) uses the keys
+# services/ingestionService.js reads, and `source` is always the source key
+# from config/sources.js ('hindu', 'hindustan-times', 'toi', 'ie', 'dna').
+#
+# Output formats, chosen with --output on a scraper's command line:
+#   json     (default) one compact JSON array
+#   msgpack  length-prefixed MessagePack: for each article, a 4-byte
+#            big-endian length followed by one MessagePack map. Needs the
+#            optional `msgpack` package; without it the scraper logs a
+#            warning and writes JSON, which the Node reader recognises by
+#            its leading '['.
+
+import json
+import logging
+import struct
+import sys
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, only needed for --output msgpack
+    msgpack = None
+
+OUTPUT_OPTION = '--output'
+OUTPUT_FORMATS = ('json', 'msgpack')
+FRAME_HEADER = struct.Struct('>I')
+
+# Attribute name -> key in the JSON/MessagePack output
+WIRE_KEYS = {
+    'title': 'title',
+    'link': 'link',
+    'description': 'description',
+    'image_url': 'imageUrl',
+    'published_at': 'publishedAt',
+    'source': 'source',
+    'content': 'content',
+    'categories': 'categories',
+}
+ATTRIBUTES = {wire_key: attribute for attribute, wire_key in WIRE_KEYS.items()}
+
+
+class ArticleRecord:
+    """One scraped article."""
+
+    # image_candidates (ranked ImageCandidates, see image_resolution.py) is
+    # scraper-side only and never written out
+    __slots__ = tuple(WIRE_KEYS) + ('image_candidates',)
+
+    def __init__(self, source, title, link, published_at, description=None, image_url=None, content=None,
+                 categories=(), image_candidates=()):
+        self.source = source
+        self.title = title
+        self.link = link
+        self.published_at = published_at
+        self.description = description
+        self.image_url = image_url or None
+        self.content = content
+        self.categories = categories
+        self.image_candidates = image_candidates
+
+    def to_dict(self):
+        return {
+            'title': self.title,
+            'link': self.link,
+            'description': self.description,
+            'imageUrl': self.image_url,
+            'publishedAt': self.published_at,
+            'source': self.source,
+            'content': self.content,
+            'categories': list(self.categories),
+        }
+
+    # Dict-style reads by wire key, so code that also handles articles
+    # decoded from JSON (search_index.add_articles) accepts either
+    def get(self, key, default=None):
+        attribute = ATTRIBUTES.get(key)
+        return getattr(self, attribute) if attribute else default
+
+    def __getitem__(self, key):
+        attribute = ATTRIBUTES.get(key)
+        if attribute is None:
+            raise KeyError(key)
+        return getattr(self, attribute)
+
+    def __repr__(self):
+        return f"ArticleRecord({self.source!r}, {self.link!r})"
+
+
+def output_format_requested(argv=None):
+    """
+    Returns the --output format from argv (default sys.argv), or 'json'.
+    Removes the option from argv so positional arguments keep their places.
+    """
+    argv = sys.argv if argv is None else argv
+    output_format = 'json'
+    for index in range(len(argv) - 1, 0, -1):
+        argument = argv[index]
+        if argument.startswith(OUTPUT_OPTION + '='):
+            output_format = argument.split('=', 1)[1]
+            del argv[index]
+        elif argument == OUTPUT_OPTION and index + 1 < len(argv):
+            output_format = argv[index + 1]
+            del argv[index:index + 2]
+    if output_format not in OUTPUT_FORMATS:
+        raise SystemExit(f"Unknown output format '{output_format}'; expected one of {', '.join(OUTPUT_FORMATS)}.")
+    return output_format
+
+
+def encode_json(articles):
+    return json.dumps([article.to_dict() for article in articles], ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def iter_msgpack_frames(articles):
+    """Yields one length-prefixed MessagePack frame per article."""
+    packer = msgpack.Packer()
+    for article in articles:
+        payload = packer.pack(article.to_dict())
+        yield FRAME_HEADER.pack(len(payload)) + payload
+
+
+def write_articles(articles, output_format='json', stream=None):
+    """Writes articles to stream (default stdout) in the requested format."""
+    stream = stream or sys.stdout.buffer
+    if output_format == 'msgpack' and msgpack is None:
+        logging.warning("--output msgpack needs the msgpack package (pip install msgpack); writing JSON instead.")
+        output_format = 'json'
+    if output_format == 'msgpack':
+        # Frame by frame, so the whole payload is never held in memory
+        for frame in iter_msgpack_frames(articles):
+            stream.write(frame)
+    else:
+        stream.write(encode_json(articles))
+    stream.flush()
@@ -0,0 +1,97 @@
+# scrapers/content_cleaning.py
+#
+# Post-extraction cleaning shared by every source: drops promo/boilerplate
+# paragraphs and duplicate paragraphs from extracted article text.
+#
+# Each source's boilerplate phrases are casefolded once, at import, into a
+# BoilerplateMatcher. A paragraph is casefolded once and scanned for the
+# phrases, instead of rebuilding the phrase list and calling .lower() on the
+# paragraph and every phrase. (A regex alternation of the phrases measured
+# about twice as slow as these C-level substring scans in CPython.)
+# Duplicates are found with a set of hashes of each paragraph's normalized
+# form (casefolded UTF-8 with ASCII punctuation and whitespace dropped), so
+# paragraphs that differ only in case, spacing or punctuation count as the
+# same.
+
+import string
+
+# Paragraphs containing any of these phrases (case-insensitive) are promos,
+# not article text
+BOILERPLATE_PHRASES = {
+    'toi': ["read full story", "continue reading"],
+    'ie': [
+        "Also Read", "Latest News", "More From", "Join our Telegram channel",
+        "Click here to join our WhatsApp channel", "indian express", "express premium",
+        "for all the latest", "download the indian express app", "sign up for our",
+        "follow express"
+    ],
+    'dna': [
+        "Also Read", "More From", "DNA Web Team", "Disclaimer",
+        "for more such content", "follow us on", "read the full story",
+        "download the app", "share on whatsapp"
+    ],
+}
+
+PARAGRAPH_SEPARATOR = '\n\n'
+# Bytes deleted before hashing; bytes.translate does this in one C pass,
+# several times faster than str.translate or a regex substitution
+NORMALIZE_DELETE = (string.whitespace + string.punctuation).encode('ascii')
+
+
+class BoilerplateMatcher:
+    """A source's boilerplate phrases, casefolded once."""
+
+    __slots__ = ('phrases',)
+
+    def __init__(self, phrases):
+        # Shortest first: short phrases are the cheapest to scan for
+        self.phrases = tuple(sorted({phrase.casefold() for phrase in phrases}, key=len))
+
+    def search(self, folded):
+        """True if the casefolded paragraph contains any phrase."""
+        for phrase in self.phrases:
+            if phrase in folded:
+                return True
+        return False
+
+
+BOILERPLATE_MATCHERS = {source: BoilerplateMatcher(phrases) for source, phrases in BOILERPLATE_PHRASES.items()}
+
+
+def paragraph_key(folded):
+    """Hash of a casefolded paragraph's normalized text, to spot near-duplicates."""
+    return hash(folded.encode('utf-8').translate(None, NORMALIZE_DELETE))
+
+
+def clean_content(content, source_name):
+    """
+    Drops boilerplate and duplicate paragraphs from extracted content.
+    Returns (cleaned content or None if nothing is left, stats) where stats
+    counts paragraphs kept/removed and the UTF-8 bytes removed.
+    """
+    stats = {'paragraphs': 0, 'boilerplate': 0, 'duplicates': 0, 'bytes_removed': 0}
+    if not content:
+        return content, stats
+
+    matcher = BOILERPLATE_MATCHERS.get(source_name)
+    seen = set()
+    kept = []
+    for paragraph in content.split(PARAGRAPH_SEPARATOR):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        folded = paragraph.casefold()
+        if matcher is not None and matcher.search(folded):
+            stats['boilerplate'] += 1
+            continue
+        key = paragraph_key(folded)
+        if key in seen:
+            stats['duplicates'] += 1
+            continue
+        seen.add(key)
+        kept.append(paragraph)
+
+    cleaned = PARAGRAPH_SEPARATOR.join(kept) if kept else None
+    stats['paragraphs'] = len(kept)
+    stats['bytes_removed'] = len(content.encode('utf-8')) - (len(cleaned.encode('utf-8')) if cleaned else 0)
+    return cleaned, stats
@@ -0,0 +1,149 @@
+# scrapers/crawl_frontier.py
+#
+# Multi-section listing crawl shared by the requests-based scrapers. Instead
+# of one listing page per source, each source's sections (SECTION_PATHS in
+# source_urls.py) are crawled together:
+#
+#   - page 1 of every section is fetched first, with at most `concurrency`
+#     requests in flight on one pooled requests.Session; pages are fetched
+#     with page_fetch.fetch_page (streamed, size-capped) and archived and
+#     parsed as they arrive;
+#   - page N+1 of a section is only queued if page N yielded links not
+#     already seen in any section, and only up to the source's depth budget;
+#   - links are deduplicated across sections (query string and fragment
+#     ignored), and no new pages are queued once the item budget is met;
+#   - a page that fails is logged and skipped, but if no listing page loads
+#     at all the first section's error is re-raised, so a scraper's own
+#     requests.exceptions handling still reports a source that is down.
+#
+# Because sections are fetched side by side, a crawl of S sections costs
+# about ceil(S / concurrency) page latencies per depth level instead of S.
+# The result is ordered by (page, section), so it does not depend on the
+# order in which responses arrive.
+#
+# Budgets default to CRAWL_BUDGETS below and can be overridden globally or
+# per source with environment variables:
+#   GPRESS_CRAWL_MAX_DEPTH, GPRESS_CRAWL_MAX_ITEMS, GPRESS_CRAWL_CONCURRENCY
+#   GPRESS_<SOURCE>_CRAWL_MAX_DEPTH, GPRESS_<SOURCE>_CRAWL_MAX_ITEMS
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit, urlunsplit
+
+from html_archive import archive_response
+from page_fetch import fetch_page, make_session
+from source_urls import get_base_url, get_page_path, get_section_paths
+
+DEFAULT_CONCURRENCY = 4
+REQUEST_TIMEOUT = 15
+
+# (pages per section, unique articles) for each source
+CRAWL_BUDGETS = {
+    'hindu': (2, 100),
+    'hindustan-times': (2, 100),
+    'toi': (2, 100),
+    'ie': (2, 100),
+    'dna': (2, 100),
+}
+
+
+class CrawlBudget:
+    """Depth, item and concurrency limits for one source's crawl."""
+
+    __slots__ = ('max_depth', 'max_items', 'concurrency')
+
+    def __init__(self, max_depth, max_items, concurrency=DEFAULT_CONCURRENCY):
+        self.max_depth = max(1, max_depth)
+        self.max_items = max(1, max_items)
+        self.concurrency = max(1, concurrency)
+
+
+def _env_int(names, default):
+    for name in names:
+        value = os.environ.get(name)
+        if value:
+            return int(value)
+    return default
+
+
+def get_crawl_budget(source):
+    """Returns the source's budget, with per-source then global environment overrides."""
+    prefix = f"GPRESS_{source.upper().replace('-', '_')}_CRAWL_"
+    max_depth, max_items = CRAWL_BUDGETS[source]
+    return CrawlBudget(
+        _env_int([prefix + 'MAX_DEPTH', 'GPRESS_CRAWL_MAX_DEPTH'], max_depth),
+        _env_int([prefix + 'MAX_ITEMS', 'GPRESS_CRAWL_MAX_ITEMS'], max_items),
+        _env_int(['GPRESS_CRAWL_CONCURRENCY'], DEFAULT_CONCURRENCY))
+
+
+def normalize_link(link):
+    """Key used to spot the same article linked from several sections."""
+    parts = urlsplit(link)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/') or '/', '', ''))
+
+
+def crawl_source(source, parse_page, headers, budget=None):
+    """
+    Crawls a source's sections and returns its unique articles (at most
+    budget.max_items). parse_page(page) returns the ArticleRecords on one
+    listing page, a page_fetch.FetchedPage. A page that fails to load is
+    logged and skipped; if every page fails, the error of the first failed
+    section is raised (e.g. requests.exceptions.HTTPError from fetch_page).
+    """
+    budget = budget or get_crawl_budget(source)
+    base_url = get_base_url(source)
+    sections = get_section_paths(source)
+
+    session = make_session(headers, budget.concurrency)
+
+    def fetch(section_path, page):
+        return fetch_page(session, base_url + get_page_path(source, section_path, page), source, REQUEST_TIMEOUT)
+
+    seen = set()
+    pages = {}  # (page, section index) -> articles
+    errors = {}  # section index -> first exception
+    pending = {}
+    with session, ThreadPoolExecutor(max_workers=budget.concurrency) as pool:
+        for index, section_path in enumerate(sections):
+            pending[pool.submit(fetch, section_path, 1)] = (index, 1)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, page = pending.pop(future)
+                try:
+                    fetched = future.result()
+                    # Archived and parsed on this thread: the archive writer is
+                    # not thread-safe, and parsing holds the GIL regardless
+                    archive_response(source, 'listing', fetched)
+                    articles = parse_page(fetched)
+                except Exception as e:
+                    logging.error(f"{source}: listing {sections[index]} page {page} failed: {e}")
+                    errors.setdefault(index, e)
+                    continue
+                pages[(page, index)] = articles
+
+                new_links = 0
+                for article in articles:
+                    key = normalize_link(article.link)
+                    if key not in seen:
+                        seen.add(key)
+                        new_links += 1
+                if new_links and page < budget.max_depth and len(seen) < budget.max_items:
+                    pending[pool.submit(fetch, sections[index], page + 1)] = (index, page + 1)
+
+    if not pages and errors:
+        raise errors[min(errors)]
+
+    unique = []
+    kept = set()
+    for position in sorted(pages):
+        for article in pages[position]:
+            key = normalize_link(article.link)
+            if key not in kept:
+                kept.add(key)
+                unique.append(article)
+    logging.info(f"{source}: {len(unique)} unique articles from {len(pages)} listing pages "
+                 f"across {len(sections)} sections; keeping {min(len(unique), budget.max_items)}.")
+    return unique[:budget.max_items]
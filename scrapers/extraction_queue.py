@@ -0,0 +1,247 @@
+# scrapers/extraction_queue.py
+#
+# File-backed work queue for article content extraction, so the costly
+# browser step can run in any number of worker processes (extraction_worker.py)
+# instead of inside the Node process.
+#
+# Jobs are (url, source) rows in a SQLite database (WAL mode). A worker
+# claims jobs with a time-bounded lease and renews it while it works; a
+# lease that expires (worker crashed or hung) puts the job back in the
+# queue, up to MAX_ATTEMPTS claims. Results are written back idempotently:
+# the first completion of a job wins and later ones are no-ops. Node
+# collects finished jobs with `results` and acknowledges them with `ack`.
+#
+# Workers on other machines can share the database over a network
+# filesystem only if it implements POSIX locks correctly (SQLite's own
+# requirement); otherwise run the workers on the host that owns the file.
+#
+# CLI (JSON on stdin/stdout):
+#   python extraction_queue.py enqueue < jobs.json     [{"url": ..., "source": ...}]
+#   python extraction_queue.py results [--limit 100]
+#   python extraction_queue.py ack < urls.json         ["https://...", ...]
+#   python extraction_queue.py stats
+#   python extraction_queue.py prune --days 20
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+
+QUEUE_PATH_ENV = 'GPRESS_EXTRACTION_QUEUE'
+DEFAULT_QUEUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'extraction-queue.sqlite3')
+
+DEFAULT_LEASE_SECONDS = 180
+MAX_ATTEMPTS = 3
+THROUGHPUT_WINDOW_SECONDS = 15 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    url TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued', -- queued | leased | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    expired_leases INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    finished_at REAL,
+    content TEXT,
+    error TEXT,
+    delivered INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, enqueued_at);
+CREATE INDEX IF NOT EXISTS jobs_by_lease ON jobs (lease_expires) WHERE state = 'leased';
+CREATE INDEX IF NOT EXISTS jobs_undelivered ON jobs (finished_at) WHERE delivered = 0 AND state IN ('done', 'failed');
+"""
+
+
+def get_queue_path():
+    return os.environ.get(QUEUE_PATH_ENV) or DEFAULT_QUEUE_PATH
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class ExtractionQueue:
+    """A connection to the extraction queue database."""
+
+    def __init__(self, path=None):
+        self.path = path or get_queue_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Autocommit mode; multi-statement changes use _transaction()
+        self.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so two workers can never
+        # read the same queued rows and both claim them.
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
+
+    def enqueue(self, jobs):
+        """Adds (url, source) jobs; URLs already in the queue are left as they are. Returns the number added."""
+        now = time.time()
+        with self._transaction():
+            before = self.db.total_changes
+            self.db.executemany(
+                'INSERT INTO jobs (url, source, enqueued_at) VALUES (?, ?, ?) ON CONFLICT (url) DO NOTHING',
+                [(job['url'], job['source'], now) for job in jobs if job.get('url') and job.get('source')])
+            return self.db.total_changes - before
+
+    def _requeue_expired(self, now):
+        """Returns jobs with expired leases to the queue, or fails them after MAX_ATTEMPTS claims."""
+        self.db.execute(
+            "UPDATE jobs SET state = 'failed', error = 'lease expired', finished_at = ?, lease_owner = NULL, "
+            "lease_expires = NULL, expired_leases = expired_leases + 1 "
+            "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?", (now, now, MAX_ATTEMPTS))
+        self.db.execute(
+            "UPDATE jobs SET state = 'queued', lease_owner = NULL, lease_expires = NULL, "
+            "expired_leases = expired_leases + 1 WHERE state = 'leased' AND lease_expires < ?", (now,))
+
+    def claim(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS, limit=1):
+        """Leases up to `limit` queued jobs (oldest first). Returns a list of {'url', 'source', 'attempts'}."""
+        now = time.time()
+        with self._transaction():
+            self._requeue_expired(now)
+            rows = self.db.execute(
+                "SELECT url, source, attempts FROM jobs WHERE state = 'queued' ORDER BY enqueued_at LIMIT ?",
+                (limit,)).fetchall()
+            self.db.executemany(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE url = ?", [(worker_id, now + lease_seconds, row['url']) for row in rows])
+        return [{'url': row['url'], 'source': row['source'], 'attempts': row['attempts'] + 1} for row in rows]
+
+    def renew(self, url, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Extends a lease this worker still holds. Returns False if the lease was lost."""
+        cursor = self.db.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE url = ? AND state = 'leased' AND lease_owner = ?",
+            (time.time() + lease_seconds, url, worker_id))
+        return cursor.rowcount == 1
+
+    def complete(self, url, content):
+        """
+        Stores a job's extracted content. Idempotent: a job that is already
+        done (e.g. finished by a worker that took over an expired lease)
+        keeps its first result. Returns True if this call stored the result.
+        """
+        cursor = self.db.execute(
+            "UPDATE jobs SET state = 'done', content = ?, error = NULL, finished_at = ?, lease_owner = NULL, "
+            "lease_expires = NULL, delivered = 0 WHERE url = ? AND state IN ('queued', 'leased')",
+            (content, time.time(), url))
+        return cursor.rowcount == 1
+
+    def fail(self, url, worker_id, error):
+        """
+        Records a failed attempt by the lease holder: the job goes to the back
+        of the queue until it has been claimed MAX_ATTEMPTS times, then is
+        marked failed.
+        """
+        now = time.time()
+        self.db.execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "finished_at = CASE WHEN attempts >= ? THEN ? ELSE NULL END, enqueued_at = ?, error = ?, "
+            "lease_owner = NULL, lease_expires = NULL WHERE url = ? AND state = 'leased' AND lease_owner = ?",
+            (MAX_ATTEMPTS, MAX_ATTEMPTS, now, now, str(error)[:500], url, worker_id))
+
+    def results(self, limit=100):
+        """Returns finished jobs not yet acknowledged, oldest first."""
+        rows = self.db.execute(
+            "SELECT url, source, state, content, error FROM jobs "
+            "WHERE delivered = 0 AND state IN ('done', 'failed') ORDER BY finished_at LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def ack(self, urls):
+        """Marks results as delivered. Returns the number of jobs marked."""
+        with self._transaction():
+            before = self.db.total_changes
+            self.db.executemany(
+                "UPDATE jobs SET delivered = 1, content = NULL WHERE url = ? AND state IN ('done', 'failed')",
+                [(url,) for url in urls])
+            return self.db.total_changes - before
+
+    def prune(self, days):
+        """Deletes delivered jobs finished more than `days` days ago."""
+        cursor = self.db.execute(
+            'DELETE FROM jobs WHERE delivered = 1 AND finished_at < ?', (time.time() - days * 86400,))
+        return cursor.rowcount
+
+    def stats(self):
+        """Queue depth by state, active leases per worker and recent throughput."""
+        now = time.time()
+        with self._transaction():
+            self._requeue_expired(now)
+        counts = {state: 0 for state in ('queued', 'leased', 'done', 'failed')}
+        for row in self.db.execute('SELECT state, COUNT(*) AS n FROM jobs GROUP BY state'):
+            counts[row['state']] = row['n']
+        oldest = self.db.execute("SELECT MIN(enqueued_at) FROM jobs WHERE state = 'queued'").fetchone()[0]
+        finished = self.db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state = 'done' AND finished_at >= ?",
+            (now - THROUGHPUT_WINDOW_SECONDS,)).fetchone()[0]
+        workers = {row['lease_owner']: row['n'] for row in self.db.execute(
+            "SELECT lease_owner, COUNT(*) AS n FROM jobs WHERE state = 'leased' GROUP BY lease_owner")}
+        undelivered = self.db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE delivered = 0 AND state IN ('done', 'failed')").fetchone()[0]
+        expired = self.db.execute('SELECT COALESCE(SUM(expired_leases), 0) FROM jobs').fetchone()[0]
+        return {
+            'depth': counts['queued'],
+            'states': counts,
+            'oldestQueuedSeconds': round(now - oldest, 1) if oldest else None,
+            'completedPerMinute': round(finished / (THROUGHPUT_WINDOW_SECONDS / 60), 2),
+            'activeLeases': workers,
+            'expiredLeases': expired,
+            'undeliveredResults': undelivered,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Content-extraction work queue.')
+    parser.add_argument('--queue', default=None, help=f'Defaults to ${QUEUE_PATH_ENV} or data/extraction-queue.sqlite3')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('enqueue', help='Add a JSON list of {url, source} read from stdin')
+    results_parser = commands.add_parser('results', help='Print finished, unacknowledged jobs')
+    results_parser.add_argument('--limit', type=int, default=100)
+    commands.add_parser('ack', help='Acknowledge a JSON list of URLs read from stdin')
+    commands.add_parser('stats', help='Print queue depth and throughput')
+    prune_parser = commands.add_parser('prune', help='Delete delivered jobs older than N days')
+    prune_parser.add_argument('--days', type=int, required=True)
+    args = parser.parse_args()
+
+    sys.stdout.reconfigure(encoding='utf-8')
+    with ExtractionQueue(args.queue) as queue:
+        if args.command == 'enqueue':
+            print(json.dumps({'enqueued': queue.enqueue(json.load(sys.stdin))}))
+        elif args.command == 'results':
+            json.dump(queue.results(args.limit), sys.stdout, ensure_ascii=False)
+        elif args.command == 'ack':
+            print(json.dumps({'acknowledged': queue.ack(json.load(sys.stdin))}))
+        elif args.command == 'stats':
+            print(json.dumps(queue.stats()))
+        elif args.command == 'prune':
+            print(json.dumps({'deleted': queue.prune(args.days)}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# scrapers/extraction_worker.py
+#
+# Claims jobs from the extraction queue (extraction_queue.py), runs
+# content_scraper.scrape_article_content on each and writes the result back.
+# Start as many as the host (or hosts) can run browsers:
+#
+#   python extraction_worker.py [--queue PATH] [--lease-seconds 180]
+#                               [--max-jobs N] [--exit-when-idle] [--profile]
+#
+# --profile writes a cProfile per job (see profiling.py).
+#
+# While a job runs, a background thread renews its lease every third of the
+# lease period, so only a crashed or hung worker lets a lease expire.
+
+import argparse
+import logging
+import sys
+import threading
+import time
+
+from extraction_queue import DEFAULT_LEASE_SECONDS, ExtractionQueue, default_worker_id
+from profiling import PROFILE_ENV, profile_env_enabled, profiled
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+IDLE_POLL_SECONDS = 5
+
+
+class LeaseKeeper:
+    """Renews a job's lease on its own connection until stopped."""
+
+    def __init__(self, queue_path, url, worker_id, lease_seconds):
+        self.queue_path = queue_path
+        self.url = url
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        with ExtractionQueue(self.queue_path) as queue:
+            while not self.stopped.wait(self.lease_seconds / 3):
+                if not queue.renew(self.url, self.worker_id, self.lease_seconds):
+                    logging.warning(f"Lost the lease on {self.url}; another worker may take it over.")
+                    return
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+
+def run_worker(queue, extract, worker_id=None, lease_seconds=DEFAULT_LEASE_SECONDS, max_jobs=None,
+               exit_when_idle=False):
+    """
+    Processes jobs until max_jobs are done, or the queue is empty when
+    exit_when_idle is set. extract(url, source) returns content or None.
+    Returns the number of jobs processed.
+    """
+    worker_id = worker_id or default_worker_id()
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        jobs = queue.claim(worker_id, lease_seconds)
+        if not jobs:
+            if exit_when_idle:
+                break
+            time.sleep(IDLE_POLL_SECONDS)
+            continue
+
+        job = jobs[0]
+        start = time.perf_counter()
+        try:
+            with LeaseKeeper(queue.path, job['url'], worker_id, lease_seconds):
+                content = extract(job['url'], job['source'])
+        except Exception as e:
+            content = None
+            error = str(e)
+        else:
+            error = 'no content extracted'
+
+        if content:
+            stored = queue.complete(job['url'], content)
+            logging.info(f"[{worker_id}] {job['source']} {job['url']}: {len(content)} chars in "
+                         f"{time.perf_counter() - start:.1f}s{'' if stored else ' (already completed elsewhere)'}")
+        else:
+            queue.fail(job['url'], worker_id, error)
+            logging.warning(f"[{worker_id}] {job['source']} {job['url']}: attempt {job['attempts']} failed: {error}")
+        processed += 1
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run content extraction jobs from the queue.')
+    parser.add_argument('--queue', default=None, help='Queue database path (defaults as in extraction_queue.py)')
+    parser.add_argument('--worker-id', default=None, help='Defaults to <hostname>-<pid>')
+    parser.add_argument('--lease-seconds', type=float, default=DEFAULT_LEASE_SECONDS)
+    parser.add_argument('--max-jobs', type=int, default=None)
+    parser.add_argument('--exit-when-idle', action='store_true', help='Stop when no job is queued')
+    parser.add_argument('--profile', action='store_true', help=f'Profile each job (also enabled by ${PROFILE_ENV})')
+    args = parser.parse_args()
+
+    # Imported here so importing run_worker does not require Selenium
+    from content_scraper import scrape_article_content
+
+    extract = scrape_article_content
+    if args.profile or profile_env_enabled():
+        def extract(url, source):
+            with profiled(source, url):
+                return scrape_article_content(url, source)
+
+    with ExtractionQueue(args.queue) as queue:
+        processed = run_worker(queue, extract, args.worker_id, args.lease_seconds,
+                               args.max_jobs, args.exit_when_idle)
+    logging.info(f"Worker finished after {processed} jobs.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,46 @@
 import requests
 from bs4 import BeautifulSoup
-import json
 import re
 import logging
 import datetime
 import sys
 
+from article_record import ArticleRecord, output_format_requested, write_articles
+from crawl_frontier import crawl_source
+from image_resolution import best_image_url, resolve_article_images
+from profiling import profile_requested, profiled
+from source_urls import get_base_url
+
 sys.stdout.reconfigure(encoding='utf-8')
 # Configure logging to write to stderr
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
 
 def get_hindu_articles():
     """
-    Scrapes articles from The Hindu's National News section.
+    Scrapes articles from The Hindu's sections (National News first).
     Extracts title, link, image URL, and publication time.
     The description is derived from the link's slug.
     """
-    base_url = "https://www.thehindu.com"
-    target_url = "https://www.thehindu.com/news/national/" # Targeting the National News page
-    articles = []
+    base_url = get_base_url('hindu')
 
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
     }
 
-    logging.info(f"Navigating to {target_url} for The Hindu National News.")
     try:
-        response = requests.get(target_url, headers=headers, timeout=15)
-        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
+        articles = crawl_source('hindu', lambda page: parse_hindu_articles(page.text, base_url), headers)
     except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching {target_url}: {e}")
+        logging.error(f"Error fetching The Hindu listings: {e}")
         return []
+    resolve_article_images('hindu', articles, headers)
+    return articles
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+def parse_hindu_articles(html, base_url="https://www.thehindu.com"):
+    """
+    Extracts articles from a fetched National News listing page.
+    """
+    articles = []
+    soup = BeautifulSoup(html, 'html.parser')
 
     article_blocks = soup.find_all("div", class_="element row-element")
 
@@ -48,6 +56,7 @@ def get_hindu_articles():
         link = ''
         description = '' # Will be populated from the link
         image_url = ''
+        image_candidates = []
         published_date = datetime.datetime.now(datetime.timezone.utc).isoformat() # Default to current UTC time if not found
 
         # --- Extract Title and Link ---
@@ -71,21 +80,7 @@ def get_hindu_articles():
         # --- Extract Image URL ---
         picture_div = block.find('div', class_='picture')
         if picture_div:
-            img_tag = picture_div.find('img', src=True)
-            if img_tag:
-                image_url = img_tag['src']
-                if not image_url or 'data:image' in image_url:
-                    image_url = img_tag.get('data-src', '').strip()
-                    if not image_url and img_tag.get('srcset'):
-                        srcset_parts = img_tag['srcset'].split(',')
-                        if srcset_parts:
-                            image_url = srcset_parts[0].strip().split(' ')[0]
-
-                if image_url and not image_url.startswith('http'):
-                    if image_url.startswith('//'):
-                        image_url = 'https:' + image_url
-                    elif image_url.startswith('/'):
-                        image_url = base_url + image_url
+            image_url, image_candidates = best_image_url(picture_div.find('img'), base_url)
 
         # --- Extract Publication Date/Time (Time Logs) ---
         by_line_div = block.find('div', class_='by-line')
@@ -115,14 +110,12 @@ def get_hindu_articles():
             description = title
 
 
-        articles.append({
-            'title': title,
-            'link': link,
-            'description': description, # Now populated from the link slug
-            'image_url': image_url,
-            'source': 'The Hindu',
-            'publishedAt': published_date
-        })
+        articles.append(ArticleRecord(
+            'hindu', title, link, published_date,
+            description=description, # Now populated from the link slug
+            image_url=image_url,
+            image_candidates=image_candidates,
+        ))
         logging.info(f"Hindu National News Item {count+1}: Added article: '{title}' Link: {link} Published At: {published_date}")
         count += 1
 
@@ -130,9 +123,10 @@ def get_hindu_articles():
 
 if __name__ == '__main__':
     logging.info("Starting Hindu scraper...")
-    scraped_articles = get_hindu_articles()
-    logging.info(f"Scraped {len(scraped_articles)} articles from The Hindu National News.")
+    output_format = output_format_requested()
+    with profiled('hindu', 'listing', enabled=profile_requested()):
+        scraped_articles = get_hindu_articles()
+        logging.info(f"Scraped {len(scraped_articles)} articles from The Hindu.")
 
-    # Print the scraped articles as JSON to standard output
-    json.dump(scraped_articles, sys.stdout, indent=4, ensure_ascii=False)
-    sys.stdout.flush()
\ No newline at end of file
+        # Print the scraped articles to standard output
+        write_articles(scraped_articles, output_format)
\ No newline at end of file
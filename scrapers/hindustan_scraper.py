@@ -1,18 +1,100 @@
-import json
 import sys
 from datetime import datetime, timezone # Import timezone
 import logging
 import requests
 from bs4 import BeautifulSoup
 
+from article_record import ArticleRecord, output_format_requested, write_articles
+from crawl_frontier import crawl_source
+from image_resolution import best_image_url, resolve_article_images
+from profiling import profile_requested, profiled
+from source_urls import get_base_url
+
 sys.stdout.reconfigure(encoding='utf-8')
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def parse_hindustan_times_articles(html, base_url="https://www.hindustantimes.com"):
+    """
+    Extracts articles from a fetched Hindustan Times latest-news listing page.
+    """
+    all_articles = []
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Use the same CSS selector for article containers as in the Selenium script
+    article_divs = soup.select("div.cartHolder.listView")
+
+    logging.info(f"Found {len(article_divs)} potential article containers.")
+
+    if not article_divs:
+        logging.warning("No 'div.cartHolder.listView' elements found. Check selector or page structure.")
+        return [] # Return empty list if no main containers are found
+
+    for i, div in enumerate(article_divs):
+        if len(all_articles) >= 25: # Limit to top 25 articles
+            logging.info(f"Reached 25 articles for Hindustan Times. Stopping.")
+            break
+
+        title = None
+        link = None
+        description = None
+        imageUrl = None
+        image_candidates = []
+
+        # Use UTC time and include timezone information
+        published_at = datetime.now(timezone.utc).isoformat() 
+
+        try:
+            # Extract title and URL from data attributes as in the original Selenium script
+            title = div.get('data-vars-story-title')
+            relative_url = div.get('data-vars-story-url')
+
+            if relative_url:
+                link = base_url + relative_url
+            else:
+                logging.warning(f"HT Item {i+1}: Missing 'data-vars-story-url'. Skipping.")
+                continue
+
+            # Clean title if it contains specific span tags (as per original script)
+            if title:
+                title = title.replace("<span class='webrupee'>₹</span>", "₹").strip()
+            else:
+                logging.warning(f"HT Item {i+1}: Missing 'data-vars-story-title'. Skipping.")
+                continue
+
+            description_elem = div.select_one("div.detail p.para-txt")
+            if description_elem:
+                description = description_elem.get_text(strip=True)
+            else:
+                description = title # Fallback to title if no specific description found
+
+            # Extract Image URL
+            # Look for an img tag within div.img-sec or similar structure
+            imageUrl, image_candidates = best_image_url(div.select_one("div.img-sec img"), base_url)
+            # imageUrl remains None if not found, consistent with DNA scraper
+
+            if title and link and len(title) > 5 and link.startswith('http'):
+                # Content and categories are not on the listing page
+                all_articles.append(ArticleRecord(
+                    'hindustan-times', title, link, published_at,
+                    description=description,
+                    image_url=imageUrl,
+                    image_candidates=image_candidates,
+                ))
+                logging.info(f"HT Item {i+1}: Added article: '{title[:50]}...'")
+            else:
+                logging.warning(f"HT Item {i+1}: Skipping due to missing valid title or link, or short title. Title: '{title}', Link: '{link}'")
+
+        except Exception as e:
+            logging.error(f"HT Item {i+1}: Error processing article: {e}. Skipping to next.")
+            continue # Continue to next article even if one fails
+
+    return all_articles
+
 def get_hindustan_times_articles():
     sys.stdout.reconfigure(encoding='utf-8') # Ensure stdout is UTF-8
 
-    base_url = "https://www.hindustantimes.com"
-    url = f"{base_url}/latest-news"
+    base_url = get_base_url('hindustan-times')
 
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36',
@@ -26,83 +108,9 @@ def get_hindustan_times_articles():
     all_articles = []
 
     try:
-        logging.info(f"Fetching page content from {url} for Hindustan Times...")
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Use the same CSS selector for article containers as in the Selenium script
-        article_divs = soup.select("div.cartHolder.listView")
-        
-        logging.info(f"Found {len(article_divs)} potential article containers.")
-
-        if not article_divs:
-            logging.warning("No 'div.cartHolder.listView' elements found. Check selector or page structure.")
-            return [] # Return empty list if no main containers are found
-
-        for i, div in enumerate(article_divs):
-            if len(all_articles) >= 25: # Limit to top 25 articles
-                logging.info(f"Reached 25 articles for Hindustan Times. Stopping.")
-                break
-
-            title = None
-            link = None
-            description = None
-            imageUrl = None
-            
-            # Use UTC time and include timezone information
-            published_at = datetime.now(timezone.utc).isoformat() 
-
-            try:
-                # Extract title and URL from data attributes as in the original Selenium script
-                title = div.get('data-vars-story-title')
-                relative_url = div.get('data-vars-story-url')
-                
-                if relative_url:
-                    link = base_url + relative_url
-                else:
-                    logging.warning(f"HT Item {i+1}: Missing 'data-vars-story-url'. Skipping.")
-                    continue
-
-                # Clean title if it contains specific span tags (as per original script)
-                if title:
-                    title = title.replace("<span class='webrupee'>₹</span>", "₹").strip()
-                else:
-                    logging.warning(f"HT Item {i+1}: Missing 'data-vars-story-title'. Skipping.")
-                    continue
-                
-                description_elem = div.select_one("div.detail p.para-txt")
-                if description_elem:
-                    description = description_elem.get_text(strip=True)
-                else:
-                    description = title # Fallback to title if no specific description found
-
-                # Extract Image URL
-                # Look for an img tag within div.img-sec or similar structure
-                img_elem = div.select_one("div.img-sec img")
-                if img_elem and img_elem.get('src'):
-                    imageUrl = img_elem.get('src')
-                # imageUrl remains None if not found, consistent with DNA scraper
-
-                if title and link and len(title) > 5 and link.startswith('http'):
-                    all_articles.append({
-                        "title": title,
-                        "link": link,
-                        "publishedAt": published_at,
-                        "description": description,
-                        "source": "hindustantimes",
-                        "imageUrl": imageUrl,
-                        "content": None, # Full content would require visiting each article link
-                        "categories": [], # Not easily available on listing page
-                    })
-                    logging.info(f"HT Item {i+1}: Added article: '{title[:50]}...'")
-                else:
-                    logging.warning(f"HT Item {i+1}: Skipping due to missing valid title or link, or short title. Title: '{title}', Link: '{link}'")
-
-            except Exception as e:
-                logging.error(f"HT Item {i+1}: Error processing article: {e}. Skipping to next.")
-                continue # Continue to next article even if one fails
+        all_articles = crawl_source(
+            'hindustan-times', lambda page: parse_hindustan_times_articles(page.text, base_url), headers)
+        resolve_article_images('hindustan-times', all_articles, headers)
 
     except requests.exceptions.HTTPError as e:
         logging.error(f"Hindustan Times Scraper: HTTP error occurred: {e} - Status Code: {e.response.status_code}")
@@ -119,10 +127,12 @@ def get_hindustan_times_articles():
     except Exception as e:
         logging.error(f"Hindustan Times Scraper: An unexpected error occurred: {e}")
         all_articles = []
-    finally:
-        # Print the entire list of articles as JSON to stdout.
-        json.dump(all_articles, sys.stdout, ensure_ascii=False, indent=2)
-        logging.info("Hindustan Times scraping process finished.")
+
+    logging.info("Hindustan Times scraping process finished.")
+    return all_articles
 
 if __name__ == "__main__":
-    get_hindustan_times_articles()
\ No newline at end of file
+    output_format = output_format_requested()
+    with profiled('hindustan-times', 'listing', enabled=profile_requested()):
+        # Print the entire list of articles to stdout for Node.js
+        write_articles(get_hindustan_times_articles(), output_format)
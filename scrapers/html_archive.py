@@ -0,0 +1,161 @@
+# scrapers/html_archive.py
+#
+# Optional append-only archive of every page the scrapers fetch, so that
+# extraction can be re-run later over the stored HTML without refetching.
+#
+# Layout (WARC-like):
+#   <archive_dir>/segments/<timestamp>-<pid>.gz
+#       A sequence of independent gzip members, one per fetched page, from
+#       any source. Each member holds a one-line JSON header followed by the
+#       raw body bytes. A process appends to one segment at a time, so the
+#       extraction worker's mixed-source pages share it too.
+#   <archive_dir>/index.jsonl
+#       One JSON line per record: url, source, kind, fetched_at, encoding,
+#       status, segment, offset, length. Appended with a single write.
+#
+# The archive is enabled by setting GPRESS_HTML_ARCHIVE_DIR. When it is not
+# set, archive_page() is a no-op.
+
+import datetime
+import gzip
+import json
+import logging
+import os
+import zlib
+
+ARCHIVE_DIR_ENV = 'GPRESS_HTML_ARCHIVE_DIR'
+MAX_SEGMENT_BYTES = 64 * 1024 * 1024  # Start a new segment after 64 MB
+
+_writer = None
+
+
+def get_archive_dir():
+    """Returns the configured archive directory, or None if archiving is off."""
+    return os.environ.get(ARCHIVE_DIR_ENV) or None
+
+
+class ArchiveWriter:
+    """Appends compressed page records to this process's segment file."""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.segment_dir = os.path.join(archive_dir, 'segments')
+        self.index_path = os.path.join(archive_dir, 'index.jsonl')
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self.segment_name = None
+        self.segment_file = None
+
+    def _open_segment(self):
+        if self.segment_file:
+            self.segment_file.close()
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        self.segment_name = f"{stamp}-{os.getpid()}.gz"
+        self.segment_file = open(os.path.join(self.segment_dir, self.segment_name), 'ab')
+
+    def write(self, url, source, kind, body, status=200, encoding=None):
+        if isinstance(body, str):
+            encoding = encoding or 'utf-8'
+            body = body.encode(encoding, errors='replace')
+
+        if not self.segment_file or self.segment_file.tell() >= MAX_SEGMENT_BYTES:
+            self._open_segment()
+
+        fetched_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        header = {
+            'url': url,
+            'source': source,
+            'kind': kind,
+            'fetched_at': fetched_at,
+            'encoding': encoding,
+            'status': status,
+        }
+        record = gzip.compress(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n' + body)
+
+        offset = self.segment_file.tell()
+        self.segment_file.write(record)
+        self.segment_file.flush()
+
+        entry = dict(header, segment=self.segment_name, offset=offset, length=len(record))
+        with open(self.index_path, 'a', encoding='utf-8') as index_file:
+            index_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def close(self):
+        if self.segment_file:
+            self.segment_file.close()
+            self.segment_file = None
+
+
+def archive_page(source, kind, url, body, status=200, encoding=None):
+    """
+    Stores one fetched page if archiving is enabled.
+    kind is 'listing' for section pages and 'article' for article pages.
+    Failures are logged and never interrupt scraping.
+    """
+    global _writer
+    archive_dir = get_archive_dir()
+    if not archive_dir or body is None:
+        return
+    try:
+        if _writer is None or _writer.archive_dir != archive_dir:
+            if _writer:
+                _writer.close()
+            _writer = ArchiveWriter(archive_dir)
+        _writer.write(url, source, kind, body, status=status, encoding=encoding)
+    except Exception as e:
+        logging.warning(f"HTML archive: could not store {url}: {e}")
+
+
+def archive_response(source, kind, response):
+    """Convenience wrapper for a requests.Response."""
+    archive_page(source, kind, response.url, response.content,
+                 status=response.status_code, encoding=response.encoding)
+
+
+def read_index(archive_dir, source=None, kind=None, since=None, latest_only=False):
+    """
+    Reads index entries, optionally filtered by source, kind and a minimum
+    ISO fetched_at. With latest_only, keeps the newest record per URL.
+    """
+    index_path = os.path.join(archive_dir, 'index.jsonl')
+    entries = []
+    with open(index_path, encoding='utf-8') as index_file:
+        for line in index_file:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if source and entry['source'] != source:
+                continue
+            if kind and entry['kind'] != kind:
+                continue
+            if since and entry['fetched_at'] < since:
+                continue
+            entries.append(entry)
+
+    if latest_only:
+        latest = {}
+        for entry in entries:
+            key = (entry['source'], entry['kind'], entry['url'])
+            if key not in latest or entry['fetched_at'] > latest[key]['fetched_at']:
+                latest[key] = entry
+        entries = list(latest.values())
+    return entries
+
+
+def iter_records(archive_dir, entries):
+    """
+    Yields (entry, body_bytes) for the given index entries. Records are read
+    segment by segment in file order so the archive is scanned sequentially.
+    """
+    by_segment = {}
+    for entry in entries:
+        by_segment.setdefault(entry['segment'], []).append(entry)
+
+    for segment_name in sorted(by_segment):
+        path = os.path.join(archive_dir, 'segments', segment_name)
+        with open(path, 'rb') as segment_file:
+            for entry in sorted(by_segment[segment_name], key=lambda e: e['offset']):
+                segment_file.seek(entry['offset'])
+                raw = zlib.decompress(segment_file.read(entry['length']), wbits=31)
+                _, _, body = raw.partition(b'\n')
+                yield entry, body
@@ -0,0 +1,310 @@
+# scrapers/image_resolution.py
+#
+# Picks and validates the image stored for each scraped article.
+#
+# Parsers collect every candidate URL of an article's <img> with
+# image_candidates(): srcset / data-srcset entries (with their width or
+# density descriptors), data-src and src, made absolute, minus data: URIs
+# and spacer/placeholder images. rank_candidates() orders them for a card
+# of TARGET_WIDTH pixels: the smallest candidate at least that wide, then
+# narrower ones (widest first), then candidates of unknown size in markup
+# order. The parser stores the top-ranked URL right away.
+#
+# resolve_images() then validates the ranked candidates with HEAD requests
+# (at most `concurrency` in flight, one pooled session) and keeps the first
+# that answers with an image, falling back down the ranking past dead links.
+# A candidate that cannot be checked (timeout, 5xx) is kept unverified
+# rather than dropped. Results (status, content type, byte size and the
+# width/height known from the markup) are cached per URL in SQLite with a
+# TTL (OK_TTL_SECONDS for images, FAILED_TTL_SECONDS for dead links), so
+# repeat runs skip revalidation; expired rows are deleted on open.
+#
+# Environment:
+#   GPRESS_IMAGE_CACHE         cache path (default data/image-cache.sqlite3)
+#   GPRESS_IMAGE_TARGET_WIDTH  card width in pixels (default 640)
+#   GPRESS_IMAGE_CONCURRENCY   HEAD requests in flight (default 8)
+#   GPRESS_IMAGE_VALIDATION=0  keep the top-ranked URLs without checking
+
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+
+from page_fetch import make_session
+
+CACHE_PATH_ENV = 'GPRESS_IMAGE_CACHE'
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'image-cache.sqlite3')
+
+TARGET_WIDTH = int(os.environ.get('GPRESS_IMAGE_TARGET_WIDTH') or 640)
+DEFAULT_CONCURRENCY = int(os.environ.get('GPRESS_IMAGE_CONCURRENCY') or 8)
+REQUEST_TIMEOUT = 5
+OK_TTL_SECONDS = 7 * 86400
+FAILED_TTL_SECONDS = 6 * 3600
+
+# Any of these in a URL marks a spacer or lazy-load placeholder
+PLACEHOLDER_MARKERS = ('.gif', 'spacer', 'placeholder', 'blank.')
+SRCSET_ATTRIBUTES = ('srcset', 'data-srcset')
+SRC_ATTRIBUTES = ('data-src', 'data-original', 'src')
+DESCRIPTOR_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)([wx])$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    url TEXT PRIMARY KEY,
+    ok INTEGER NOT NULL,
+    status INTEGER,
+    content_type TEXT,
+    bytes INTEGER,
+    width INTEGER,
+    height INTEGER,
+    checked_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS images_by_expiry ON images (expires_at);
+"""
+
+
+class ImageCandidate:
+    """One URL an <img> offers, with the width it is known to have (or None)."""
+
+    __slots__ = ('url', 'width', 'height')
+
+    def __init__(self, url, width=None, height=None):
+        self.url = url
+        self.width = width
+        self.height = height
+
+    def __repr__(self):
+        return f"ImageCandidate({self.url!r}, {self.width})"
+
+
+def _int_attribute(img, name):
+    value = (img.get(name) or '').strip().removesuffix('px')
+    return int(value) if value.isdigit() and int(value) > 0 else None
+
+
+def is_placeholder(url):
+    lowered = url.lower()
+    return lowered.startswith('data:') or any(marker in lowered for marker in PLACEHOLDER_MARKERS)
+
+
+def absolute_url(url, base_url):
+    """Resolves url like the scrapers resolve links: root-relative paths go under base_url."""
+    if url.startswith('//'):
+        return 'https:' + url
+    if url.startswith('/'):
+        return base_url.rstrip('/') + url
+    return urljoin(base_url.rstrip('/') + '/', url)
+
+
+def parse_srcset(srcset):
+    """Yields (url, width_or_None, density_or_None) for each srcset entry."""
+    for entry in srcset.split(','):
+        parts = entry.split()
+        if not parts:
+            continue
+        width = density = None
+        for descriptor in parts[1:]:
+            match = DESCRIPTOR_PATTERN.match(descriptor)
+            if match and match.group(2) == 'w':
+                width = int(float(match.group(1)))
+            elif match:
+                density = float(match.group(1))
+        yield parts[0], width, density
+
+
+def image_candidates(img, base_url):
+    """All usable image URLs of an <img> tag (or None), absolute and deduplicated."""
+    if img is None:
+        return []
+    markup_width = _int_attribute(img, 'width')
+    markup_height = _int_attribute(img, 'height')
+
+    def height_for(width):
+        if width and markup_width and markup_height:
+            return round(width * markup_height / markup_width)
+        return None
+
+    candidates = []
+    seen = set()
+
+    def add(url, width):
+        url = url.strip()
+        if not url or is_placeholder(url):
+            return
+        url = absolute_url(url, base_url)
+        if url not in seen:
+            seen.add(url)
+            candidates.append(ImageCandidate(url, width, height_for(width)))
+
+    for attribute in SRCSET_ATTRIBUTES:
+        for url, width, density in parse_srcset(img.get(attribute) or ''):
+            if width is None and density and markup_width:
+                width = round(markup_width * density)
+            add(url, width)
+    for attribute in SRC_ATTRIBUTES:
+        add(img.get(attribute) or '', markup_width)
+    return candidates
+
+
+def rank_candidates(candidates, target_width=TARGET_WIDTH):
+    """Best first: smallest at least target_width wide, then narrower ones, then unknown sizes."""
+    wide_enough = sorted((c for c in candidates if c.width and c.width >= target_width), key=lambda c: c.width)
+    narrower = sorted((c for c in candidates if c.width and c.width < target_width), key=lambda c: -c.width)
+    unknown = [c for c in candidates if not c.width]
+    return wide_enough + narrower + unknown
+
+
+def best_image_url(img, base_url, target_width=TARGET_WIDTH):
+    """(top-ranked URL or None, ranked candidates) for an <img> tag."""
+    ranked = rank_candidates(image_candidates(img, base_url), target_width)
+    return (ranked[0].url if ranked else None), ranked
+
+
+def get_cache_path():
+    return os.environ.get(CACHE_PATH_ENV) or DEFAULT_CACHE_PATH
+
+
+class ImageCache:
+    """Per-URL validation results with TTL eviction."""
+
+    def __init__(self, path=None):
+        self.path = path or get_cache_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+        self.evicted = self.prune()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def prune(self):
+        """Deletes expired entries. Returns the number deleted."""
+        with self.db:
+            return self.db.execute('DELETE FROM images WHERE expires_at < ?', (time.time(),)).rowcount
+
+    def lookup(self, urls):
+        """Returns {url: row} for the unexpired entries among urls."""
+        urls = list(urls)
+        found = {}
+        now = time.time()
+        for start in range(0, len(urls), 500):
+            batch = urls[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT * FROM images WHERE expires_at >= ? AND url IN ({','.join('?' * len(batch))})",
+                [now, *batch])
+            found.update((row['url'], row) for row in rows)
+        return found
+
+    def store(self, results):
+        """Saves (candidate, ok, status, content_type, bytes) tuples."""
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO images (url, ok, status, content_type, bytes, width, height, checked_at, '
+                'expires_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(candidate.url, int(ok), status, content_type, size, candidate.width, candidate.height, now,
+                  now + (OK_TTL_SECONDS if ok else FAILED_TTL_SECONDS))
+                 for candidate, ok, status, content_type, size in results])
+
+
+def check_image(session, url):
+    """
+    HEADs url (falling back to a one-byte GET where HEAD is refused).
+    Returns (ok, status, content_type, bytes), or None if the check itself
+    failed (timeout, connection error, 5xx) and says nothing about the image.
+    """
+    try:
+        response = session.head(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+        if response.status_code in (403, 405, 501):
+            response = session.get(url, timeout=REQUEST_TIMEOUT, stream=True, headers={'Range': 'bytes=0-0'})
+            response.close()
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code >= 500 or response.status_code == 429:
+        return None
+    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower() or None
+    size = response.headers.get('Content-Length')
+    content_range = response.headers.get('Content-Range', '')
+    if response.status_code == 206 and '/' in content_range:
+        size = content_range.rsplit('/', 1)[1]
+    size = int(size) if size and size.isdigit() else None
+    ok = response.status_code in (200, 206) and (content_type is None or content_type.startswith('image/'))
+    return ok, response.status_code, content_type, size
+
+
+def resolve_images(articles, headers, cache=None, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Sets each article's image_url to its best working candidate (or None if
+    every candidate is dead). Articles need an image_candidates list in
+    rank order. Returns counts for logging.
+    """
+    stats = {'images': 0, 'cached': 0, 'checked': 0, 'dead': 0, 'unverified': 0, 'evicted': 0}
+    pending = [(article, list(article.image_candidates)) for article in articles if article.image_candidates]
+    stats['images'] = len(pending)
+    if not pending or os.environ.get('GPRESS_IMAGE_VALIDATION') == '0':
+        return stats
+
+    own_cache = cache is None
+    cache = cache or ImageCache()
+    stats['evicted'] = cache.evicted
+    session = make_session(headers, concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # Each round checks the current best candidate of every unresolved
+            # article; articles whose candidate is dead move to the next one
+            while pending:
+                current = {candidates[0].url: candidates[0] for _, candidates in pending}
+                known = cache.lookup(current)
+                stats['cached'] += len(known)
+                to_check = [candidate for url, candidate in current.items() if url not in known]
+                checks = dict(zip((c.url for c in to_check), pool.map(lambda c: check_image(session, c.url), to_check)))
+                stats['checked'] += len(to_check)
+                cache.store([(current[url], *result) for url, result in checks.items() if result is not None])
+
+                still_pending = []
+                for article, candidates in pending:
+                    url = candidates[0].url
+                    if url in known:
+                        ok = bool(known[url]['ok'])
+                    elif checks.get(url) is None:
+                        ok = True # Could not check; keep it rather than lose the image
+                        stats['unverified'] += 1
+                    else:
+                        ok = checks[url][0]
+                    if ok:
+                        article.image_url = url
+                    elif len(candidates) > 1:
+                        still_pending.append((article, candidates[1:]))
+                    else:
+                        article.image_url = None
+                        stats['dead'] += 1
+                pending = still_pending
+    finally:
+        session.close()
+        if own_cache:
+            cache.close()
+    return stats
+
+
+def resolve_article_images(source, articles, headers):
+    """resolve_images() for a scraper; failures are logged and never interrupt scraping."""
+    try:
+        stats = resolve_images(articles, headers)
+        logging.info(f"{source}: images for {stats['images']} articles: {stats['cached']} cached, "
+                     f"{stats['checked']} checked, {stats['dead']} dead, {stats['unverified']} unverified, "
+                     f"{stats['evicted']} cache entries expired.")
+    except Exception as e:
+        logging.warning(f"{source}: image resolution failed, keeping the unvalidated picks: {e}")
@@ -1,20 +1,158 @@
 # C:\Users\OKKKK\Desktop\G-Press 1\G-Press\Server\scrapers\indian_express.py
 
-import json
 import sys
 from datetime import datetime
 import logging
 import requests
 from bs4 import BeautifulSoup
 
+from article_record import ArticleRecord, output_format_requested, write_articles
+from crawl_frontier import crawl_source
+from image_resolution import best_image_url, resolve_article_images
+from link_index import ContainerFrame, claim_image, iter_tag_events
+from profiling import profile_requested, profiled
+from source_urls import get_base_url
+
 sys.stdout.reconfigure(encoding='utf-8')
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def index_article_links(soup):
+    """
+    Finds the anchors matched by
+        div.section-article h2 a, div.articles div.articles li a, div.other-article a
+    and the image for each, in one pass over the tree. The image is the first
+    img[src] in the link's nearest div, else the first img[src] in the
+    closest preceding sibling div.s-img of that div.
+    Returns a list of (anchor, img_or_None) in document order.
+    """
+    candidates = [] # (anchor, nearest div frame or None)
+    open_divs = []
+    last_s_img_div = {} # id(parent) -> frame of the latest div.s-img child seen
+    # How many open elements currently satisfy each part of the selectors
+    depth = {'section_article': 0, 'h2_in_section': 0, 'articles': 0,
+             'nested_articles': 0, 'li_in_nested': 0, 'other_article': 0}
+    opened = [] # per open tag: the depth keys it incremented
+
+    for entering, tag in iter_tag_events(soup):
+        if not entering:
+            for key in opened.pop():
+                depth[key] -= 1
+            if open_divs and open_divs[-1].tag is tag:
+                open_divs.pop()
+            continue
+
+        name = tag.name
+        if name == 'a' and (depth['h2_in_section'] or depth['li_in_nested'] or depth['other_article']):
+            candidates.append((tag, open_divs[-1] if open_divs else None))
+        elif name == 'img' and open_divs and tag.has_attr('src'):
+            claim_image(open_divs, tag)
+
+        keys = []
+        if name == 'div':
+            classes = tag.get('class') or ()
+            if 'section-article' in classes:
+                keys.append('section_article')
+            if 'articles' in classes:
+                keys.append('nested_articles' if depth['articles'] else 'articles')
+                if depth['articles']:
+                    keys.append('articles')
+            if 'other-article' in classes:
+                keys.append('other_article')
+
+            frame = ContainerFrame(tag, extra=last_s_img_div.get(id(tag.parent)))
+            if 's-img' in classes:
+                last_s_img_div[id(tag.parent)] = frame
+            open_divs.append(frame)
+        elif name == 'h2' and depth['section_article']:
+            keys.append('h2_in_section')
+        elif name == 'li' and depth['nested_articles']:
+            keys.append('li_in_nested')
+
+        for key in keys:
+            depth[key] += 1
+        opened.append(keys)
+
+    links = []
+    for anchor, frame in candidates:
+        img = None
+        if frame:
+            if frame.image is not None and frame.image.get('src'):
+                img = frame.image
+            elif frame.extra is not None and frame.extra.image is not None and frame.extra.image.get('src'):
+                img = frame.extra.image
+        links.append((anchor, img))
+    return links
+
+def parse_indian_express_articles(html, base_url="https://indianexpress.com"):
+    """
+    Extracts articles from a fetched Indian Express home page.
+    """
+    all_articles = []
+    processed_links = set() # To store links and avoid duplicates
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Links for main headlines, list items in latest-news sections and other
+    # article blocks, each paired with its image
+    article_link_elements = index_article_links(soup)
+
+    logging.info(f"Found {len(article_link_elements)} potential article links.")
+
+    for i, (link_elem, img_elem) in enumerate(article_link_elements):
+        if len(all_articles) >= 25: # Limit to top 25 articles
+            logging.info(f"Reached 25 articles for Indian Express. Stopping.")
+            break
+
+        title = None
+        href = None
+        description = None
+        imageUrl = None
+        image_candidates = []
+
+        # Always use current scraping timestamp for consistency
+        published_at = datetime.now().isoformat()
+
+        try:
+            title = link_elem.get_text(strip=True)
+            href = link_elem.get('href')
+
+            # Skip if title or link is empty, or if link is not http/https, or if already processed
+            if not title or not href or not href.startswith('http') or href in processed_links:
+                logging.debug(f"IE Item {i+1}: Skipping invalid or duplicate article. Title: '{title}', Link: '{href}'")
+                continue
+
+            # Try to find a description. This might vary greatly by article block.
+            # A common pattern could be a sibling <p> tag or a <p> within a parent.
+            # For now, let's keep it simple and set description to title for consistency with original.
+            description = title 
+
+            # Image within the parent div of the link, or in a preceding
+            # sibling 'div.s-img' (e.g. <div class="s-img"><img src="..."></div>),
+            # resolved by index_article_links.
+            imageUrl, image_candidates = best_image_url(img_elem, base_url)
+
+            # Add to processed links to avoid duplicates
+            processed_links.add(href)
+
+            # Content and categories are not on the listing page
+            all_articles.append(ArticleRecord(
+                'ie', title, href, published_at,
+                description=description,
+                image_url=imageUrl, # Will be None if not found in static HTML
+                image_candidates=image_candidates,
+            ))
+            logging.info(f"IE Item {i+1}: Added article: '{title[:50]}...'")
+
+        except Exception as e:
+            logging.error(f"IE Item {i+1}: Error processing article: {e}. Skipping to next.")
+            continue # Continue to next article even if one fails
+
+    return all_articles
+
 def get_indian_express_articles():
     sys.stdout.reconfigure(encoding='utf-8') # Ensure stdout is UTF-8
 
-    base_url = "https://indianexpress.com"
-    url = f"{base_url}/" # The base URL for Indian Express
+    base_url = get_base_url('ie')
 
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36',
@@ -26,88 +164,11 @@ def get_indian_express_articles():
     }
 
     all_articles = []
-    processed_links = set() # To store links and avoid duplicates
 
     try:
-        logging.info(f"Fetching page content from {url} for Indian Express...")
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Use the combined CSS selectors from the original Selenium script
-        article_link_elements = soup.select(
-            "div.section-article h2 a, " # For main headlines
-            "div.articles div.articles li a, " # For list items (e.g., in latest news sections)
-            "div.other-article a" # For other article blocks
-        )
-        
-        logging.info(f"Found {len(article_link_elements)} potential article links.")
-
-        for i, link_elem in enumerate(article_link_elements):
-            if len(all_articles) >= 25: # Limit to top 25 articles
-                logging.info(f"Reached 25 articles for Indian Express. Stopping.")
-                break
-
-            title = None
-            href = None
-            description = None
-            imageUrl = None
-            
-            # Always use current scraping timestamp for consistency
-            published_at = datetime.now().isoformat()
-
-            try:
-                title = link_elem.get_text(strip=True)
-                href = link_elem.get('href')
-
-                # Skip if title or link is empty, or if link is not http/https, or if already processed
-                if not title or not href or not href.startswith('http') or href in processed_links:
-                    logging.debug(f"IE Item {i+1}: Skipping invalid or duplicate article. Title: '{title}', Link: '{href}'")
-                    continue
-                
-                # Try to find a description. This might vary greatly by article block.
-                # A common pattern could be a sibling <p> tag or a <p> within a parent.
-                # For now, let's keep it simple and set description to title for consistency with original.
-                description = title 
-
-                # Try to find an image associated with the article.
-                # This is highly dependent on the specific HTML structure around each link.
-                # A common pattern might be an image within a parent or sibling div.
-                # Example: <div class="s-img"><img src="..."></div>
-                # Let's try finding an img tag within the parent div of the link or an immediate sibling.
-                parent_div = link_elem.find_parent('div')
-                if parent_div:
-                    # Look for image within the parent or a sibling image container
-                    img_elem = parent_div.select_one("img[src]") # Find img with src attribute
-                    if img_elem and img_elem.get('src'):
-                        imageUrl = img_elem.get('src')
-                    else:
-                        # Try finding image in a sibling 'div.s-img' or similar
-                        sibling_img_div = parent_div.find_previous_sibling("div", class_="s-img")
-                        if sibling_img_div:
-                            img_elem = sibling_img_div.select_one("img[src]")
-                            if img_elem and img_elem.get('src'):
-                                imageUrl = img_elem.get('src')
-                
-                # Add to processed links to avoid duplicates
-                processed_links.add(href)
-
-                all_articles.append({
-                    "title": title,
-                    "link": href,
-                    "publishedAt": published_at,
-                    "description": description,
-                    "source": "indianexpress",
-                    "imageUrl": imageUrl, # Will be None if not found in static HTML
-                    "content": None, # Full content would require visiting each article link
-                    "categories": [], # Not easily available on listing page
-                })
-                logging.info(f"IE Item {i+1}: Added article: '{title[:50]}...'")
-
-            except Exception as e:
-                logging.error(f"IE Item {i+1}: Error processing article: {e}. Skipping to next.")
-                continue # Continue to next article even if one fails
+        all_articles = crawl_source(
+            'ie', lambda page: parse_indian_express_articles(page.text, base_url), headers)
+        resolve_article_images('ie', all_articles, headers)
 
     except requests.exceptions.HTTPError as e:
         logging.error(f"Indian Express Scraper: HTTP error occurred: {e} - Status Code: {e.response.status_code}")
@@ -124,10 +185,12 @@ def get_indian_express_articles():
     except Exception as e:
         logging.error(f"Indian Express Scraper: An unexpected error occurred: {e}")
         all_articles = []
-    finally:
-        # Print the entire list of articles as JSON to stdout.
-        json.dump(all_articles, sys.stdout, ensure_ascii=False, indent=2)
-        logging.info("Indian Express scraping process finished.")
+
+    logging.info("Indian Express scraping process finished.")
+    return all_articles
 
 if __name__ == "__main__":
-    get_indian_express_articles()
\ No newline at end of file
+    output_format = output_format_requested()
+    with profiled('ie', 'listing', enabled=profile_requested()):
+        # Print the entire list of articles to stdout for Node.js
+        write_articles(get_indian_express_articles(), output_format)
@@ -0,0 +1,51 @@
+# scrapers/link_index.py
+#
+# Helpers for indexing anchor-heavy listing pages in a single pass over the
+# parsed tree, instead of running find_parent()/find_previous_sibling() and
+# a nested select_one() for every candidate link.
+
+from bs4 import Tag
+
+
+def iter_tag_events(root):
+    """
+    Walks the tree under root in document order without recursion.
+    Yields (True, tag) when a tag is entered and (False, tag) when it is
+    left, so callers can keep their own stack of open containers.
+    """
+    stack = [(root, iter(root.children))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if isinstance(child, Tag):
+                yield True, child
+                stack.append((child, iter(child.children)))
+                break
+        else:
+            stack.pop()
+            if node is not root:
+                yield False, node
+
+
+class ContainerFrame:
+    """An open container element and the first matching image inside it."""
+
+    __slots__ = ('tag', 'image', 'extra')
+
+    def __init__(self, tag, extra=None):
+        self.tag = tag
+        self.image = None
+        self.extra = extra
+
+
+def claim_image(open_frames, img):
+    """
+    Records img as the first image of every open container that has none yet.
+    This matches container.select_one('img...') for each of those containers.
+    """
+    for frame in reversed(open_frames):
+        if frame.image is not None:
+            # Outer frames were opened earlier and saw every image this one
+            # did, so if this frame already has an image, so do they.
+            break
+        frame.image = img
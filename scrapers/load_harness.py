@@ -0,0 +1,159 @@
+# scrapers/load_harness.py
+#
+# Drives the listing scrapers against the local stand-in server
+# (standin_server.py) to see how the pipeline behaves with many sources,
+# slow responses and errors. Each scraper runs as its own Python process,
+# exactly as services/ingestionService.js spawns it.
+#
+# Example: 50 sources, 200 ms +/- 100 ms latency, 5% 429s, 4 in parallel
+#   python load_harness.py --sources 50 --concurrency 4 --latency-ms 200 \
+#       --jitter-ms 100 --throttle-rate 0.05
+#
+# Reports throughput, per-run latency percentiles and peak RSS per scraper
+# (the latter only where os.wait4 exists, i.e. not on Windows).
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from image_resolution import CACHE_PATH_ENV
+from source_urls import DEFAULT_BASE_URLS, base_url_env_var
+from standin_server import add_config_arguments, config_from_args, start_in_background
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+SCRAPERS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Keys match config/sources.js
+SCRAPER_SCRIPTS = {
+    'hindu': 'hindu_scraper.py',
+    'hindustan-times': 'hindustan_scraper.py',
+    'toi': 'times_of_india_scraper.py',
+    'ie': 'indian_express.py',
+    'dna': 'dna_scraper.py',
+}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_scraper(source, instance, server_url, extra_args=()):
+    """
+    Runs one scraper process against the stand-in server.
+    Returns a dict with wall time, article count, exit code and peak RSS
+    (KiB, or None where os.wait4 is unavailable).
+    """
+    env = dict(os.environ)
+    env[base_url_env_var(source)] = f"{server_url}/{source}-{instance}"
+    env['PYTHONIOENCODING'] = 'utf-8'
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SCRAPERS_DIR, SCRAPER_SCRIPTS[source]), *extra_args],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, cwd=SCRAPERS_DIR)
+
+    # Read stdout on a thread so a large payload cannot block the child.
+    chunks = []
+    reader = threading.Thread(target=lambda: chunks.append(process.stdout.read()))
+    reader.start()
+    max_rss_kb = None
+    if hasattr(os, 'wait4'):
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is bytes on macOS, KiB elsewhere
+        max_rss_kb = rusage.ru_maxrss // 1024 if sys.platform == 'darwin' else rusage.ru_maxrss
+    else:  # Windows
+        process.wait()
+    reader.join()
+    elapsed = time.perf_counter() - start
+
+    try:
+        articles = len(json.loads(chunks[0] or b'[]'))
+    except ValueError:
+        articles = 0
+
+    return {
+        'source': source,
+        'instance': instance,
+        'seconds': elapsed,
+        'articles': articles,
+        'exit_code': process.returncode,
+        'max_rss_kb': max_rss_kb,
+    }
+
+
+def run_load(server_url, sources, concurrency, cycles, only=None):
+    kinds = [only] if only else list(DEFAULT_BASE_URLS)
+    jobs = [(kinds[i % len(kinds)], i) for i in range(sources)] * cycles
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda job: run_scraper(job[0], job[1], server_url), jobs))
+    return results, time.perf_counter() - start
+
+
+def print_report(results, total_seconds, server_stats):
+    latencies = sorted(r['seconds'] for r in results)
+    total_articles = sum(r['articles'] for r in results)
+    failures = sum(1 for r in results if r['exit_code'] != 0 or r['articles'] == 0)
+
+    print(f"Scraper runs:        {len(results)} ({failures} failed or empty)")
+    print(f"Articles:            {total_articles}")
+    print(f"Wall time:           {total_seconds:.2f} s")
+    print(f"Throughput:          {total_articles / total_seconds:.1f} articles/s, "
+          f"{len(results) / total_seconds:.2f} runs/s")
+    print(f"Run latency p50/p95/p99/max: "
+          f"{percentile(latencies, 0.50):.2f} / {percentile(latencies, 0.95):.2f} / "
+          f"{percentile(latencies, 0.99):.2f} / {latencies[-1] if latencies else 0:.2f} s")
+    if any(r['max_rss_kb'] is None for r in results):
+        print("Peak RSS per scraper: not available on this platform (no os.wait4)")
+    else:
+        print("Peak RSS per scraper (MiB):")
+    for source in SCRAPER_SCRIPTS:
+        rss = [r['max_rss_kb'] for r in results if r['source'] == source and r['max_rss_kb'] is not None]
+        if rss:
+            print(f"  {source:<16} max {max(rss) / 1024:.1f}  mean {sum(rss) / len(rss) / 1024:.1f}")
+    print(f"Server:              {server_stats['requests']} requests, "
+          f"{server_stats['bytes'] / 1024 / 1024:.1f} MiB, status counts {server_stats['status']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the scrapers against the local stand-in server.')
+    parser.add_argument('--sources', type=int, default=5, help='Number of simulated sources')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Scraper processes run at once (ingestionService runs 1)')
+    parser.add_argument('--cycles', type=int, default=1, help='Scrape every source this many times')
+    parser.add_argument('--only', choices=list(SCRAPER_SCRIPTS), help='Simulate only this scraper type')
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    # Keep the stand-in's image URLs out of the real image cache
+    scratch_dir = tempfile.mkdtemp(prefix='gpress-load-')
+    os.environ.setdefault(CACHE_PATH_ENV, os.path.join(scratch_dir, 'image-cache.sqlite3'))
+
+    config = config_from_args(args)
+    server, server_url = start_in_background(config)
+    logging.info(f"Stand-in server at {server_url}; running {args.sources} sources x {args.cycles} cycles "
+                 f"with concurrency {args.concurrency}.")
+    try:
+        results, total_seconds = run_load(server_url, args.sources, args.concurrency, args.cycles, args.only)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print_report(results, total_seconds, config.stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# scrapers/main_content.py
+#
+# Generic article-body extraction by text and link density, in one pass over
+# the parsed tree. Every block element is scored by the paragraphs it holds
+# (readability-style: a paragraph credits its container fully, the next
+# ancestor by half and the one above that by a sixth), then discounted by
+# its link density. The best-scoring block, plus any sibling blocks scoring
+# close to it, is the article body. Per-source class names and ids are only
+# hints that raise a block's score; no selector has to match.
+
+import re
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+# Subtrees that never hold article text
+SKIP_TAGS = frozenset(
+    'script style noscript template svg iframe head nav header footer aside form button select textarea'.split())
+BLOCK_TAGS = frozenset(
+    'address article blockquote body dd details div dl dt fieldset figcaption figure h1 h2 h3 h4 h5 h6 hr li '
+    'main ol p pre section table tbody td tfoot th thead tr ul br'.split())
+HEADING_TAGS = frozenset('h1 h2 h3 h4 h5 h6'.split())
+# Blocks that are themselves paragraphs; their score goes to their container
+PARAGRAPH_TAGS = frozenset(('p', 'pre', 'blockquote'))
+
+POSITIVE_PATTERN = re.compile(r'article|body|content|story|main|text|entry|post|detail', re.IGNORECASE)
+NEGATIVE_PATTERN = re.compile(
+    r'comment|sidebar|related|footer|promo|share|social|advert|(?:^|\s|-)ads?(?:$|\s|-)|newsletter|subscribe|'
+    r'recommend|trending|also-?read|breadcrumb|menu|widget|popular|tags?(?:$|\s)', re.IGNORECASE)
+
+CLASS_WEIGHT = 25
+HINT_WEIGHT = 50
+MIN_SCORED_CHARS = 25 # Shorter runs (captions, bylines) do not vote for a container
+ANCESTOR_DIVISORS = (1, 2, 6)
+SIBLING_SCORE_RATIO = 0.2
+
+
+class BlockFrame:
+    """Running totals for an open block element."""
+
+    __slots__ = ('tag', 'weight', 'boilerplate', 'score', 'text_chars', 'link_chars', 'first_run')
+
+    def __init__(self, tag, weight, boilerplate, first_run):
+        self.tag = tag
+        self.weight = weight
+        self.boilerplate = boilerplate # Inside a block with a negative class weight (ad slot, share bar)
+        self.score = 0.0
+        self.text_chars = 0
+        self.link_chars = 0
+        self.first_run = first_run
+
+
+def class_weight(tag, hints):
+    """Scores a block's class names and id: source hints, then generic words."""
+    classes = tag.get('class') or ()
+    ident = tag.get('id') or ''
+    weight = 0
+    if hints and (ident in hints or any(name in hints for name in classes)):
+        weight += HINT_WEIGHT
+    if tag.get('itemprop') == 'articleBody':
+        weight += HINT_WEIGHT
+    label = ' '.join(classes) + ' ' + ident
+    if label != ' ':
+        if NEGATIVE_PATTERN.search(label):
+            weight -= CLASS_WEIGHT
+        if POSITIVE_PATTERN.search(label):
+            weight += CLASS_WEIGHT
+    return weight
+
+
+def extract_main_content(html, hints=(), min_length=50):
+    """
+    Returns the main text of an article page as paragraphs joined by blank
+    lines, or None if nothing of at least min_length characters was found.
+    html may be markup or an already-parsed BeautifulSoup tree; hints is a
+    collection of class names / ids that mark the body on known layouts.
+    """
+    soup = html if isinstance(html, Tag) else BeautifulSoup(html, 'html.parser')
+    root = soup.body or soup
+
+    runs = [] # (text, keep) of every text run, in document order
+    candidates = [] # (score, first_run, end_run, parent frame) per scored block
+    blocks = [BlockFrame(root, 0, False, 0)] # The root only collects totals; it is never a candidate
+    parts = [] # Strings of the text run being collected
+    run_link_chars = 0
+    link_depth = 0
+
+    def flush_run():
+        # Ends the current text run; it belongs to the innermost open block.
+        nonlocal run_link_chars
+        text = ' '.join(''.join(parts).split())
+        parts.clear()
+        link_chars = run_link_chars
+        run_link_chars = 0
+        owner = blocks[-1]
+        if not text or owner.tag.name in HEADING_TAGS:
+            return
+        linked = link_chars * 2 > len(text)
+        runs.append((text, not (linked or owner.boilerplate)))
+        if len(text) < MIN_SCORED_CHARS or linked:
+            return
+        score = 1 + text.count(',') + min(len(text) / 100, 3)
+        level = len(blocks) - 1
+        if owner.tag.name in PARAGRAPH_TAGS:
+            level -= 1
+        for divisor in ANCESTOR_DIVISORS:
+            if level < 0:
+                break
+            blocks[level].score += score / divisor
+            level -= 1
+
+    stack = [(root, iter(root.children), False)]
+    while stack:
+        node, children, is_block = stack[-1]
+        for child in children:
+            if isinstance(child, Tag):
+                name = child.name
+                if name in SKIP_TAGS:
+                    continue
+                if name in BLOCK_TAGS:
+                    if parts:
+                        flush_run()
+                    weight = class_weight(child, hints)
+                    blocks.append(BlockFrame(child, weight, blocks[-1].boilerplate or weight < 0, len(runs)))
+                    stack.append((child, iter(child.children), True))
+                else:
+                    if name == 'a':
+                        link_depth += 1
+                    stack.append((child, iter(child.children), False))
+                break
+            if isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+                parts.append(child)
+                chars = len(child.strip())
+                blocks[-1].text_chars += chars
+                if link_depth:
+                    blocks[-1].link_chars += chars
+                    run_link_chars += chars
+        else:
+            stack.pop()
+            if not is_block:
+                if node.name == 'a' and link_depth:
+                    link_depth -= 1
+                continue
+            if parts:
+                flush_run()
+            frame = blocks.pop()
+            parent = blocks[-1]
+            if frame.score > 0:
+                link_density = frame.link_chars / frame.text_chars if frame.text_chars else 0
+                score = (frame.score + frame.weight) * (1 - link_density)
+                candidates.append((score, frame.first_run, len(runs), parent))
+            parent.text_chars += frame.text_chars
+            parent.link_chars += frame.link_chars
+    if parts:
+        flush_run()
+
+    if not candidates:
+        return None
+    best = max(candidates, key=lambda candidate: candidate[0])
+    if best[0] <= 0:
+        return None
+
+    # Sibling blocks that score close to the best one (e.g. a body split by
+    # an ad slot) are part of the article too.
+    threshold = max(10, best[0] * SIBLING_SCORE_RATIO)
+    ranges = sorted(
+        (candidate[1], candidate[2]) for candidate in candidates
+        if candidate is best or (candidate[3] is best[3] and candidate[0] >= threshold))
+    paragraphs = []
+    last_end = 0
+    for first, end in ranges:
+        first = max(first, last_end)
+        paragraphs.extend(text for text, keep in runs[first:end] if keep)
+        last_end = max(last_end, end)
+
+    content = '\n\n'.join(paragraphs)
+    return content if len(content) >= min_length else None
@@ -0,0 +1,175 @@
+# scrapers/page_fetch.py
+#
+# Bounded, streaming page fetches for the requests-based scrapers.
+#
+# requests.get() followed by response.content / response.text reads the
+# whole body with no upper bound, and response.text may run a charset
+# detector over it. fetch_page() instead:
+#
+#   - streams the body in CHUNK_BYTES pieces and stops at the source's byte
+#     cap (MAX_RESPONSE_BYTES, or GPRESS_<SOURCE>_MAX_BYTES), counted after
+#     decompression so a compressed response cannot expand past it either;
+#     a capped page keeps its first max_bytes and is marked truncated;
+#   - asks for every compression urllib3 can decode (gzip/deflate, plus br
+#     and zstd when brotli / zstandard are installed);
+#   - decodes with the charset from the Content-Type header, else a BOM or
+#     a <meta charset> in the first SNIFF_BYTES, else UTF-8 with a
+#     Windows-1252 fallback; no statistical detection;
+#   - joins the chunks once and decodes once, on first use of .text;
+#   - logs the page size, bytes on the wire, time and an estimate of the
+#     body buffers the fetch held at once (the streamed chunks, and at the
+#     join both the chunks and the joined copy). It is an estimate, not a
+#     measurement: it leaves out decoding, parsing and the HTTP stack, and
+#     no per-fetch measurement is possible while the crawl frontier runs
+#     fetches side by side in one process. benchmarks/page_fetch_benchmark.py
+#     measures the real peak (tracemalloc, fetch plus decode) next to it.
+#
+# FetchedPage has the url / status_code / content / text / encoding
+# attributes of a requests.Response that the scrapers and html_archive use.
+
+import codecs
+import logging
+import os
+import re
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+CHUNK_BYTES = 64 * 1024
+SNIFF_BYTES = 2048
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# Decoded-body cap per source; listing pages are 0.3-3 MB today
+MAX_RESPONSE_BYTES = {
+    'hindu': 8 * 1024 * 1024,
+    'hindustan-times': 8 * 1024 * 1024,
+    'toi': 12 * 1024 * 1024,
+    'ie': 8 * 1024 * 1024,
+    'dna': 8 * 1024 * 1024,
+}
+
+CHARSET_PATTERN = re.compile(rb'charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+META_PATTERN = re.compile(rb'<meta\b[^>]*?charset[^>]*>', re.IGNORECASE)
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+
+def max_bytes_env_var(source):
+    return f"GPRESS_{source.upper().replace('-', '_')}_MAX_BYTES"
+
+
+def get_max_bytes(source):
+    """Returns the source's response size cap, honouring the environment override."""
+    override = os.environ.get(max_bytes_env_var(source))
+    return int(override) if override else MAX_RESPONSE_BYTES.get(source, DEFAULT_MAX_BYTES)
+
+
+def known_codec(name):
+    try:
+        return codecs.lookup(name.decode('ascii', 'ignore') if isinstance(name, bytes) else name).name
+    except LookupError:
+        return None
+
+
+def declared_charset(content_type):
+    """Charset from a Content-Type header value, if it names a known codec."""
+    match = CHARSET_PATTERN.search((content_type or '').encode('latin-1', 'ignore'))
+    return known_codec(match.group(1)) if match else None
+
+
+def sniff_charset(head):
+    """Charset from a BOM or <meta charset> / http-equiv tag at the start of a page."""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    meta = META_PATTERN.search(head)
+    if meta:
+        match = CHARSET_PATTERN.search(meta.group(0))
+        if match:
+            return known_codec(match.group(1))
+    return None
+
+
+class FetchedPage:
+    """A fetched page body, decoded on demand."""
+
+    __slots__ = ('url', 'status_code', 'headers', 'content', 'encoding', 'truncated', 'wire_bytes', 'seconds',
+                 'estimated_buffer_bytes', '_text')
+
+    def __init__(self, url, status_code, headers, content, encoding, truncated, wire_bytes, seconds,
+                 estimated_buffer_bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.truncated = truncated
+        self.wire_bytes = wire_bytes
+        self.seconds = seconds
+        self.estimated_buffer_bytes = estimated_buffer_bytes
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            if self.encoding:
+                self._text = self.content.decode(self.encoding, errors='replace')
+            else:
+                try:
+                    self._text = self.content.decode('utf-8')
+                    self.encoding = 'utf-8'
+                except UnicodeDecodeError:
+                    self._text = self.content.decode('cp1252', errors='replace')
+                    self.encoding = 'cp1252'
+        return self._text
+
+
+def make_session(headers, pool_size):
+    """A requests.Session with the given headers and a connection pool of pool_size per host."""
+    session = requests.Session()
+    session.headers.update(headers)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch_page(session, url, source, timeout, max_bytes=None):
+    """
+    Fetches url with at most max_bytes (default: the source's cap) of
+    decoded body. Raises requests exceptions like session.get(), including
+    HTTPError for 4xx/5xx responses.
+    """
+    max_bytes = max_bytes or get_max_bytes(source)
+    start = time.perf_counter()
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        chunks = []
+        size = 0
+        truncated = False
+        for chunk in response.raw.stream(CHUNK_BYTES, decode_content=True):
+            if size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                size = max_bytes
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        wire_bytes = response.raw.tell()
+        # Joining copies the chunks, so both are held until they are dropped
+        # (a single chunk is returned as is)
+        estimated_buffer_bytes = size if len(chunks) <= 1 else 2 * size
+        content = b''.join(chunks)
+        del chunks
+        encoding = declared_charset(response.headers.get('Content-Type')) or sniff_charset(content[:SNIFF_BYTES])
+        page = FetchedPage(response.url, response.status_code, response.headers, content, encoding, truncated,
+                           wire_bytes, time.perf_counter() - start, estimated_buffer_bytes)
+
+    logging.info(f"{source} {url}: {size} bytes ({wire_bytes} on the wire, "
+                 f"{response.headers.get('Content-Encoding', 'identity')}, {encoding or 'undeclared charset'}) "
+                 f"in {page.seconds:.2f}s; body buffers about {page.estimated_buffer_bytes / 2**20:.1f} MiB (estimated)")
+    if truncated:
+        logging.warning(f"{source} {url}: body cut at the {max_bytes}-byte cap.")
+    return page
@@ -0,0 +1,239 @@
+# scrapers/profiling.py
+#
+# Opt-in cProfile capture for the scraper entry points. Run any listing
+# scraper, content_scraper.py or extraction_worker.py with --profile (or set
+# GPRESS_PROFILE=1, which child processes spawned by Node inherit):
+#
+#   python hindu_scraper.py --profile
+#   python content_scraper.py <url> <source_name> --profile
+#
+# Each profiled unit of work (a listing crawl per source, an article per
+# URL) writes two files under <profile dir>/<run>/<source>/:
+#   <time>-<label>.prof   raw pstats data (snakeviz, pstats, gprof2dot...)
+#   <time>-<label>.txt    hot-spot summary: own time per library
+#                         (BeautifulSoup, re, Selenium, HTTP...), then the
+#                         top functions by own and by cumulative time
+#
+# The profile dir is GPRESS_PROFILE_DIR (default data/profiles). <run> is
+# GPRESS_PROFILE_RUN, so setting it to one value for a whole multi-source
+# run groups that run's profiles; it defaults to the current UTC date.
+#
+# Aggregate mode merges every profile under one or more directories:
+#   python profiling.py aggregate data/profiles/<run> [--source toi] [--top 30]
+# writes aggregate.prof and aggregate.txt into the first directory (or
+# --out) and prints the summary.
+#
+# Only the thread that enters profiled() is measured; time spent waiting on
+# worker threads (e.g. crawl_frontier fetches) shows up as that wait.
+
+import argparse
+import contextlib
+import cProfile
+import datetime
+import hashlib
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import time
+
+PROFILE_FLAG = '--profile'
+PROFILE_ENV = 'GPRESS_PROFILE'
+PROFILE_DIR_ENV = 'GPRESS_PROFILE_DIR'
+PROFILE_RUN_ENV = 'GPRESS_PROFILE_RUN'
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'profiles')
+AGGREGATE_NAME = 'aggregate'
+DEFAULT_TOP = 25
+
+# Library a function's own time is attributed to, by the first matching
+# fragment of its file path (with '/' separators)
+LIBRARY_PATTERNS = (
+    ('/bs4/', 'BeautifulSoup'),
+    ('/html/parser.py', 'html.parser'),
+    ('/_markupbase.py', 'html.parser'),
+    ('/lxml/', 'lxml'),
+    ('/re/', 're'),
+    ('/sre_', 're'),
+    ('/selenium/', 'Selenium'),
+    ('/webdriver_manager/', 'Selenium'),
+    ('/requests/', 'HTTP'),
+    ('/urllib3/', 'HTTP'),
+    ('/http/client.py', 'HTTP'),
+    ('/socket.py', 'HTTP'),
+    ('/ssl.py', 'HTTP'),
+    ('/json/', 'json'),
+    ('/logging/', 'logging'),
+    ('/concurrent/', 'threads'),
+    ('/threading.py', 'threads'),
+    ('/scrapers/', 'scrapers'),
+)
+# Built-in functions (no file) recognised by name. The rest, including
+# time.sleep and lock waits, are charged to the library of whoever called
+# them, so e.g. WebDriverWait polling counts as Selenium time
+BUILTIN_PATTERNS = (
+    ('_sre', 're'),
+    ('re.Pattern', 're'),
+    ('_socket', 'HTTP'),
+    ('_ssl', 'HTTP'),
+)
+
+
+def profile_env_enabled():
+    return os.environ.get(PROFILE_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+def profile_requested(argv=None):
+    """
+    True if --profile is in argv (default sys.argv) or GPRESS_PROFILE is set.
+    Removes the flag from argv so positional arguments keep their places.
+    """
+    argv = sys.argv if argv is None else argv
+    requested = PROFILE_FLAG in argv[1:]
+    while PROFILE_FLAG in argv[1:]:
+        argv.remove(PROFILE_FLAG)
+    return requested or profile_env_enabled()
+
+
+def get_profile_dir():
+    run = os.environ.get(PROFILE_RUN_ENV) or datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%d')
+    return os.path.join(os.environ.get(PROFILE_DIR_ENV) or DEFAULT_PROFILE_DIR, run)
+
+
+def label_slug(label):
+    """File-name-safe form of a label such as a URL, with a hash so long URLs stay distinct."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', re.sub(r'^https?://', '', label)).strip('-')[:80]
+    digest = hashlib.blake2b(label.encode('utf-8'), digest_size=4).hexdigest()
+    return f"{slug}-{digest}" if slug != label else slug
+
+
+def library_of(function_key):
+    filename, _, name = function_key
+    if filename == '~':
+        for fragment, library in BUILTIN_PATTERNS:
+            if fragment in name:
+                return library
+        return None
+    path = filename.replace('\\', '/')
+    for fragment, library in LIBRARY_PATTERNS:
+        if fragment in path:
+            return library
+    return 'other'
+
+
+def time_by_library(stats):
+    """Own time per library; built-ins not matched by name go to their callers' libraries."""
+    totals = {}
+    for function_key, (_, _, own_time, _, callers) in stats.stats.items():
+        library = library_of(function_key)
+        if library is not None:
+            totals[library] = totals.get(library, 0.0) + own_time
+            continue
+        for caller_key, caller_edge in callers.items():
+            caller_library = library_of(caller_key) or 'builtins'
+            totals[caller_library] = totals.get(caller_library, 0.0) + caller_edge[2]
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def summarize(stats, title, top=DEFAULT_TOP, wall_seconds=None):
+    """Text report of a pstats.Stats: time per library, then the top functions."""
+    out = io.StringIO()
+    out.write(f"{title}\n")
+    if wall_seconds is not None:
+        out.write(f"Wall time: {wall_seconds:.3f}s\n")
+    out.write(f"Profiled CPU-side time: {stats.total_tt:.3f}s in {stats.total_calls} calls\n\n")
+    out.write("Own time by library:\n")
+    for library, seconds in time_by_library(stats):
+        share = seconds / stats.total_tt * 100 if stats.total_tt else 0
+        out.write(f"  {library:<14} {seconds:9.3f}s  {share:5.1f}%\n")
+    stats.stream = out
+    stats.files = []  # print_stats would otherwise list every merged file first
+    for sort_key, heading in (('tottime', 'own'), ('cumulative', 'cumulative')):
+        out.write(f"\nTop {top} functions by {heading} time:\n")
+        stats.sort_stats(sort_key).print_stats(top)
+    return out.getvalue()
+
+
+def write_profile(profiler, source, label, wall_seconds):
+    """Writes <label>.prof and <label>.txt for a finished profile. Returns the .prof path."""
+    directory = os.path.join(get_profile_dir(), source)
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%H%M%S%f')
+    base = os.path.join(directory, f"{stamp}-{label_slug(label)}")
+    profiler.dump_stats(base + '.prof')
+    stats = pstats.Stats(profiler)
+    with open(base + '.txt', 'w', encoding='utf-8') as summary_file:
+        summary_file.write(summarize(stats, f"{source}: {label}", wall_seconds=wall_seconds))
+    return base + '.prof'
+
+
+@contextlib.contextmanager
+def profiled(source, label, enabled=True):
+    """Profiles the enclosed block (if enabled) and writes its profile and summary."""
+    if not enabled:
+        yield
+        return
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        try:
+            path = write_profile(profiler, source, label, time.perf_counter() - start)
+            logging.info(f"Profile for {source} {label} written to {path}")
+        except OSError as e:
+            logging.warning(f"Could not write profile for {source} {label}: {e}")
+
+
+def find_profiles(directories, source=None):
+    """All .prof files under the directories, except earlier aggregates."""
+    paths = []
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            if source and source not in os.path.relpath(root, directory).replace('\\', '/').split('/'):
+                continue
+            paths.extend(os.path.join(root, name) for name in files
+                         if name.endswith('.prof') and name != AGGREGATE_NAME + '.prof')
+    return sorted(paths)
+
+
+def aggregate(directories, source=None, top=DEFAULT_TOP, out=None):
+    """Merges the profiles under the directories. Returns (summary text, profile count)."""
+    paths = find_profiles(directories, source)
+    if not paths:
+        return None, 0
+    stats = pstats.Stats(paths[0])
+    for path in paths[1:]:
+        stats.add(path)
+    base = out or os.path.join(directories[0], AGGREGATE_NAME)
+    stats.dump_stats(base + '.prof')
+    title = f"Aggregate of {len(paths)} profiles under {', '.join(directories)}" + (f" ({source})" if source else '')
+    summary = summarize(stats, title, top)
+    with open(base + '.txt', 'w', encoding='utf-8') as summary_file:
+        summary_file.write(summary)
+    return summary, len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scraper profile tools.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    aggregate_parser = commands.add_parser('aggregate', help='Merge the profiles under one or more directories')
+    aggregate_parser.add_argument('directories', nargs='*', help='Defaults to the current run directory')
+    aggregate_parser.add_argument('--source', help='Only merge profiles of this source')
+    aggregate_parser.add_argument('--top', type=int, default=DEFAULT_TOP)
+    aggregate_parser.add_argument('--out', help='Output path without extension (default <first dir>/aggregate)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+    summary, count = aggregate(args.directories or [get_profile_dir()], args.source, args.top, args.out)
+    if not count:
+        logging.error("No profiles found.")
+        sys.exit(1)
+    sys.stdout.write(summary)
+
+
+if __name__ == '__main__':
+    main()
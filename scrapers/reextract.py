@@ -0,0 +1,108 @@
+# scrapers/reextract.py
+#
+# Re-runs the current extractors over pages stored by html_archive.py,
+# without any network access. Useful after a selector change.
+#
+# This works because extraction never fetches: each listing scraper's
+# parse_*_articles() takes page HTML, and article_extraction.py takes the
+# HTML of an article page, so live and archived pages go through the same
+# code.
+#
+# Usage:
+#   python reextract.py --archive-dir ARCHIVE [--source toi] [--kind listing|article]
+#                       [--since 2024-07-01] [--latest] [--output results.json]
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+from article_extraction import extract_article_content
+from html_archive import get_archive_dir, iter_records, read_index
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+
+def get_listing_parsers():
+    """Maps source keys (as in config/sources.js) to listing-page parsers."""
+    from hindu_scraper import parse_hindu_articles
+    from hindustan_scraper import parse_hindustan_times_articles
+    from times_of_india_scraper import parse_times_of_india_articles
+    from indian_express import parse_indian_express_articles
+    from dna_scraper import parse_dna_articles
+
+    return {
+        'hindu': parse_hindu_articles,
+        'hindustan-times': parse_hindustan_times_articles,
+        'toi': parse_times_of_india_articles,
+        'ie': parse_indian_express_articles,
+        'dna': parse_dna_articles,
+    }
+
+
+def decode_body(body, encoding):
+    if not encoding:
+        return body # Let BeautifulSoup detect the encoding, as for response.content
+    return body.decode(encoding, errors='replace')
+
+
+def reextract(archive_dir, source=None, kind=None, since=None, latest_only=False):
+    """Yields one result dict per archived page."""
+    entries = read_index(archive_dir, source=source, kind=kind, since=since, latest_only=latest_only)
+    logging.info(f"Re-extracting {len(entries)} archived pages from {archive_dir}.")
+
+    listing_parsers = None
+
+    for entry, body in iter_records(archive_dir, entries):
+        html = decode_body(body, entry.get('encoding'))
+        result = {
+            'url': entry['url'],
+            'source': entry['source'],
+            'kind': entry['kind'],
+            'fetched_at': entry['fetched_at'],
+        }
+        if entry['kind'] == 'listing':
+            if listing_parsers is None:
+                listing_parsers = get_listing_parsers()
+            parser = listing_parsers.get(entry['source'])
+            if not parser:
+                logging.warning(f"No listing parser for source '{entry['source']}'. Skipping {entry['url']}.")
+                continue
+            result['articles'] = [article.to_dict() for article in parser(html)]
+        else:
+            result['content'] = extract_article_content(html, entry['url'], entry['source'])
+        yield result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-run extractors over the raw HTML archive.')
+    parser.add_argument('--archive-dir', default=get_archive_dir(),
+                        help='Archive directory (defaults to $GPRESS_HTML_ARCHIVE_DIR)')
+    parser.add_argument('--source', help="Only this source key, e.g. 'toi'")
+    parser.add_argument('--kind', choices=['listing', 'article'], help='Only listing or article pages')
+    parser.add_argument('--since', help='Only pages fetched at or after this ISO timestamp')
+    parser.add_argument('--latest', action='store_true', help='Only the newest capture of each URL')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    if not args.archive_dir:
+        parser.error('--archive-dir is required when GPRESS_HTML_ARCHIVE_DIR is not set')
+
+    start = time.perf_counter()
+    results = list(reextract(args.archive_dir, source=args.source, kind=args.kind,
+                             since=args.since, latest_only=args.latest))
+    elapsed = time.perf_counter() - start
+    logging.info(f"Re-extracted {len(results)} pages in {elapsed:.2f} seconds.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, ensure_ascii=False, indent=2)
+    else:
+        sys.stdout.reconfigure(encoding='utf-8')
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
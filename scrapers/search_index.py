@@ -0,0 +1,796 @@
+# scrapers/search_index.py
+#
+# Incremental inverted index over the articles the scrapers produce, so that
+# GET /api/news/search does not need a regex scan of every collection.
+#
+# Tokenization and per-document term weights are computed once, when an
+# article is indexed. The index is a list of immutable segments:
+#
+#   <index_dir>/manifest.json          segments in order + next doc id
+#   <index_dir>/seg-<n>.lex.json       doc count, superseded doc ids and
+#                                      term -> [offset, count] into .post
+#   <index_dir>/seg-<n>.post           per term: count x uint32 doc ids,
+#                                      then count x float32 weights
+#   <index_dir>/seg-<n>.docs           one JSON metadata line per doc
+#   <index_dir>/seg-<n>.docs.idx       count x uint32 sorted doc ids, then
+#                                      (count + 1) x uint64 line offsets
+#   <index_dir>/seg-<n>.links.json     link -> doc id for the segment's docs
+#
+# Postings and metadata are read through mmap, so a query only touches the
+# pages of the terms it asks for and the metadata of the page it returns.
+# Re-indexing a link (e.g. once its content has been extracted) adds a newer
+# doc id and records the old one as superseded; superseded ids are ignored
+# at query time and dropped when segments are merged. A re-index without
+# content (a listing scrape after extraction) keeps the content terms of
+# the doc it replaces, recovered from that doc's postings.
+#
+# Adding articles reads only the per-segment link maps (cached in-process,
+# so repeated adds read just the segments written since) and the metadata of
+# the links being re-indexed. Segments are merged by size tier: once
+# MERGE_FACTOR segments hold a similar number of docs they are merged into
+# one, so each doc is rewritten about log(docs) times in its life instead
+# of on every merge. Query terms of MIN_PREFIX_LENGTH or more characters
+# also match indexed terms they are a prefix of, at PREFIX_WEIGHT.
+#
+# CLI:
+#   python search_index.py add [--source toi] < articles.json
+#   python search_index.py search [--limit 50] [--offset 0] -- "monsoon session"
+#   python search_index.py serve          (JSON-lines queries on stdin, see serve())
+#   python search_index.py prune --days 20
+#   python search_index.py stats
+
+import argparse
+import bisect
+import contextlib
+import datetime
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import sys
+from array import array
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+INDEX_DIR_ENV = 'GPRESS_SEARCH_INDEX_DIR'
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'search-index')
+
+MERGE_FACTOR = 8 # Merge this many segments of the same size tier into one
+SEGMENT_SUFFIXES = ('post', 'docs', 'docs.idx', 'lex.json', 'links.json')
+SEGMENT_FILE_PATTERN = re.compile(r'^(seg-\d+)\.')
+
+MIN_PREFIX_LENGTH = 3
+MAX_PREFIX_TERMS = 64 # Indexed terms one query term may expand to, per segment
+PREFIX_WEIGHT = 0.5 # Relative weight of a prefix match to an exact match
+
+# Per-segment link maps, keyed by (index_dir, segment name); segments are
+# immutable, so entries never go stale
+_segment_links = {}
+# index_dir -> (segment names, link -> newest doc id) as of the last add
+_live_links = {}
+
+TOKEN_PATTERN = re.compile(r'[^\W_]+', re.UNICODE)
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the to was were will with'.split())
+
+# Field boosts and the fixed average field lengths used for BM25-style
+# length normalization. Fixed averages keep weights independent of the rest
+# of the corpus, so they never need recomputing after ingest.
+FIELDS = (('title', 3.0, 12.0), ('description', 1.5, 25.0), ('content', 1.0, 600.0))
+K1 = 1.2
+B = 0.75
+
+
+def get_index_dir():
+    return os.environ.get(INDEX_DIR_ENV) or DEFAULT_INDEX_DIR
+
+
+def tokenize(text):
+    """Lowercases and splits text into index terms, dropping stopwords."""
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def term_weights(article):
+    """Computes the ingest-time weight of every term in an article."""
+    weights = {}
+    for field, boost, average_length in FIELDS:
+        tokens = tokenize(article.get(field))
+        if not tokens:
+            continue
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        norm = K1 * (1 - B + B * len(tokens) / average_length)
+        for token, tf in counts.items():
+            weights[token] = weights.get(token, 0.0) + boost * tf * (K1 + 1) / (tf + norm)
+    return weights
+
+
+def content_share(meta, indexed):
+    """
+    Returns the part of a doc's indexed term weights that came from its
+    content: the indexed weights minus those of its stored title and
+    description.
+    """
+    listing = term_weights({'title': meta['title'], 'description': meta.get('description')})
+    weights = {term: weight - listing.get(term, 0.0) for term, weight in indexed.items()}
+    return {term: weight for term, weight in weights.items() if weight > 1e-4} # Ignore float32 rounding
+
+
+def _map_file(path):
+    """Opens a file read-only through mmap; returns (file, mmap, memoryview)."""
+    mapped_file = open(path, 'rb')
+    if not os.fstat(mapped_file.fileno()).st_size:
+        return mapped_file, None, memoryview(b'')
+    mapped = mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return mapped_file, mapped, memoryview(mapped)
+
+
+def segment_doc_count(index_dir, name):
+    """Number of docs in a segment, from the size of its .docs.idx file."""
+    return (os.path.getsize(os.path.join(index_dir, f'{name}.docs.idx')) - 8) // 12
+
+
+class Segment:
+    """A read-only, memory-mapped segment. The lexicon is loaded on first use."""
+
+    def __init__(self, index_dir, name):
+        self.index_dir = index_dir
+        self.name = name
+        self._header = None
+        self._sorted_terms = None
+        self._maps = [_map_file(os.path.join(index_dir, f'{name}.{suffix}'))
+                      for suffix in ('post', 'docs.idx', 'docs')]
+        self._view = self._maps[0][2]
+        idx_view = self._maps[1][2]
+        self.doc_count = (len(idx_view) - 8) // 12
+        self.doc_ids = idx_view[:4 * self.doc_count].cast('I')
+        self._doc_offsets = idx_view[4 * self.doc_count:].cast('Q')
+        self._docs_view = self._maps[2][2]
+
+    def _load_header(self):
+        if self._header is None:
+            with open(os.path.join(self.index_dir, f'{self.name}.lex.json'), encoding='utf-8') as lex_file:
+                self._header = json.load(lex_file)
+        return self._header
+
+    @property
+    def lexicon(self):
+        return self._load_header()['terms']
+
+    @property
+    def superseded(self):
+        return self._load_header()['superseded']
+
+    def postings(self, term):
+        """Returns (doc_ids, weights) memoryviews for a term, or None."""
+        entry = self.lexicon.get(term)
+        if not entry:
+            return None
+        offset, count = entry
+        doc_ids = self._view[offset:offset + 4 * count].cast('I')
+        weights = self._view[offset + 4 * count:offset + 8 * count].cast('f')
+        return doc_ids, weights
+
+    def expansions(self, term):
+        """Yields (indexed term, weight factor) for the exact term and, if long enough, terms it prefixes."""
+        if term in self.lexicon:
+            yield term, 1.0
+        if len(term) < MIN_PREFIX_LENGTH:
+            return
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.lexicon)
+        position = bisect.bisect_right(self._sorted_terms, term)
+        for candidate in self._sorted_terms[position:position + MAX_PREFIX_TERMS]:
+            if not candidate.startswith(term):
+                break
+            yield candidate, PREFIX_WEIGHT
+
+    def document_terms(self, doc_ids):
+        """Returns {doc_id: {term: weight}} for the given doc ids, scanning every posting list once."""
+        found = {doc_id: {} for doc_id in doc_ids}
+        wanted = sorted(found)
+        for term, (offset, count) in self.lexicon.items():
+            term_ids = self._view[offset:offset + 4 * count].cast('I')
+            weights = self._view[offset + 4 * count:offset + 8 * count].cast('f')
+            for doc_id in wanted:
+                position = bisect.bisect_left(term_ids, doc_id)
+                if position < count and term_ids[position] == doc_id:
+                    found[doc_id][term] = weights[position]
+            term_ids.release()
+            weights.release()
+        return found
+
+    def has_document(self, doc_id):
+        position = bisect.bisect_left(self.doc_ids, doc_id)
+        return position < self.doc_count and self.doc_ids[position] == doc_id
+
+    def document(self, doc_id):
+        """Returns the metadata of a doc id in this segment, or None."""
+        if not self.has_document(doc_id):
+            return None
+        position = bisect.bisect_left(self.doc_ids, doc_id)
+        start, end = self._doc_offsets[position], self._doc_offsets[position + 1]
+        return json.loads(bytes(self._docs_view[start:end]))
+
+    def iter_documents(self):
+        """Yields (doc_id, metadata) for every doc in the segment."""
+        lines = bytes(self._docs_view).splitlines()
+        for doc_id, line in zip(self.doc_ids, lines):
+            yield doc_id, json.loads(line)
+
+    def close(self):
+        self.doc_ids.release()
+        self._doc_offsets.release()
+        for mapped_file, mapped, view in self._maps:
+            view.release()
+            if mapped is not None:
+                mapped.close()
+            mapped_file.close()
+
+
+def write_segment(index_dir, name, postings, docs, superseded=()):
+    """
+    Writes a segment. postings maps term -> list of (doc_id, weight) sorted by
+    doc id; docs maps doc_id -> metadata; superseded lists older doc ids that
+    this segment replaces.
+    """
+    lexicon = {}
+    offset = 0
+    with open(os.path.join(index_dir, f'{name}.post.tmp'), 'wb') as post_file:
+        for term in sorted(postings):
+            entries = postings[term]
+            doc_ids = array('I', (doc_id for doc_id, _ in entries))
+            weights = array('f', (weight for _, weight in entries))
+            doc_ids.tofile(post_file)
+            weights.tofile(post_file)
+            lexicon[term] = [offset, len(entries)]
+            offset += 8 * len(entries)
+
+    doc_ids = array('I', sorted(docs))
+    offsets = array('Q', [0])
+    with open(os.path.join(index_dir, f'{name}.docs.tmp'), 'wb') as docs_file:
+        for doc_id in doc_ids:
+            line = json.dumps(docs[doc_id], ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+            docs_file.write(line)
+            offsets.append(offsets[-1] + len(line))
+    with open(os.path.join(index_dir, f'{name}.docs.idx.tmp'), 'wb') as idx_file:
+        doc_ids.tofile(idx_file)
+        offsets.tofile(idx_file)
+
+    with open(os.path.join(index_dir, f'{name}.lex.json.tmp'), 'w', encoding='utf-8') as lex_file:
+        json.dump({'docs': len(doc_ids), 'superseded': sorted(superseded), 'terms': lexicon},
+                  lex_file, ensure_ascii=False, separators=(',', ':'))
+    links = {meta['link']: doc_id for doc_id, meta in docs.items()}
+    with open(os.path.join(index_dir, f'{name}.links.json.tmp'), 'w', encoding='utf-8') as links_file:
+        json.dump(links, links_file, ensure_ascii=False, separators=(',', ':'))
+    for suffix in SEGMENT_SUFFIXES:
+        path = os.path.join(index_dir, f'{name}.{suffix}')
+        os.replace(path + '.tmp', path)
+    _segment_links[(index_dir, name)] = links
+
+
+def read_segment_links(index_dir, name):
+    """Returns a segment's link -> doc id map, building .links.json for segments written without one."""
+    key = (index_dir, name)
+    if key not in _segment_links:
+        path = os.path.join(index_dir, f'{name}.links.json')
+        try:
+            with open(path, encoding='utf-8') as links_file:
+                _segment_links[key] = json.load(links_file)
+        except FileNotFoundError:
+            segment = Segment(index_dir, name)
+            try:
+                links = {meta['link']: doc_id for doc_id, meta in segment.iter_documents()}
+            finally:
+                segment.close()
+            with open(path + '.tmp', 'w', encoding='utf-8') as links_file:
+                json.dump(links, links_file, ensure_ascii=False, separators=(',', ':'))
+            os.replace(path + '.tmp', path)
+            _segment_links[key] = links
+    return _segment_links[key]
+
+
+def _lock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return
+    lock_file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError: # LK_LOCK gives up after about ten seconds; keep waiting
+            continue
+
+
+def _unlock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def size_tier(doc_count):
+    """Segments in the same tier hold within a factor of MERGE_FACTOR as many docs."""
+    return int(math.log(max(doc_count, 1), MERGE_FACTOR))
+
+
+class SearchIndex:
+    """Segmented inverted index over scraped articles."""
+
+    def __init__(self, index_dir=None):
+        self.index_dir = index_dir or get_index_dir()
+        self.manifest_path = os.path.join(self.index_dir, 'manifest.json')
+        self.segments = []
+        self.superseded = set() # Doc ids replaced by a newer doc for the same link
+        self.document_count = 0
+        self.manifest = None
+
+    # --- Reading -----------------------------------------------------------
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return {'segments': [], 'next_doc_id': 0, 'next_segment': 0}
+
+    def manifest_stamp(self):
+        """Changes whenever the manifest is rewritten; None if there is no index yet."""
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def open(self):
+        """(Re)loads the current set of segments."""
+        self.close()
+        for attempt in range(2):
+            self.manifest = self._read_manifest()
+            try:
+                for name in self.manifest['segments']:
+                    segment = Segment(self.index_dir, name)
+                    self.segments.append(segment)
+                    segment.lexicon
+                break
+            except FileNotFoundError:
+                # A merge replaced the segments between reading the
+                # manifest and opening them; read the new manifest.
+                self.close()
+                if attempt:
+                    raise
+        self.superseded = set()
+        for segment in self.segments:
+            self.superseded.update(segment.superseded)
+        # A merge may already have dropped a superseded doc the list still names
+        self.superseded = {doc_id for doc_id in self.superseded if self.has_document(doc_id)}
+        self.document_count = sum(segment.doc_count for segment in self.segments) - len(self.superseded)
+        return self
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_document(self, doc_id):
+        return any(segment.has_document(doc_id) for segment in self.segments)
+
+    def document(self, doc_id):
+        for segment in self.segments:
+            meta = segment.document(doc_id)
+            if meta is not None:
+                return meta
+        return None
+
+    def search(self, query, limit=50, offset=0, source=None):
+        """
+        Returns {'total': n, 'results': [...]} for documents matching every
+        query term (exactly or, for longer terms, as a prefix), ordered by
+        summed term weight x idf.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return {'total': 0, 'results': []}
+
+        superseded = self.superseded
+        live_count = self.document_count or 1
+        scores = None
+
+        # Intersect the rarest terms first so the candidate set stays small
+        term_postings = []
+        for term in terms:
+            lists = []
+            for segment in self.segments:
+                for indexed_term, factor in segment.expansions(term):
+                    doc_ids, weights = segment.postings(indexed_term)
+                    lists.append((doc_ids, weights, factor))
+            if not lists:
+                return {'total': 0, 'results': []}
+            term_postings.append((sum(len(ids) for ids, _, _ in lists), lists))
+        term_postings.sort(key=lambda item: item[0])
+
+        for df, lists in term_postings:
+            idf = math.log(1 + (max(live_count - df, 0) + 0.5) / (df + 0.5)) # df counts prefix matches too
+            term_scores = {}
+            for doc_ids, weights, factor in lists:
+                scale = idf * factor
+                if scores is not None and len(scores) * 16 < len(doc_ids):
+                    # Few candidates left: probe the sorted doc ids instead
+                    # of walking the whole posting list.
+                    for doc_id in scores:
+                        position = bisect.bisect_left(doc_ids, doc_id)
+                        if position < len(doc_ids) and doc_ids[position] == doc_id:
+                            term_scores[doc_id] = max(term_scores.get(doc_id, 0.0), weights[position] * scale)
+                    continue
+                for doc_id, weight in zip(doc_ids, weights):
+                    if scores is None or doc_id in scores:
+                        term_scores[doc_id] = max(term_scores.get(doc_id, 0.0), weight * scale)
+            if scores is None:
+                scores = {doc_id: s for doc_id, s in term_scores.items() if doc_id not in superseded}
+            else:
+                scores = {doc_id: scores[doc_id] + s for doc_id, s in term_scores.items()}
+            if not scores:
+                return {'total': 0, 'results': []}
+
+        if source:
+            scores = {doc_id: s for doc_id, s in scores.items() if self.document(doc_id)['source'] == source}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        results = []
+        for doc_id, score in ranked[offset:offset + limit]:
+            meta = dict(self.document(doc_id))
+            meta['score'] = round(score, 4)
+            results.append(meta)
+        return {'total': len(ranked), 'results': results}
+
+    # --- Writing -----------------------------------------------------------
+
+    @contextlib.contextmanager
+    def _write_lock(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(os.path.join(self.index_dir, 'index.lock'), 'w') as lock_file:
+            _lock(lock_file)
+            try:
+                yield
+            finally:
+                _unlock(lock_file)
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _load_live_links(self, manifest):
+        """
+        Returns link -> doc id of the newest doc for every indexed link. Reuses
+        the map from this process's previous add when the manifest has only
+        gained segments since.
+        """
+        names = manifest['segments']
+        cached_names, live = _live_links.get(self.index_dir, ((), None))
+        if live is None or tuple(names[:len(cached_names)]) != cached_names:
+            cached_names, live = (), {}
+        for name in names[len(cached_names):]:
+            for link, doc_id in read_segment_links(self.index_dir, name).items():
+                if doc_id > live.get(link, -1):
+                    live[link] = doc_id
+        _live_links[self.index_dir] = (tuple(names), live)
+        return live
+
+    def add_articles(self, source, articles):
+        """
+        Indexes a batch of scraped articles as one new segment. Articles whose
+        title and description are already indexed unchanged are skipped; an
+        article without a title (e.g. content-only) inherits the indexed
+        title and description of its link, and one without content keeps the
+        content terms of the doc it replaces. Returns the number indexed.
+        """
+        postings = {}
+        docs = {}
+        superseded = []
+        carried = {} # New doc id -> content terms kept from the doc it replaces
+        carried_from = {} # New doc id -> replaced doc id in an existing segment
+        with self._write_lock():
+            manifest = self._read_manifest()
+            live = self._load_live_links(manifest)
+            segments = [Segment(self.index_dir, name) for name in manifest['segments']]
+            try:
+                doc_id = manifest['next_doc_id']
+                for article in articles:
+                    link = article.get('link')
+                    if not link:
+                        continue
+                    link = link.split('?')[0].split('#')[0] # Same normalization as ingestionService
+                    old_id = live.get(link)
+                    old = None
+                    if old_id is not None:
+                        old = docs.get(old_id) or next(
+                            (meta for meta in (s.document(old_id) for s in segments) if meta), None)
+                    if old and not article.get('title'):
+                        article = dict(article, title=old['title'], description=old.get('description'),
+                                       publishedAt=article.get('publishedAt') or old.get('publishedAt'))
+                    if not article.get('title'):
+                        continue
+                    if old and not article.get('content') and old['title'] == article['title'] \
+                            and old.get('description') == article.get('description'):
+                        continue
+
+                    has_content = bool(article.get('content'))
+                    # Docs indexed before the 'content' flag existed may have content too
+                    if not has_content and old and old.get('content', True):
+                        has_content = True
+                        if old_id in carried_from:
+                            carried_from[doc_id] = carried_from.pop(old_id)
+                        elif old_id in carried:
+                            carried[doc_id] = carried.pop(old_id)
+                        elif old_id in docs:
+                            carried[doc_id] = content_share(
+                                old, {term: weight for term, entries in postings.items()
+                                      for entry_id, weight in entries if entry_id == old_id})
+                        else:
+                            carried_from[doc_id] = old_id
+                    carried_from.pop(old_id, None)
+                    carried.pop(old_id, None)
+
+                    for term, weight in term_weights(article).items():
+                        postings.setdefault(term, []).append((doc_id, weight))
+                    docs[doc_id] = {
+                        'link': link,
+                        'source': source,
+                        'title': article['title'],
+                        'description': article.get('description'),
+                        'publishedAt': article.get('publishedAt'),
+                        'content': has_content,
+                    }
+                    if old_id is not None:
+                        if old_id in docs: # Indexed twice in this batch; keep the later one only
+                            del docs[old_id]
+                            for entries in postings.values():
+                                entries[:] = [entry for entry in entries if entry[0] != old_id]
+                        else:
+                            superseded.append(old_id)
+                    live[link] = doc_id
+                    doc_id += 1
+
+                if carried_from:
+                    replaced = {}
+                    for segment in segments:
+                        in_segment = [old_id for old_id in carried_from.values() if segment.has_document(old_id)]
+                        if in_segment:
+                            replaced.update(segment.document_terms(in_segment))
+                    for new_id, old_id in carried_from.items():
+                        old = next(meta for meta in (s.document(old_id) for s in segments) if meta)
+                        carried[new_id] = content_share(old, replaced.get(old_id, {}))
+            finally:
+                for segment in segments:
+                    segment.close()
+            if not docs:
+                return 0
+
+            for new_id, weights in carried.items():
+                for term, weight in weights.items():
+                    postings.setdefault(term, []).append((new_id, weight))
+            if carried:
+                # Merge a carried weight into the doc's own weight for the same term
+                for term, entries in postings.items():
+                    combined = {}
+                    for entry_id, weight in entries:
+                        combined[entry_id] = combined.get(entry_id, 0.0) + weight
+                    entries[:] = sorted(combined.items())
+
+            name = f"seg-{manifest['next_segment']:06d}"
+            postings = {term: entries for term, entries in postings.items() if entries}
+            write_segment(self.index_dir, name, postings, docs, superseded)
+            manifest = dict(manifest, segments=manifest['segments'] + [name],
+                            next_doc_id=doc_id, next_segment=manifest['next_segment'] + 1)
+            self._write_manifest(manifest)
+            _live_links[self.index_dir] = (tuple(manifest['segments']), live)
+            self._merge_tiers(manifest, live)
+        return len(docs)
+
+    def prune(self, days):
+        """Drops documents published more than `days` days ago."""
+        cutoff = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)).isoformat()
+        with self._write_lock():
+            manifest = self._read_manifest()
+            if not manifest['segments']:
+                return 0
+            live = self._load_live_links(manifest)
+            _live_links.pop(self.index_dir, None) # Pruned links leave the map
+            manifest = self._merge(manifest, manifest['segments'], live, cutoff=cutoff)
+            return segment_doc_count(self.index_dir, manifest['segments'][-1])
+
+    def _merge_tiers(self, manifest, live):
+        """Merges the oldest MERGE_FACTOR segments of any size tier that has that many."""
+        while True:
+            tiers = {}
+            for name in manifest['segments']:
+                tiers.setdefault(size_tier(segment_doc_count(self.index_dir, name)), []).append(name)
+            full = [names for _, names in sorted(tiers.items()) if len(names) >= MERGE_FACTOR]
+            if not full:
+                return manifest
+            manifest = self._merge(manifest, full[0][:MERGE_FACTOR], live)
+            _live_links[self.index_dir] = (tuple(manifest['segments']), live)
+
+    def _merge(self, manifest, names, live, cutoff=None):
+        """
+        Replaces the named segments with one, keeping only docs that are the
+        newest for their link (and, with a cutoff, published after it).
+        Superseded ids that point outside the merged segments are carried over.
+        """
+        segments = [Segment(self.index_dir, name) for name in names]
+        try:
+            merged_ids = set()
+            superseded = set()
+            keep = {}
+            for segment in segments:
+                superseded.update(segment.superseded)
+                for doc_id, meta in segment.iter_documents():
+                    merged_ids.add(doc_id)
+                    if live.get(meta['link']) != doc_id:
+                        continue
+                    if cutoff and meta.get('publishedAt') and normalize_timestamp(meta['publishedAt']) < cutoff:
+                        continue
+                    keep[doc_id] = meta
+
+            postings = {}
+            for segment in segments:
+                for term in segment.lexicon:
+                    doc_ids, weights = segment.postings(term)
+                    merged = postings.setdefault(term, [])
+                    for doc_id, weight in zip(doc_ids, weights):
+                        if doc_id in keep:
+                            merged.append((doc_id, weight))
+                    del doc_ids, weights # Release the mmap exports before closing
+            # Each segment's postings are sorted and segments may interleave
+            # doc ids after earlier merges, so sort the merged lists
+            postings = {term: sorted(entries) for term, entries in postings.items() if entries}
+        finally:
+            for segment in segments:
+                segment.close()
+
+        name = f"seg-{manifest['next_segment']:06d}"
+        write_segment(self.index_dir, name, postings, keep, superseded - merged_ids)
+        remaining = [segment for segment in manifest['segments'] if segment not in names]
+        new_manifest = dict(manifest, segments=remaining + [name], next_segment=manifest['next_segment'] + 1)
+        self._write_manifest(new_manifest)
+        for old in names:
+            _segment_links.pop((self.index_dir, old), None)
+        self._remove_unlisted_segments(new_manifest)
+        return new_manifest
+
+    def _remove_unlisted_segments(self, manifest):
+        """
+        Deletes segment files the manifest no longer lists. On Windows a file
+        still mapped by a query process cannot be deleted; it is retried
+        after the next merge.
+        """
+        listed = set(manifest['segments'])
+        for file_name in os.listdir(self.index_dir):
+            match = SEGMENT_FILE_PATTERN.match(file_name)
+            if match and match.group(1) not in listed and not file_name.endswith('.tmp'):
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.index_dir, file_name))
+
+
+def normalize_timestamp(value):
+    """Returns an ISO UTC timestamp string comparable with the prune cutoff."""
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc).isoformat()
+
+
+def index_articles(source, articles):
+    """
+    Adds articles to the search index. Called by content_scraper with
+    extracted content (listings are indexed by ingestionService once stored);
+    failures are logged and never interrupt scraping.
+    """
+    try:
+        count = SearchIndex().add_articles(source, articles)
+        logging.info(f"Search index: indexed {count} {source} articles.")
+    except Exception as e:
+        logging.warning(f"Search index: could not index {source} articles: {e}")
+
+
+def serve(index, requests_in, responses_out):
+    """
+    Answers queries until requests_in closes. Each request is one JSON line,
+    {"id": ..., "query": ..., "limit": 50, "offset": 0, "source": null}; each
+    response is one JSON line with the same id and the search() result plus
+    'indexed' (or 'error'). The index is reopened whenever its manifest
+    changes, so one long-lived process serves every /search request.
+    """
+    opened_stamp = None
+    for line in requests_in:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            stamp = index.manifest_stamp()
+            if stamp != opened_stamp or not index.segments:
+                index.open()
+                opened_stamp = stamp
+            result = index.search(request['query'], limit=request.get('limit', 50),
+                                  offset=request.get('offset', 0), source=request.get('source'))
+            result['indexed'] = index.document_count
+        except Exception as e:
+            result = {'error': str(e)}
+        result['id'] = request_id
+        responses_out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        responses_out.flush()
+    index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inverted search index over scraped articles.')
+    parser.add_argument('--index-dir', default=None, help=f'Defaults to ${INDEX_DIR_ENV} or data/search-index')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = commands.add_parser('add', help='Index a JSON list of articles read from stdin')
+    add_parser.add_argument('--source', required=True, help="Source key, e.g. 'toi'")
+
+    search_parser = commands.add_parser('search', help='Query the index; prints JSON')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=50)
+    search_parser.add_argument('--offset', type=int, default=0)
+    search_parser.add_argument('--source')
+
+    prune_parser = commands.add_parser('prune', help='Drop articles older than N days')
+    prune_parser.add_argument('--days', type=int, required=True)
+
+    commands.add_parser('serve', help='Answer JSON-lines queries from stdin until it closes')
+
+    commands.add_parser('stats', help='Print segment and document counts')
+
+    args = parser.parse_args()
+    index = SearchIndex(args.index_dir)
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    if args.command == 'add':
+        articles = json.load(sys.stdin)
+        print(json.dumps({'indexed': index.add_articles(args.source, articles)}))
+    elif args.command == 'search':
+        with index:
+            result = index.search(args.query, limit=args.limit, offset=args.offset, source=args.source)
+            result['indexed'] = index.document_count # Lets callers tell "no hits" from "no index yet"
+        json.dump(result, sys.stdout, ensure_ascii=False)
+    elif args.command == 'serve':
+        sys.stdin.reconfigure(encoding='utf-8')
+        serve(index, sys.stdin, sys.stdout)
+    elif args.command == 'prune':
+        print(json.dumps({'documents': index.prune(args.days)}))
+    elif args.command == 'stats':
+        with index:
+            print(json.dumps({'segments': len(index.segments), 'documents': index.document_count,
+                              'terms': len({t for s in index.segments for t in s.lexicon})}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# scrapers/source_urls.py
+#
+# Base URLs of the publishers we scrape. Each one can be overridden with an
+# environment variable so the scrapers can be pointed at a local stand-in
+# server (see standin_server.py), e.g.
+#   GPRESS_TOI_BASE_URL=http://127.0.0.1:8765/toi python times_of_india_scraper.py
+
+import os
+
+# Keys match config/sources.js
+DEFAULT_BASE_URLS = {
+    'hindu': 'https://www.thehindu.com',
+    'hindustan-times': 'https://www.hindustantimes.com',
+    'toi': 'https://timesofindia.indiatimes.com',
+    'ie': 'https://indianexpress.com',
+    'dna': 'https://www.dnaindia.com',
+}
+
+# Listing page scraped for each source, relative to its base URL
+LISTING_PATHS = {
+    'hindu': '/news/national/',
+    'hindustan-times': '/latest-news',
+    'toi': '/news',
+    'ie': '/',
+    'dna': '/latest-news',
+}
+
+
+def base_url_env_var(source):
+    """Returns the override variable name, e.g. 'GPRESS_HINDUSTAN_TIMES_BASE_URL'."""
+    return f"GPRESS_{source.upper().replace('-', '_')}_BASE_URL"
+
+
+def get_base_url(source):
+    """Returns the base URL for a source, honouring the environment override."""
+    return os.environ.get(base_url_env_var(source), DEFAULT_BASE_URLS[source]).rstrip('/')
+
+
+def get_listing_url(source):
+    """Returns the listing page URL the scraper for this source fetches."""
+    return get_base_url(source) + LISTING_PATHS[source]
+
+# Sections crawled for each source (see crawl_frontier.py); the first one is
+# the listing page above. Overridable with GPRESS_<SOURCE>_SECTIONS, a
+# comma-separated list of paths.
+SECTION_PATHS = {
+    'hindu': ['/news/national/', '/news/international/', '/business/', '/sci-tech/', '/sport/'],
+    'hindustan-times': ['/latest-news', '/india-news', '/world-news', '/business', '/cricket'],
+    'toi': ['/news', '/india', '/world', '/business', '/sports'],
+    'ie': ['/', '/section/india/', '/section/world/', '/section/business/', '/section/sports/'],
+    'dna': ['/latest-news', '/india', '/world', '/business', '/sports'],
+}
+
+# Path of page N (N >= 2) of a section; {section} is the section path
+# without its trailing slash
+PAGINATION_PATTERNS = {
+    'hindu': '{section}/?page={page}',
+    'hindustan-times': '{section}/page-{page}',
+    'toi': '{section}/{page}',
+    'ie': '{section}/page/{page}/',
+    'dna': '{section}/page-{page}',
+}
+
+
+def sections_env_var(source):
+    """Returns the section override variable name, e.g. 'GPRESS_TOI_SECTIONS'."""
+    return f"GPRESS_{source.upper().replace('-', '_')}_SECTIONS"
+
+
+def get_section_paths(source):
+    """Returns the section paths crawled for a source, honouring the environment override."""
+    override = os.environ.get(sections_env_var(source))
+    if override:
+        return [path.strip() for path in override.split(',') if path.strip()]
+    return list(SECTION_PATHS[source])
+
+
+def get_page_path(source, section_path, page):
+    """Returns the path of a section's page (1-based)."""
+    if page == 1:
+        return section_path
+    return PAGINATION_PATTERNS[source].format(section=section_path.rstrip('/'), page=page)
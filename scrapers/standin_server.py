@@ -0,0 +1,293 @@
+# scrapers/standin_server.py
+#
+# Local HTTP stand-in for the five publishers, for scaling tests without
+# touching the live sites. Every source is served under a path prefix:
+#
+#   http://127.0.0.1:8765/<source>[-<n>]/<listing path>   -> listing page
+#   http://127.0.0.1:8765/<source>[-<n>]/<section page>   -> listing page
+#   http://127.0.0.1:8765/<source>[-<n>]/<anything else>  -> article page
+#
+# Section pages are every page of the source's sections (SECTION_PATHS and
+# PAGINATION_PATTERNS in source_urls.py). Each lists different articles,
+# except that page 1 of every section repeats the first SHARED_TOP_STORIES
+# items, as publishers do with their top stories.
+#
+# where <source> is a key from config/sources.js. The optional -<n> suffix
+# lets one server impersonate many independent sources (e.g. /toi-17/news).
+# Point a scraper at it with GPRESS_<SOURCE>_BASE_URL (see source_urls.py).
+# Anything under <source>/static/ is an image whose size follows its ?w=
+# parameter; --dead-image-rate makes a fixed share of image URLs 404.
+#
+# Usage:
+#   python standin_server.py [--port 8765] [--articles 25] [--latency-ms 0]
+#       [--jitter-ms 0] [--error-rate 0] [--throttle-rate 0] [--page-kb 0]
+#       [--gzip] [--dead-image-rate 0] [--recordings DIR]
+
+import argparse
+import datetime
+import gzip
+import html as html_lib
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from source_urls import LISTING_PATHS, get_page_path, get_section_paths
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+PREFIX_PATTERN = re.compile(r'^/(?P<source>[a-z]+(?:-times)?)(?:-(?P<instance>\d+))?(?P<path>/.*)?$')
+
+SHARED_TOP_STORIES = 3
+MAX_SECTION_PAGES = 50
+# Images are PNG-typed filler: width*width/40 bytes for ?w=<width>, else a full-size original
+ORIGINAL_IMAGE_BYTES = 96 * 1024
+
+WORDS = ('india', 'government', 'court', 'monsoon', 'election', 'market', 'cricket', 'policy',
+         'minister', 'delhi', 'mumbai', 'report', 'budget', 'climate', 'space', 'railway')
+
+
+class StandInConfig:
+    """Behaviour knobs shared by all request handler threads."""
+
+    def __init__(self, articles=25, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 throttle_rate=0.0, page_kb=0, recordings=None, seed=None, gzip=False, dead_image_rate=0.0):
+        self.articles = articles
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.page_kb = page_kb
+        self.recordings = recordings
+        self.gzip = gzip
+        self.dead_image_rate = dead_image_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'bytes': 0, 'status': {}}
+
+    def record(self, status, size):
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['bytes'] += size
+            self.stats['status'][status] = self.stats['status'].get(status, 0) + 1
+
+    def roll(self):
+        with self.lock:
+            return self.random.random()
+
+
+def make_slug(instance, n):
+    words = [WORDS[(instance * 7 + n * 3 + k) % len(WORDS)] for k in range(6)]
+    return '-'.join(words) + f'-{instance}-{n}'
+
+
+def listing_position(source, path):
+    """Returns (section index, page) if path is one of the source's section pages, else None."""
+    for index, section_path in enumerate(get_section_paths(source)):
+        for page in range(1, MAX_SECTION_PAGES + 1):
+            if get_page_path(source, section_path, page) == path:
+                return index, page
+    return None
+
+
+def render_listing(source, prefix_url, instance, count, section=0, page=1):
+    """Builds a synthetic listing page matching the selectors of each scraper."""
+    now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    items = []
+    for k in range(count):
+        if (section, page) == (0, 1) or (page == 1 and k < SHARED_TOP_STORIES):
+            n = k
+        else:
+            n = (section * MAX_SECTION_PAGES + page) * count + k
+        slug = make_slug(instance, n)
+        title = html_lib.escape(slug.replace('-', ' ').capitalize())
+        img = f'/static/img/{slug}.jpg'
+        if source == 'hindu':
+            items.append(
+                f'<div class="element row-element"><div class="picture"><img src="{img}" '
+                f'srcset="{img}?w=320 320w, {img}?w=640 640w"></div>'
+                f'<h3 class="title big"><a href="/news/national/{slug}/article{1000 + n}.ece">{title}</a></h3>'
+                f'<div class="by-line"><span class="dateline-timestamp"><time datetime="{now}"></time></span></div></div>')
+        elif source == 'toi':
+            items.append(
+                f'<div class="J_XyX"><figure><img data-src="{img}" src="/static/spacer.gif"></figure>'
+                f'<a class="VeCXM" href="/india/{slug}/articleshow/{100000 + n}.cms">{title}</a>'
+                f'<a href="/topic/{slug}.cms">related</a></div>')
+        elif source == 'ie':
+            items.append(
+                f'<div class="section-article"><div class="s-img"><img src="{prefix_url}{img}"></div>'
+                f'<h2><a href="{prefix_url}/article/india/{slug}/">{title}</a></h2></div>')
+        elif source == 'hindustan-times':
+            items.append(
+                f'<div class="cartHolder listView" data-vars-story-title="{title}" '
+                f'data-vars-story-url="/india-news/{slug}-{100000 + n}.html">'
+                f'<div class="detail"><p class="para-txt">{title} and more details.</p></div>'
+                f'<div class="img-sec"><img src="{img}" srcset="{img}?w=400 400w, {img}?w=800 800w"></div></div>')
+        elif source == 'dna':
+            items.append(
+                f'<div class="list-news"><div class="lazy-img"><img data-src="{img}"></div>'
+                f'<div class="explainer-subtext"><a href="/india/report-{slug}-{100000 + n}">{title}</a></div></div>')
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>Stand-in</title></head><body>'
+            '<nav>' + ''.join(f'<a href="/section/{w}">{w}</a>' for w in WORDS) + '</nav>'
+            '<main>' + ''.join(items) + '</main></body></html>')
+
+
+def render_article(path):
+    title = html_lib.escape(path.strip('/').split('/')[-1].replace('-', ' '))
+    paragraphs = ''.join(
+        f'<p>{title.capitalize()} paragraph {k}: ' + ' '.join(WORDS[(k + j) % len(WORDS)] for j in range(40)) + '.</p>'
+        for k in range(12))
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>' + title + '</title></head><body>'
+            '<nav><a href="/">Home</a><a href="/news">News</a></nav>'
+            '<article itemprop="articleBody"><h1>' + title + '</h1>'
+            '<div class="articlebodycontent story-element full-details article-description _s30J clearfix">'
+            + paragraphs + '<p>Also Read: something else</p></div></article>'
+            '<footer><p>Follow us on social media</p></footer></body></html>')
+
+
+def image_body(query):
+    match = re.search(r'(?:^|&)w=(\d+)', query)
+    size = int(match.group(1)) ** 2 // 40 if match else ORIGINAL_IMAGE_BYTES
+    return b'\x89PNG\r\n\x1a\n' + b'\0' * size
+
+
+def pad_page(body, page_kb):
+    missing = page_kb * 1024 - len(body)
+    if missing <= 0:
+        return body
+    filler = '<!-- ' + 'x' * max(0, missing - 9) + ' -->'
+    return body.replace('</body>', filler + '</body>')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    config = None  # Set by make_server()
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass # Request logging would dominate load-test output
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8', extra_headers=None, head_only=False):
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        extra_headers = dict(extra_headers or {})
+        if self.config.gzip and content_type.startswith('text/html') \
+                and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            data = gzip.compress(data, compresslevel=5)
+            extra_headers['Content-Encoding'] = 'gzip'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(data)
+        self.config.record(status, 0 if head_only else len(data))
+
+    def do_HEAD(self):
+        self.do_GET(head_only=True)
+
+    def do_GET(self, head_only=False):
+        config = self.config
+        delay = config.latency_ms + (config.roll() * config.jitter_ms if config.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000.0)
+
+        roll = config.roll()
+        if roll < config.throttle_rate:
+            return self.send_body(429, 'Too Many Requests', 'text/plain', {'Retry-After': '1'})
+        if roll < config.throttle_rate + config.error_rate:
+            return self.send_body(500, 'Internal Server Error', 'text/plain')
+
+        request_path, _, query = self.path.partition('?')
+        match = PREFIX_PATTERN.match(request_path)
+        if not match or match.group('source') not in LISTING_PATHS:
+            return self.send_body(404, 'Not Found', 'text/plain')
+
+        source = match.group('source')
+        instance = int(match.group('instance') or 0)
+        path = match.group('path') or '/'
+        prefix = f"/{source}" + (f"-{match.group('instance')}" if match.group('instance') else '')
+        prefix_url = f"http://{self.headers.get('Host', '127.0.0.1')}{prefix}"
+
+        if path.startswith('/static/'):
+            if zlib.crc32(path.encode()) % 1000 < config.dead_image_rate * 1000:
+                return self.send_body(404, 'Not Found', 'text/plain', head_only=head_only)
+            return self.send_body(200, image_body(query), 'image/png', head_only=head_only)
+
+        position = listing_position(source, path + ('?' + query if query else ''))
+        if position is None and path == LISTING_PATHS[source]:
+            position = (0, 1)
+        recorded = os.path.join(config.recordings, f'{source}.html') if config.recordings else None
+        if path == LISTING_PATHS[source] and not query and recorded and os.path.exists(recorded):
+            with open(recorded, 'rb') as recorded_file:
+                body = recorded_file.read().decode('utf-8', errors='replace')
+        elif position:
+            body = render_listing(source, prefix_url, instance, config.articles, *position)
+        else:
+            body = render_article(path)
+
+        body = pad_page(body, config.page_kb)
+        self.send_body(200, body, head_only=head_only)
+
+
+def make_server(config, host='127.0.0.1', port=8765):
+    """Creates (but does not start) a threaded stand-in server."""
+    handler = type('ConfiguredStandInHandler', (StandInHandler,), {'config': config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(config, host='127.0.0.1', port=0):
+    """Starts a server on a daemon thread and returns (server, base_url)."""
+    server = make_server(config, host, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_config_arguments(parser):
+    parser.add_argument('--articles', type=int, default=25, help='Articles per synthetic listing page')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Fixed delay added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Extra random delay, 0..jitter')
+    parser.add_argument('--error-rate', type=float, default=0, help='Fraction of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='Fraction of requests answered with 429')
+    parser.add_argument('--page-kb', type=int, default=0, help='Pad pages to at least this many KiB')
+    parser.add_argument('--gzip', action='store_true', help='Gzip HTML for clients that accept it')
+    parser.add_argument('--dead-image-rate', type=float, default=0,
+                        help='Fraction of image URLs answered with 404 (fixed per URL)')
+    parser.add_argument('--recordings', help='Directory with recorded <source>.html listing pages')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible fault injection')
+
+
+def config_from_args(args):
+    return StandInConfig(articles=args.articles, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                         error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                         page_kb=args.page_kb, recordings=args.recordings, seed=args.seed, gzip=args.gzip,
+                         dead_image_rate=args.dead_image_rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in server for the publisher sites.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = make_server(config_from_args(args), args.host, args.port)
+    logging.info(f"Stand-in publisher server listening on http://{args.host}:{args.port}/<source>/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
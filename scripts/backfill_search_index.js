@@ -0,0 +1,29 @@
+// scripts/backfill_search_index.js
+//
+// Adds every article already in MongoDB to the search index
+// (scrapers/search_index.py). Ingestion only indexes what it stores, so run
+// this once after deploying the index, or after deleting data/search-index.
+// Safe to re-run: unchanged articles are skipped.
+//
+// Usage: npm run search:backfill   (reads MONGODB_URI like index.js)
+
+require("dotenv").config();
+
+const mongoose = require("mongoose");
+const { sourceConfig } = require("../config/sources");
+const { backfillSearchIndex } = require("../services/searchIndexService");
+
+(async () => {
+  await mongoose.connect(
+    process.env.MONGODB_URI || "mongodb://localhost:27017/newsDB"
+  );
+  try {
+    const indexed = await backfillSearchIndex(sourceConfig);
+    console.log("[SearchIndex] Backfill complete:", indexed);
+  } finally {
+    await mongoose.disconnect();
+  }
+})().catch((error) => {
+  console.error("[SearchIndex] Backfill failed:", error);
+  process.exit(1);
+});
@@ -0,0 +1,186 @@
+const { spawn } = require("child_process");
+const path = require("path");
+const { sourceConfig } = require("../config/sources");
+
+const EXTRACTION_QUEUE_SCRIPT = path.join(
+  __dirname,
+  "..",
+  "scrapers",
+  "extraction_queue.py"
+);
+const QUEUE_COMMAND_TIMEOUT_MS = 30000;
+
+// Sources whose article pages need browser-based content extraction
+// (BROWSER_SOURCES in scrapers/content_scraper.py).
+const EXTRACTION_SOURCES = ["hindu", "toi", "ie", "dna"];
+// How many articles without content to enqueue per source per sync.
+const MAX_ENQUEUE_PER_SOURCE = 50;
+// How many finished jobs to write back per sync.
+const MAX_RESULTS_PER_SYNC = 200;
+
+/**
+ * Runs scrapers/extraction_queue.py with the given arguments, optionally
+ * writing a JSON payload to its stdin, and parses its JSON output.
+ * @param {string[]} args - Command-line arguments for extraction_queue.py.
+ * @param {*} [input] - Value to send as JSON on stdin.
+ * @returns {Promise<object>}
+ */
+function runExtractionQueueCommand(args, input) {
+  return new Promise((resolve, reject) => {
+    const pythonProcess = spawn("python", [EXTRACTION_QUEUE_SCRIPT, ...args]);
+    let dataBuffer = "";
+    let errorBuffer = "";
+
+    const timer = setTimeout(() => {
+      pythonProcess.kill();
+      reject(new Error(`extraction_queue.py ${args[0]} timed out`));
+    }, QUEUE_COMMAND_TIMEOUT_MS);
+
+    pythonProcess.stdout.on("data", (data) => {
+      dataBuffer += data.toString();
+    });
+    pythonProcess.stderr.on("data", (data) => {
+      errorBuffer += data.toString();
+    });
+    pythonProcess.on("error", (error) => {
+      clearTimeout(timer);
+      reject(error);
+    });
+    pythonProcess.on("close", (code) => {
+      clearTimeout(timer);
+      if (code !== 0) {
+        return reject(
+          new Error(`extraction_queue.py exited with code ${code}: ${errorBuffer}`)
+        );
+      }
+      try {
+        resolve(JSON.parse(dataBuffer));
+      } catch (parseError) {
+        reject(parseError);
+      }
+    });
+
+    pythonProcess.stdin.end(input === undefined ? "" : JSON.stringify(input));
+  });
+}
+
+/**
+ * Adds articles that still have no content to the extraction queue.
+ * Links already queued are ignored by the queue, so this is safe to repeat.
+ * @returns {Promise<number>} Number of newly queued jobs.
+ */
+async function enqueueMissingContent() {
+  const jobs = [];
+  for (const sourceKey of EXTRACTION_SOURCES) {
+    const { model: Model } = sourceConfig[sourceKey];
+    const articles = await Model.find(
+      { content: null, contentScrapeFailed: { $ne: true } },
+      "link"
+    )
+      .sort({ createdAt: -1 })
+      .limit(MAX_ENQUEUE_PER_SOURCE)
+      .lean();
+    for (const article of articles) {
+      jobs.push({ url: article.link, source: sourceKey });
+    }
+  }
+  if (jobs.length === 0) {
+    return 0;
+  }
+  const { enqueued } = await runExtractionQueueCommand(["enqueue"], jobs);
+  return enqueued;
+}
+
+/**
+ * Writes finished extraction jobs back to MongoDB (one bulkWrite per source)
+ * and acknowledges them in the queue.
+ * @returns {Promise<{stored: number, failed: number}>}
+ */
+async function storeExtractionResults() {
+  const results = await runExtractionQueueCommand([
+    "results",
+    "--limit",
+    String(MAX_RESULTS_PER_SYNC),
+  ]);
+  const operationsBySource = {};
+  let stored = 0;
+  let failed = 0;
+
+  for (const result of results) {
+    if (!sourceConfig[result.source]) {
+      continue;
+    }
+    const update =
+      result.state === "done"
+        ? { content: result.content, contentScrapeFailed: false }
+        : { contentScrapeFailed: true };
+    if (!operationsBySource[result.source]) {
+      operationsBySource[result.source] = [];
+    }
+    operationsBySource[result.source].push({
+      updateOne: {
+        filter: { link: result.url },
+        update: { $set: update },
+      },
+    });
+    if (result.state === "done") {
+      stored++;
+    } else {
+      failed++;
+    }
+  }
+
+  for (const [sourceKey, operations] of Object.entries(operationsBySource)) {
+    await sourceConfig[sourceKey].model.bulkWrite(operations, {
+      ordered: false,
+    });
+  }
+  if (results.length > 0) {
+    // Only acknowledged after MongoDB has the results; a crash before this
+    // point redelivers them, and the updates are idempotent.
+    await runExtractionQueueCommand(
+      ["ack"],
+      results.map((result) => result.url)
+    );
+  }
+  return { stored, failed };
+}
+
+/**
+ * One sync step between MongoDB and the extraction queue: enqueue articles
+ * missing content, then store whatever the workers have finished.
+ */
+async function syncContentExtraction() {
+  try {
+    const enqueued = await enqueueMissingContent();
+    const { stored, failed } = await storeExtractionResults();
+    if (enqueued || stored || failed) {
+      console.log(
+        `[Extraction Queue] Enqueued ${enqueued} articles; stored content for ${stored}, ${failed} failed.`
+      );
+    }
+  } catch (error) {
+    console.error("[Extraction Queue] Sync failed:", error.message);
+  }
+}
+
+/**
+ * Queue depth, active leases and throughput, for monitoring.
+ */
+async function getExtractionQueueStats() {
+  return runExtractionQueueCommand(["stats"]);
+}
+
+/**
+ * Deletes delivered jobs older than daysToKeep from the queue.
+ * @param {number} daysToKeep - Number of days to keep finished jobs.
+ */
+async function pruneExtractionQueue(daysToKeep) {
+  return runExtractionQueueCommand(["prune", "--days", String(daysToKeep)]);
+}
+
+module.exports = {
+  syncContentExtraction,
+  getExtractionQueueStats,
+  pruneExtractionQueue,
+};
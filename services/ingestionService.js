@@ -2,6 +2,298 @@ const { spawn } = require("child_process");
 const mongoose = require("mongoose");
 const { sourceConfig } = require("../config/sources"); // Import sourceConfig
 const { assignCategoriesToArticle } = require("./articleProcessor"); // Import categorization logic
+const {
+  recordScrapeResult,
+  recordScrapeFailure,
+  getDueSources,
+  saveSchedulerState,
+} = require("./scrapeScheduler");
+const { indexArticles, pruneSearchIndex } = require("./searchIndexService");
+const { pruneExtractionQueue } = require("./extractionQueueService");
+const { decodeScraperOutput } = require("./scraperOutput");
+
+// "msgpack" makes the listing scrapers write length-prefixed MessagePack
+// instead of JSON (needs the Python msgpack package; see
+// scrapers/article_record.py).
+const SCRAPER_OUTPUT_FORMAT = process.env.SCRAPER_OUTPUT_FORMAT || "json";
+
+const genericTitlesToSkip = [
+  "representational image only. file",
+  "representatve image",
+  "photo used for representation purpose only.",
+  "file",
+  "photo",
+  "image",
+  "a view of",
+  "image released by",
+  "representational image only",
+  "file photo",
+  "image might show:",
+  "stream key mixer",
+  "photo :",
+  "representational photo of",
+  "photo used for representation purpose only",
+];
+
+/**
+ * Validates a single scraped article and normalizes it for storage.
+ * @param {string} sourceKey - The key of the news source (e.g., 'hindu').
+ * @param {object} articleData - One article object as emitted by a scraper.
+ * @returns {object|null} The normalized article, or null if it should be skipped.
+ */
+function normalizeScrapedArticle(sourceKey, articleData) {
+  const { title, link, description, imageUrl, content } = articleData;
+  const dateString = articleData.publishedAt || articleData.date;
+
+  if (!title || !link || !dateString) {
+    return null;
+  }
+
+  const lowerCaseTitle = title.toLowerCase().trim();
+  const isGenericTitle = genericTitlesToSkip.some((pattern) =>
+    lowerCaseTitle.includes(pattern)
+  );
+  if (isGenericTitle) {
+    return null;
+  }
+
+  let parsedDate;
+  const tempDate = new Date(dateString);
+  if (!isNaN(tempDate.getTime())) {
+    parsedDate = tempDate;
+  } else {
+    console.warn(
+      `[${sourceKey} Scraper] Invalid date string "${dateString}" for article "${title}". Using current date.`
+    );
+    parsedDate = new Date();
+  }
+
+  return {
+    title,
+    link: link.split("?")[0].split("#")[0],
+    description,
+    imageUrl,
+    content,
+    pubDate: parsedDate,
+  };
+}
+
+/**
+ * Derives the current-affairs flags from a list of keyword categories.
+ * @param {string[]} categories - Categories assigned by assignCategoriesToArticle.
+ * @returns {{isCurrentAffair: boolean, currentAffairsCategory: string}}
+ */
+function getCurrentAffairsFlags(categories) {
+  if (categories.length > 0 && categories[0] !== "General") {
+    return { isCurrentAffair: true, currentAffairsCategory: categories[0] };
+  }
+  return { isCurrentAffair: false, currentAffairsCategory: "General" };
+}
+
+/**
+ * Computes the fields to $set on an existing article, if any changed.
+ * @param {object} existingArticle - The stored article (lean document).
+ * @param {object} article - The normalized scraped article.
+ * @returns {object|null} The $set document, or null if nothing changed.
+ */
+function buildArticleUpdate(existingArticle, article) {
+  const { title, description, imageUrl, content } = article;
+  const update = {};
+
+  if (!existingArticle.description && description) {
+    update.description = description;
+  }
+  if (!existingArticle.imageUrl && imageUrl) {
+    update.imageUrl = imageUrl;
+  }
+  if (existingArticle.title !== title) {
+    update.title = title;
+  }
+  if (
+    content &&
+    (!existingArticle.content || existingArticle.content.length < 50)
+  ) {
+    update.content = content;
+  }
+
+  const newCategories = assignCategoriesToArticle(
+    title,
+    description || content
+  );
+  if (
+    JSON.stringify(existingArticle.categories) !== JSON.stringify(newCategories)
+  ) {
+    update.categories = newCategories;
+  }
+
+  const { isCurrentAffair, currentAffairsCategory } =
+    getCurrentAffairsFlags(newCategories);
+  if (
+    existingArticle.isCurrentAffair !== isCurrentAffair ||
+    existingArticle.currentAffairsCategory !== currentAffairsCategory
+  ) {
+    update.isCurrentAffair = isCurrentAffair;
+    update.currentAffairsCategory = currentAffairsCategory;
+    update.aiCategorizationTimestamp = new Date();
+  }
+
+  if (Object.keys(update).length === 0) {
+    return null;
+  }
+  update.updatedAt = new Date();
+  return update;
+}
+
+/**
+ * Stores a batch of scraped articles with one lookup and one bulkWrite.
+ * Existing links are fetched with a single $in query, and all inserts and
+ * updates are sent as one unordered bulkWrite, so a duplicate-key race on
+ * one article does not block the rest of the batch.
+ * storedArticles holds every article of the batch that is in MongoDB
+ * afterwards, as stored; rejected articles (generic titles, missing dates,
+ * failed writes) are left out.
+ * @param {string} sourceKey - The key of the news source (e.g., 'hindu').
+ * @param {mongoose.Model} Model - The Mongoose model for the articles.
+ * @param {object[]} articles - Articles as emitted by the scraper.
+ * @returns {Promise<{newArticlesCount: number, updatedArticlesCount: number, skippedArticlesCount: number, storedArticles: object[]}>}
+ */
+async function bulkUpsertArticles(sourceKey, Model, articles) {
+  let skippedArticlesCount = 0;
+
+  // Normalize and de-duplicate by cleaned link; the first occurrence wins,
+  // just like the sequential path where later duplicates found the new doc.
+  const articlesByLink = new Map();
+  for (const articleData of articles) {
+    const article = normalizeScrapedArticle(sourceKey, articleData);
+    if (!article || articlesByLink.has(article.link)) {
+      skippedArticlesCount++;
+      continue;
+    }
+    articlesByLink.set(article.link, article);
+  }
+
+  if (articlesByLink.size === 0) {
+    return {
+      newArticlesCount: 0,
+      updatedArticlesCount: 0,
+      skippedArticlesCount,
+      storedArticles: [],
+    };
+  }
+
+  const existingArticles = await Model.find(
+    { link: { $in: Array.from(articlesByLink.keys()) } },
+    "link title description imageUrl content pubDate categories isCurrentAffair currentAffairsCategory"
+  ).lean();
+  const existingByLink = new Map(existingArticles.map((a) => [a.link, a]));
+
+  const operations = [];
+  const storedArticles = [];
+  // Per operation: [the article as stored, the stored article if the write fails]
+  const operationArticles = [];
+  let plannedInserts = 0;
+  let plannedUpdates = 0;
+
+  for (const article of articlesByLink.values()) {
+    const existingArticle = existingByLink.get(article.link);
+
+    if (existingArticle) {
+      const update = buildArticleUpdate(existingArticle, article);
+      if (update) {
+        operations.push({
+          updateOne: {
+            filter: { _id: existingArticle._id },
+            update: { $set: update },
+          },
+        });
+        operationArticles.push([{ ...existingArticle, ...update }, existingArticle]);
+        plannedUpdates++;
+      } else {
+        storedArticles.push(existingArticle);
+        skippedArticlesCount++;
+      }
+      continue;
+    }
+
+    const assignedCategories = assignCategoriesToArticle(
+      article.title,
+      article.description || article.content
+    );
+    const { isCurrentAffair, currentAffairsCategory } =
+      getCurrentAffairsFlags(assignedCategories);
+    const now = new Date();
+    const document = {
+      title: article.title,
+      link: article.link,
+      pubDate: article.pubDate,
+      source: sourceKey,
+      description: article.description || null,
+      imageUrl: article.imageUrl || null,
+      content: article.content || null,
+      categories: assignedCategories,
+      isCurrentAffair: isCurrentAffair,
+      currentAffairsCategory: currentAffairsCategory,
+      aiCategorizationTimestamp: now,
+      createdAt: now,
+      updatedAt: now,
+    };
+
+    operations.push({ insertOne: { document } });
+    operationArticles.push([document, null]);
+    plannedInserts++;
+  }
+
+  if (operations.length === 0) {
+    return {
+      newArticlesCount: 0,
+      updatedArticlesCount: 0,
+      skippedArticlesCount,
+      storedArticles,
+    };
+  }
+
+  let result;
+  let writeErrors = [];
+  try {
+    result = await Model.bulkWrite(operations, { ordered: false });
+  } catch (error) {
+    // With ordered: false the driver still applies every operation it can;
+    // a failed insert (e.g. a link stored concurrently) only skips that one.
+    if (!error.result) {
+      throw error;
+    }
+    console.warn(
+      `[Scraper] bulkWrite for ${sourceKey} completed with ${
+        (error.writeErrors || []).length
+      } write error(s): ${error.message}`
+    );
+    result = error.result;
+    writeErrors = error.writeErrors || [];
+  }
+
+  const failedOperations = new Map(writeErrors.map((e) => [e.index, e.code]));
+  operationArticles.forEach(([stored, previous], index) => {
+    if (!failedOperations.has(index)) {
+      storedArticles.push(stored);
+    } else if (previous) {
+      storedArticles.push(previous);
+    } else if (failedOperations.get(index) === 11000) {
+      storedArticles.push(stored); // Duplicate link: stored concurrently
+    }
+  });
+
+  const newArticlesCount = result.insertedCount ?? plannedInserts;
+  const updatedArticlesCount = result.modifiedCount ?? plannedUpdates;
+  skippedArticlesCount +=
+    plannedInserts - newArticlesCount + (plannedUpdates - updatedArticlesCount);
+
+  return {
+    newArticlesCount,
+    updatedArticlesCount,
+    skippedArticlesCount,
+    storedArticles,
+  };
+}
 
 /**
  * Runs a single Python scraper and stores the articles.
@@ -19,12 +311,18 @@ async function runScraperAndStore(sourceKey, scraperPath, Model) {
     console.log(
       `[Scraper] Executing Python script: ${scraperPath} for ${sourceKey}`
     );
-    const pythonProcess = spawn("python", [scraperPath]);
-    let dataBuffer = "";
+    const pythonProcess = spawn("python", [
+      scraperPath,
+      "--output",
+      SCRAPER_OUTPUT_FORMAT,
+    ]);
+    // Raw chunks, decoded once at the end: a chunk boundary can fall inside
+    // a multi-byte character or a MessagePack frame.
+    const outputChunks = [];
     let errorBuffer = "";
 
     pythonProcess.stdout.on("data", (data) => {
-      dataBuffer += data.toString();
+      outputChunks.push(data);
     });
 
     pythonProcess.stderr.on("data", (data) => {
@@ -59,197 +357,44 @@ async function runScraperAndStore(sourceKey, scraperPath, Model) {
       }
 
       try {
-        const articles = JSON.parse(dataBuffer);
+        const articles = decodeScraperOutput(Buffer.concat(outputChunks));
         console.log(
           `[Scraper] Received ${articles.length} articles from ${sourceKey}.`
         );
 
-        let newArticlesCount = 0;
-        let updatedArticlesCount = 0;
-        let skippedArticlesCount = 0;
-
-        const genericTitlesToSkip = [
-          "representational image only. file",
-          "representatve image",
-          "photo used for representation purpose only.",
-          "file",
-          "photo",
-          "image",
-          "a view of",
-          "image released by",
-          "representational image only",
-          "file photo",
-          "image might show:",
-          "stream key mixer",
-          "photo :",
-          "representational photo of",
-          "photo used for representation purpose only",
-        ];
-
-        for (const articleData of articles) {
-          const { title, link, description, imageUrl, content } = articleData;
-          const dateString = articleData.publishedAt || articleData.date;
-
-          if (!title || !link || !dateString) {
-            skippedArticlesCount++;
-            continue;
-          }
-
-          const lowerCaseTitle = title.toLowerCase().trim();
-          const isGenericTitle = genericTitlesToSkip.some((pattern) =>
-            lowerCaseTitle.includes(pattern)
+        const counts = await bulkUpsertArticles(sourceKey, Model, articles);
+        // Indexed after ingestion so that every search hit has a document
+        try {
+          const indexed = await indexArticles(sourceKey, counts.storedArticles);
+          console.log(`[Scraper] Indexed ${indexed} ${sourceKey} articles for search.`);
+        } catch (indexError) {
+          console.warn(
+            `[Scraper] Could not index ${sourceKey} articles for search:`,
+            indexError.message
           );
-
-          if (isGenericTitle) {
-            skippedArticlesCount++;
-            continue;
-          }
-
-          let parsedDate;
-          const tempDate = new Date(dateString);
-          if (!isNaN(tempDate.getTime())) {
-            parsedDate = tempDate;
-          } else {
-            console.warn(
-              `[${sourceKey} Scraper] Invalid date string "${dateString}" for article "${title}". Using current date.`
-            );
-            parsedDate = new Date();
-          }
-
-          const cleanLink = link.split("?")[0].split("#")[0];
-          const existingArticle = await Model.findOne({ link: cleanLink });
-
-          if (existingArticle) {
-            let hasChanged = false;
-
-            if (!existingArticle.description && description) {
-              existingArticle.description = description;
-              hasChanged = true;
-            }
-            if (!existingArticle.imageUrl && imageUrl) {
-              existingArticle.imageUrl = imageUrl;
-              hasChanged = true;
-            }
-            if (existingArticle.title !== title) {
-              existingArticle.title = title;
-              hasChanged = true;
-            }
-            if (
-              content &&
-              (!existingArticle.content || existingArticle.content.length < 50)
-            ) {
-              existingArticle.content = content;
-              hasChanged = true;
-            }
-
-            const newCategories = assignCategoriesToArticle(
-              title,
-              description || content
-            );
-            if (
-              JSON.stringify(existingArticle.categories) !==
-              JSON.stringify(newCategories)
-            ) {
-              existingArticle.categories = newCategories;
-              hasChanged = true;
-            }
-
-            // Logic for isCurrentAffair and currentAffairsCategory based on keyword categories
-            if (
-              existingArticle.categories.length > 0 &&
-              existingArticle.categories[0] !== "General"
-            ) {
-              if (
-                existingArticle.isCurrentAffair !== true ||
-                existingArticle.currentAffairsCategory !==
-                  existingArticle.categories[0]
-              ) {
-                existingArticle.isCurrentAffair = true;
-                existingArticle.currentAffairsCategory =
-                  existingArticle.categories[0];
-                existingArticle.aiCategorizationTimestamp = new Date();
-                hasChanged = true;
-              }
-            } else if (
-              existingArticle.isCurrentAffair === undefined ||
-              existingArticle.currentAffairsCategory === undefined ||
-              existingArticle.isCurrentAffair !== false ||
-              existingArticle.currentAffairsCategory !== "General"
-            ) {
-              existingArticle.isCurrentAffair = false;
-              existingArticle.currentAffairsCategory = "General";
-              existingArticle.aiCategorizationTimestamp = new Date();
-              hasChanged = true;
-            }
-
-            if (hasChanged) {
-              existingArticle.updatedAt = new Date();
-              await existingArticle.save();
-              updatedArticlesCount++;
-            } else {
-              skippedArticlesCount++;
-            }
-          } else {
-            // New article
-            const assignedCategories = assignCategoriesToArticle(
-              title,
-              description || content
-            );
-
-            let isCurrentAffair = false;
-            let currentAffairsCategory = "General";
-
-            if (
-              assignedCategories.length > 0 &&
-              assignedCategories[0] !== "General"
-            ) {
-              isCurrentAffair = true;
-              currentAffairsCategory = assignedCategories[0];
-            }
-
-            const newArticle = new Model({
-              title,
-              link: cleanLink,
-              pubDate: parsedDate,
-              source: sourceKey,
-              description: description || null,
-              imageUrl: imageUrl || null,
-              content: content || null,
-              categories: assignedCategories,
-              isCurrentAffair: isCurrentAffair,
-              currentAffairsCategory: currentAffairsCategory,
-              aiCategorizationTimestamp: new Date(),
-              createdAt: new Date(),
-              updatedAt: new Date(),
-            });
-            await newArticle.save();
-            newArticlesCount++;
-          }
         }
-        resolve({
-          newArticlesCount,
-          updatedArticlesCount,
-          skippedArticlesCount,
-        });
-      } catch (parseError) {
+        resolve(counts);
+      } catch (ingestError) {
         console.error(
-          `[Scraper] Error parsing JSON from Python script for ${sourceKey}:`,
-          parseError
+          `[Scraper] Error ingesting output of Python script for ${sourceKey}:`,
+          ingestError
         );
-        reject(parseError);
+        reject(ingestError);
       }
     });
   });
 }
 
 /**
- * Runs all configured scrapers.
+ * Runs the scrapers for the given sources and feeds the results to the
+ * adaptive polling scheduler.
+ * @param {string[]} sourceKeys - Keys from sourceConfig to scrape.
  */
-async function runAllScrapers() {
-  console.log("[Scraper] Starting all scrapers...");
+async function runScrapers(sourceKeys) {
+  console.log(`[Scraper] Starting scrapers: ${sourceKeys.join(", ")}...`);
   const overallStartTime = Date.now(); // Start timing for the entire scraping run
 
-  for (const sourceKey in sourceConfig) {
+  for (const sourceKey of sourceKeys) {
     const config = sourceConfig[sourceKey];
     try {
       // The "Running scraper for X..." log is now handled by runScraperAndStore itself
@@ -258,14 +403,18 @@ async function runAllScrapers() {
       console.log(
         `[Scraper] ${sourceKey}: New: ${newArticlesCount}, Updated: ${updatedArticlesCount}, Skipped: ${skippedArticlesCount}`
       );
+      recordScrapeResult(sourceKey, newArticlesCount);
     } catch (error) {
       console.error(
         `[Scraper] Failed to run scraper for ${sourceKey}:`,
         error.message
       );
+      recordScrapeFailure(sourceKey);
     }
   }
-  console.log("[Scraper] All scrapers finished.");
+  await saveSchedulerState();
+
+  console.log("[Scraper] Scrapers finished.");
   const overallEndTime = Date.now(); // End timing for the entire run
   const overallDuration = ((overallEndTime - overallStartTime) / 1000).toFixed(
     2
@@ -275,6 +424,25 @@ async function runAllScrapers() {
   );
 }
 
+/**
+ * Runs all configured scrapers.
+ */
+async function runAllScrapers() {
+  await runScrapers(Object.keys(sourceConfig));
+}
+
+/**
+ * Runs only the scrapers whose adaptive polling interval has elapsed.
+ * @returns {Promise<string[]>} The source keys that were scraped.
+ */
+async function runDueScrapers() {
+  const dueSources = getDueSources();
+  if (dueSources.length > 0) {
+    await runScrapers(dueSources);
+  }
+  return dueSources;
+}
+
 /**
  * Cleans up old news articles and associated questions.
  * @param {number} daysToKeep - Number of days to keep articles.
@@ -326,10 +494,26 @@ async function cleanupOldNews(daysToKeep) {
   }
   console.log(`[Cleanup] Total articles deleted: ${totalDeletedArticles}`);
   console.log(`[Cleanup] Total questions deleted: ${totalDeletedQuestions}`);
+
+  try {
+    const { documents } = await pruneSearchIndex(daysToKeep);
+    console.log(`[Cleanup] Search index now holds ${documents} articles.`);
+  } catch (error) {
+    console.error("[Cleanup] Error pruning search index:", error.message);
+  }
+
+  try {
+    const { deleted } = await pruneExtractionQueue(daysToKeep);
+    console.log(`[Cleanup] Deleted ${deleted} finished extraction jobs.`);
+  } catch (error) {
+    console.error("[Cleanup] Error pruning extraction queue:", error.message);
+  }
 }
 
 module.exports = {
   runScraperAndStore, // Exported if you need to run specific scrapers manually
+  bulkUpsertArticles,
   runAllScrapers,
+  runDueScrapers,
   cleanupOldNews,
 };
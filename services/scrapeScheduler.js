@@ -0,0 +1,205 @@
+const fs = require("fs");
+const path = require("path");
+const { sourceConfig } = require("../config/sources");
+
+// Where per-source polling state is persisted between restarts.
+const STATE_FILE =
+  process.env.SCHEDULER_STATE_FILE ||
+  path.join(__dirname, "..", "data", "scheduler-state.json");
+
+// How many new articles we would like each poll of a source to find.
+// A source producing 12 new articles/hour is then polled every 25 minutes.
+const TARGET_NEW_ARTICLES_PER_RUN = 5;
+// Weight of the newest observation in the change-rate moving average.
+const RATE_SMOOTHING = 0.3;
+// Growth factor for the interval when a poll finds nothing new.
+const IDLE_BACKOFF = 1.5;
+
+const DEFAULT_MIN_INTERVAL = 10 * 60 * 1000; // 10 minutes
+const DEFAULT_MAX_INTERVAL = 6 * 60 * 60 * 1000; // 6 hours
+
+let state = {};
+
+function getBounds(sourceKey) {
+  const config = sourceConfig[sourceKey];
+  return {
+    min: config.minUpdateInterval || DEFAULT_MIN_INTERVAL,
+    max: config.maxUpdateInterval || DEFAULT_MAX_INTERVAL,
+  };
+}
+
+function clampInterval(sourceKey, interval) {
+  const { min, max } = getBounds(sourceKey);
+  return Math.round(Math.min(max, Math.max(min, interval)));
+}
+
+function getSourceState(sourceKey) {
+  if (!state[sourceKey]) {
+    state[sourceKey] = {
+      interval: clampInterval(sourceKey, sourceConfig[sourceKey].updateInterval),
+      changeRatePerHour: null,
+      lastScrapedAt: null,
+      nextRunAt: null, // null means "due now"
+      lastNewArticles: 0,
+      consecutiveFailures: 0,
+    };
+  }
+  return state[sourceKey];
+}
+
+/**
+ * Loads persisted scheduler state from disk. Missing or unreadable state
+ * simply means every source is due immediately.
+ */
+function loadSchedulerState() {
+  try {
+    const raw = fs.readFileSync(STATE_FILE, "utf8");
+    const saved = JSON.parse(raw);
+    state = {};
+    for (const sourceKey in sourceConfig) {
+      if (saved[sourceKey]) {
+        state[sourceKey] = {
+          ...getSourceState(sourceKey),
+          ...saved[sourceKey],
+        };
+        state[sourceKey].interval = clampInterval(
+          sourceKey,
+          state[sourceKey].interval
+        );
+        sourceConfig[sourceKey].lastScraped = state[sourceKey].lastScrapedAt
+          ? new Date(state[sourceKey].lastScrapedAt)
+          : null;
+      }
+    }
+    console.log(`[Scheduler] Loaded polling state from ${STATE_FILE}.`);
+  } catch (error) {
+    if (error.code !== "ENOENT") {
+      console.warn(
+        `[Scheduler] Could not read state file ${STATE_FILE}, starting fresh:`,
+        error.message
+      );
+    }
+    state = {};
+  }
+  for (const sourceKey in sourceConfig) {
+    getSourceState(sourceKey);
+  }
+}
+
+/**
+ * Writes scheduler state to disk atomically (temp file + rename).
+ */
+async function saveSchedulerState() {
+  try {
+    await fs.promises.mkdir(path.dirname(STATE_FILE), { recursive: true });
+    const tempFile = `${STATE_FILE}.tmp`;
+    await fs.promises.writeFile(tempFile, JSON.stringify(state, null, 2));
+    await fs.promises.rename(tempFile, STATE_FILE);
+  } catch (error) {
+    console.error(
+      `[Scheduler] Failed to persist state to ${STATE_FILE}:`,
+      error.message
+    );
+  }
+}
+
+/**
+ * Records the outcome of one scrape and reschedules the source.
+ * @param {string} sourceKey - The key of the news source (e.g., 'toi').
+ * @param {number} newArticlesCount - Articles that were not stored before.
+ * @param {Date} [finishedAt] - When the scrape finished.
+ */
+function recordScrapeResult(sourceKey, newArticlesCount, finishedAt = new Date()) {
+  const sourceState = getSourceState(sourceKey);
+  const now = finishedAt.getTime();
+
+  if (sourceState.lastScrapedAt) {
+    const elapsedHours =
+      (now - new Date(sourceState.lastScrapedAt).getTime()) / 3_600_000;
+    if (elapsedHours > 0) {
+      const observedRate = newArticlesCount / elapsedHours;
+      sourceState.changeRatePerHour =
+        sourceState.changeRatePerHour === null
+          ? observedRate
+          : RATE_SMOOTHING * observedRate +
+            (1 - RATE_SMOOTHING) * sourceState.changeRatePerHour;
+    }
+  }
+
+  if (sourceState.changeRatePerHour > 0) {
+    sourceState.interval = clampInterval(
+      sourceKey,
+      (TARGET_NEW_ARTICLES_PER_RUN / sourceState.changeRatePerHour) *
+        3_600_000
+    );
+  } else if (sourceState.lastScrapedAt) {
+    sourceState.interval = clampInterval(
+      sourceKey,
+      sourceState.interval * IDLE_BACKOFF
+    );
+  }
+
+  sourceState.lastScrapedAt = finishedAt.toISOString();
+  sourceState.lastNewArticles = newArticlesCount;
+  sourceState.consecutiveFailures = 0;
+  sourceState.nextRunAt = new Date(now + sourceState.interval).toISOString();
+  sourceConfig[sourceKey].lastScraped = finishedAt;
+}
+
+/**
+ * Records a failed scrape. The source keeps its interval but is retried
+ * after it; repeated failures back off towards the maximum interval.
+ * @param {string} sourceKey - The key of the news source.
+ */
+function recordScrapeFailure(sourceKey) {
+  const sourceState = getSourceState(sourceKey);
+  sourceState.consecutiveFailures++;
+  const retryIn = clampInterval(
+    sourceKey,
+    sourceState.interval * Math.pow(IDLE_BACKOFF, sourceState.consecutiveFailures - 1)
+  );
+  sourceState.nextRunAt = new Date(Date.now() + retryIn).toISOString();
+}
+
+/**
+ * Returns the keys of sources whose next run time has passed.
+ * @param {Date} [now]
+ * @returns {string[]}
+ */
+function getDueSources(now = new Date()) {
+  return Object.keys(sourceConfig).filter((sourceKey) => {
+    const { nextRunAt } = getSourceState(sourceKey);
+    return !nextRunAt || new Date(nextRunAt) <= now;
+  });
+}
+
+/**
+ * Returns the polling status of every source, for monitoring.
+ * @returns {object[]}
+ */
+function getSchedulerStatus() {
+  return Object.keys(sourceConfig).map((sourceKey) => {
+    const sourceState = getSourceState(sourceKey);
+    return {
+      source: sourceKey,
+      intervalMinutes: +(sourceState.interval / 60_000).toFixed(1),
+      changeRatePerHour:
+        sourceState.changeRatePerHour === null
+          ? null
+          : +sourceState.changeRatePerHour.toFixed(2),
+      lastScrapedAt: sourceState.lastScrapedAt,
+      nextRunAt: sourceState.nextRunAt,
+      lastNewArticles: sourceState.lastNewArticles,
+      consecutiveFailures: sourceState.consecutiveFailures,
+    };
+  });
+}
+
+module.exports = {
+  loadSchedulerState,
+  saveSchedulerState,
+  recordScrapeResult,
+  recordScrapeFailure,
+  getDueSources,
+  getSchedulerStatus,
+};
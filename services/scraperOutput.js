@@ -0,0 +1,163 @@
+/**
+ * Decoding of the listing scrapers' stdout (see scrapers/article_record.py).
+ *
+ * A scraper writes either one JSON array or, with `--output msgpack`, a
+ * sequence of frames: a 4-byte big-endian length followed by one
+ * MessagePack map per article. The scraper falls back to JSON when the
+ * Python msgpack package is missing, so the format is detected from the
+ * first byte rather than trusted from the command line.
+ *
+ * The decoder below covers the MessagePack types msgpack-python emits for
+ * plain data (nil, booleans, integers, floats, strings, binary, arrays and
+ * maps), so no npm dependency is needed.
+ */
+
+const FRAME_HEADER_BYTES = 4;
+
+/**
+ * Decodes one MessagePack value starting at offset.
+ * @param {Buffer} buffer
+ * @param {number} offset
+ * @returns {[*, number]} The value and the offset just past it.
+ */
+function decodeValue(buffer, offset) {
+  const type = buffer[offset];
+  offset++;
+
+  if (type <= 0x7f) return [type, offset]; // positive fixint
+  if (type >= 0xe0) return [type - 0x100, offset]; // negative fixint
+  if (type >= 0x80 && type <= 0x8f) return decodeMap(buffer, offset, type & 0x0f);
+  if (type >= 0x90 && type <= 0x9f) return decodeArray(buffer, offset, type & 0x0f);
+  if (type >= 0xa0 && type <= 0xbf) return decodeString(buffer, offset, type & 0x1f);
+
+  switch (type) {
+    case 0xc0:
+      return [null, offset];
+    case 0xc2:
+      return [false, offset];
+    case 0xc3:
+      return [true, offset];
+    case 0xc4:
+      return decodeBinary(buffer, offset + 1, buffer.readUInt8(offset));
+    case 0xc5:
+      return decodeBinary(buffer, offset + 2, buffer.readUInt16BE(offset));
+    case 0xc6:
+      return decodeBinary(buffer, offset + 4, buffer.readUInt32BE(offset));
+    case 0xca:
+      return [buffer.readFloatBE(offset), offset + 4];
+    case 0xcb:
+      return [buffer.readDoubleBE(offset), offset + 8];
+    case 0xcc:
+      return [buffer.readUInt8(offset), offset + 1];
+    case 0xcd:
+      return [buffer.readUInt16BE(offset), offset + 2];
+    case 0xce:
+      return [buffer.readUInt32BE(offset), offset + 4];
+    case 0xcf:
+      return [Number(buffer.readBigUInt64BE(offset)), offset + 8];
+    case 0xd0:
+      return [buffer.readInt8(offset), offset + 1];
+    case 0xd1:
+      return [buffer.readInt16BE(offset), offset + 2];
+    case 0xd2:
+      return [buffer.readInt32BE(offset), offset + 4];
+    case 0xd3:
+      return [Number(buffer.readBigInt64BE(offset)), offset + 8];
+    case 0xd9:
+      return decodeString(buffer, offset + 1, buffer.readUInt8(offset));
+    case 0xda:
+      return decodeString(buffer, offset + 2, buffer.readUInt16BE(offset));
+    case 0xdb:
+      return decodeString(buffer, offset + 4, buffer.readUInt32BE(offset));
+    case 0xdc:
+      return decodeArray(buffer, offset + 2, buffer.readUInt16BE(offset));
+    case 0xdd:
+      return decodeArray(buffer, offset + 4, buffer.readUInt32BE(offset));
+    case 0xde:
+      return decodeMap(buffer, offset + 2, buffer.readUInt16BE(offset));
+    case 0xdf:
+      return decodeMap(buffer, offset + 4, buffer.readUInt32BE(offset));
+    default:
+      throw new Error(
+        `Unsupported MessagePack type 0x${type.toString(16)} at byte ${offset - 1}`
+      );
+  }
+}
+
+function decodeString(buffer, offset, length) {
+  return [buffer.toString("utf8", offset, offset + length), offset + length];
+}
+
+function decodeBinary(buffer, offset, length) {
+  return [buffer.subarray(offset, offset + length), offset + length];
+}
+
+function decodeArray(buffer, offset, length) {
+  const array = new Array(length);
+  for (let i = 0; i < length; i++) {
+    [array[i], offset] = decodeValue(buffer, offset);
+  }
+  return [array, offset];
+}
+
+function decodeMap(buffer, offset, length) {
+  const map = {};
+  for (let i = 0; i < length; i++) {
+    let key;
+    let value;
+    [key, offset] = decodeValue(buffer, offset);
+    [value, offset] = decodeValue(buffer, offset);
+    map[key] = value;
+  }
+  return [map, offset];
+}
+
+/**
+ * Decodes length-prefixed MessagePack frames into an array of values.
+ * @param {Buffer} buffer - The complete scraper output.
+ * @returns {object[]}
+ */
+function decodeMessagePackFrames(buffer) {
+  const values = [];
+  let offset = 0;
+  while (offset < buffer.length) {
+    if (offset + FRAME_HEADER_BYTES > buffer.length) {
+      throw new Error(`Truncated MessagePack frame header at byte ${offset}`);
+    }
+    const length = buffer.readUInt32BE(offset);
+    const start = offset + FRAME_HEADER_BYTES;
+    const end = start + length;
+    if (end > buffer.length) {
+      throw new Error(`Truncated MessagePack frame at byte ${offset}`);
+    }
+    const [value, next] = decodeValue(buffer, start);
+    if (next !== end) {
+      throw new Error(`MessagePack frame at byte ${offset} has trailing bytes`);
+    }
+    values.push(value);
+    offset = end;
+  }
+  return values;
+}
+
+/**
+ * Parses a listing scraper's stdout, in either output format.
+ * @param {Buffer} buffer - Everything the scraper wrote to stdout.
+ * @returns {object[]} The scraped articles.
+ */
+function decodeScraperOutput(buffer) {
+  // A MessagePack run that found no articles writes no frames at all
+  if (buffer.length === 0) {
+    return [];
+  }
+  const text = buffer.subarray(0, 16).toString("utf8").trimStart();
+  if (text.startsWith("[")) {
+    return JSON.parse(buffer.toString("utf8"));
+  }
+  return decodeMessagePackFrames(buffer);
+}
+
+module.exports = {
+  decodeMessagePackFrames,
+  decodeScraperOutput,
+};
@@ -0,0 +1,322 @@
+const { spawn } = require("child_process");
+const path = require("path");
+const readline = require("readline");
+
+const SEARCH_INDEX_SCRIPT = path.join(
+  __dirname,
+  "..",
+  "scrapers",
+  "search_index.py"
+);
+const SEARCH_TIMEOUT_MS = 10000;
+const COMMAND_TIMEOUT_MS = 5 * 60 * 1000; // add / prune may merge segments
+const BACKFILL_BATCH_SIZE = 500;
+
+/**
+ * Runs scrapers/search_index.py with the given arguments and parses its JSON output.
+ * @param {string[]} args - Command-line arguments for search_index.py.
+ * @param {string} [input] - Text written to the command's stdin.
+ * @returns {Promise<object>}
+ */
+function runSearchIndexCommand(args, input) {
+  return new Promise((resolve, reject) => {
+    const pythonProcess = spawn("python", [SEARCH_INDEX_SCRIPT, ...args]);
+    let dataBuffer = "";
+    let errorBuffer = "";
+
+    const timer = setTimeout(() => {
+      pythonProcess.kill();
+      reject(new Error(`search_index.py ${args[0]} timed out`));
+    }, COMMAND_TIMEOUT_MS);
+
+    pythonProcess.stdout.on("data", (data) => {
+      dataBuffer += data.toString();
+    });
+    pythonProcess.stderr.on("data", (data) => {
+      errorBuffer += data.toString();
+    });
+    pythonProcess.on("error", (error) => {
+      clearTimeout(timer);
+      reject(error);
+    });
+    pythonProcess.on("close", (code) => {
+      clearTimeout(timer);
+      if (code !== 0) {
+        return reject(
+          new Error(`search_index.py exited with code ${code}: ${errorBuffer}`)
+        );
+      }
+      try {
+        resolve(JSON.parse(dataBuffer));
+      } catch (parseError) {
+        reject(parseError);
+      }
+    });
+    pythonProcess.stdin.end(input || "");
+  });
+}
+
+// One long-lived `search_index.py serve` process answers every query, so a
+// search costs a pipe round trip instead of starting Python. It is started
+// on first use and restarted on the next query if it exits or times out.
+let queryProcess = null;
+let nextRequestId = 1;
+
+function startQueryProcess() {
+  const child = spawn("python", [SEARCH_INDEX_SCRIPT, "serve"]);
+  const state = { child, pending: new Map(), errorTail: "" };
+
+  const failAll = (error) => {
+    for (const { reject, timer } of state.pending.values()) {
+      clearTimeout(timer);
+      reject(error);
+    }
+    state.pending.clear();
+    if (queryProcess === state) {
+      queryProcess = null;
+    }
+  };
+
+  readline.createInterface({ input: child.stdout }).on("line", (line) => {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch (parseError) {
+      return;
+    }
+    const request = state.pending.get(response.id);
+    if (!request) return;
+    state.pending.delete(response.id);
+    clearTimeout(request.timer);
+    if (response.error) {
+      request.reject(new Error(`search_index.py: ${response.error}`));
+    } else {
+      request.resolve(response);
+    }
+  });
+  child.stderr.on("data", (data) => {
+    state.errorTail = (state.errorTail + data.toString()).slice(-2000);
+  });
+  child.on("error", failAll);
+  child.on("exit", (code) => {
+    failAll(
+      new Error(
+        `search_index.py serve exited with code ${code}: ${state.errorTail}`
+      )
+    );
+  });
+  child.stdin.on("error", () => {}); // Reported through "exit"
+  return state;
+}
+
+/**
+ * Sends one query to the long-lived query process.
+ * @param {object} request - {query, limit, offset, source}.
+ * @returns {Promise<object>}
+ */
+function queryIndex(request) {
+  if (!queryProcess) {
+    queryProcess = startQueryProcess();
+  }
+  const state = queryProcess;
+  const id = nextRequestId++;
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => {
+      state.pending.delete(id);
+      reject(new Error("search_index.py query timed out"));
+      state.child.kill(); // A stuck process would delay every later query
+    }, SEARCH_TIMEOUT_MS);
+    state.pending.set(id, { resolve, reject, timer });
+    state.child.stdin.write(JSON.stringify({ id, ...request }) + "\n");
+  });
+}
+
+/**
+ * Stops the query process (it is restarted on the next query).
+ */
+function stopSearchIndexProcess() {
+  if (queryProcess) {
+    queryProcess.child.stdin.end();
+    queryProcess = null;
+  }
+}
+
+/**
+ * Queries the precomputed inverted index built by the scrapers.
+ * @param {string} query - The user's search text.
+ * @param {number} page - 1-based page number.
+ * @param {number} limit - Results per page.
+ * @returns {Promise<{total: number, indexed: number, results: {link: string, source: string, score: number}[]}>}
+ */
+async function searchIndexedArticles(query, page, limit) {
+  return queryIndex({ query, limit, offset: (page - 1) * limit });
+}
+
+/**
+ * Searches the articles of every source: ranked index hits when the index
+ * has any, otherwise (no index yet, index unavailable, or no hits, e.g. a
+ * mid-word fragment) a case-insensitive regex scan of title and description.
+ * @param {string} query - The user's search text.
+ * @param {number} page - 1-based page number.
+ * @param {number} limit - Results per page.
+ * @param {object} sourceConfig - Source key -> { model } (config/sources.js).
+ * @returns {Promise<{news: object[], currentPage: number, totalPages: number, totalResults: number}>}
+ */
+async function searchNews(query, page, limit, sourceConfig) {
+  try {
+    const indexed = await searchIndexedArticles(query, page, limit);
+    if (indexed.indexed > 0 && indexed.total > 0) {
+      const linksBySource = {};
+      for (const hit of indexed.results) {
+        (linksBySource[hit.source] = linksBySource[hit.source] || []).push(
+          hit.link
+        );
+      }
+
+      const articlesByLink = new Map();
+      for (const sourceKey in linksBySource) {
+        const Model = sourceConfig[sourceKey]?.model;
+        if (!Model) continue;
+        const articles = await Model.find({
+          link: { $in: linksBySource[sourceKey] },
+        }).lean();
+        for (const article of articles) {
+          articlesByLink.set(article.link, article);
+        }
+      }
+
+      return {
+        news: indexed.results
+          .map((hit) => articlesByLink.get(hit.link))
+          .filter(Boolean),
+        currentPage: page,
+        totalPages: Math.ceil(indexed.total / limit),
+        totalResults: indexed.total,
+      };
+    }
+  } catch (error) {
+    console.warn(
+      "Search index unavailable, falling back to regex search:",
+      error.message
+    );
+  }
+
+  let searchResults = []; // Using $regex for partial match, 'i' for case-insensitivity
+  const regex = new RegExp(query, "i");
+
+  for (const sourceKey in sourceConfig) {
+    const Model = sourceConfig[sourceKey].model;
+    if (Model) {
+      const sourceSearchResults = await Model.find({
+        $or: [{ title: regex }, { description: regex }],
+      })
+        .sort({ pubDate: -1 }) // Sort each source's results by date
+        .lean();
+      searchResults.push(...sourceSearchResults);
+    }
+  } // Sort globally across all sources by publication date
+
+  searchResults.sort((a, b) => new Date(b.pubDate) - new Date(a.pubDate));
+
+  const startIndex = (page - 1) * limit;
+  const endIndex = page * limit;
+
+  return {
+    news: searchResults.slice(startIndex, endIndex),
+    currentPage: page,
+    totalPages: Math.ceil(searchResults.length / limit),
+    totalResults: searchResults.length,
+  };
+}
+
+/**
+ * Converts a stored (or normalized) article to the fields search_index.py indexes.
+ * @param {object} article - Article with title, link, description, content and pubDate.
+ * @returns {object}
+ */
+function toIndexedArticle(article) {
+  return {
+    title: article.title,
+    link: article.link,
+    description: article.description,
+    content: article.content,
+    publishedAt: article.pubDate ? new Date(article.pubDate).toISOString() : null,
+  };
+}
+
+/**
+ * Adds articles stored by ingestion to the search index, so that every hit
+ * has a MongoDB document. Articles whose indexed title and description are
+ * unchanged are skipped by the indexer.
+ * @param {string} sourceKey - The key of the news source (e.g., 'hindu').
+ * @param {object[]} articles - Stored articles (see toIndexedArticle).
+ * @returns {Promise<number>} The number of articles indexed.
+ */
+async function indexArticles(sourceKey, articles) {
+  if (articles.length === 0) {
+    return 0;
+  }
+  const { indexed } = await runSearchIndexCommand(
+    ["add", "--source", sourceKey],
+    JSON.stringify(articles.map(toIndexedArticle))
+  );
+  return indexed;
+}
+
+/**
+ * Adds every article already stored in MongoDB to the search index, e.g.
+ * after the index is first deployed or rebuilt. Articles whose indexed title
+ * and description are unchanged are skipped by the indexer.
+ * @param {object} sourceConfig - Source key -> { model } (config/sources.js).
+ * @returns {Promise<object>} Source key -> number of articles indexed.
+ */
+async function backfillSearchIndex(sourceConfig) {
+  const indexedBySource = {};
+  for (const sourceKey in sourceConfig) {
+    const Model = sourceConfig[sourceKey].model;
+    if (!Model) continue;
+    indexedBySource[sourceKey] = 0;
+
+    const cursor = Model.find(
+      {},
+      { title: 1, link: 1, description: 1, content: 1, pubDate: 1 }
+    )
+      .lean()
+      .cursor();
+    let batch = [];
+    const flush = async () => {
+      indexedBySource[sourceKey] += await indexArticles(sourceKey, batch);
+      batch = [];
+    };
+    for await (const article of cursor) {
+      batch.push(article);
+      if (batch.length >= BACKFILL_BATCH_SIZE) {
+        await flush();
+      }
+    }
+    if (batch.length) {
+      await flush();
+    }
+    console.log(
+      `[SearchIndex] Backfilled ${indexedBySource[sourceKey]} ${sourceKey} articles.`
+    );
+  }
+  return indexedBySource;
+}
+
+/**
+ * Drops articles older than daysToKeep from the search index.
+ * @param {number} daysToKeep - Number of days to keep articles.
+ */
+async function pruneSearchIndex(daysToKeep) {
+  return runSearchIndexCommand(["prune", "--days", String(daysToKeep)]);
+}
+
+module.exports = {
+  indexArticles,
+  searchIndexedArticles,
+  searchNews,
+  backfillSearchIndex,
+  pruneSearchIndex,
+  stopSearchIndexProcess,
+};